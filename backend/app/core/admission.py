@@ -0,0 +1,192 @@
+# app/core/admission.py - Load shedding for the AI stage
+
+"""
+The AI queue is the analyses waiting for a provider slot (quota or
+concurrency, see rate_limit.py). When AI_SHED_QUEUE_DEPTH of them are
+waiting, or getting a slot has lately taken longer than
+AI_SHED_WAIT_SECONDS, analyze_case stops adding to it:
+new analyses get the keyword + validator answer at once, flagged degraded,
+and the AI answer is worked out later by AIUpgrades once nothing is
+waiting. Tail latency then stays bounded instead of growing with the queue.
+
+State is per worker process, like the provider gates it sits in front of.
+"""
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Callable, Dict, Optional
+
+from app.core import metrics
+from app.core.config import settings
+
+SHED_QUEUE_DEPTH = "queue_depth"
+SHED_QUEUE_WAIT = "queue_wait"
+
+
+class Ticket:
+    """One analysis in the AI queue"""
+
+    __slots__ = ("queue", "entered", "waiting")
+
+    def __init__(self, queue: "AIQueue"):
+        self.queue = queue
+        self.entered = time.monotonic()
+        self.waiting = True
+
+    def admitted(self):
+        """A provider slot was granted; the time spent waiting for it is recorded once"""
+        if self.waiting:
+            self.queue._admitted(self)
+
+
+class AIQueue:
+    """Analyses waiting for (or holding) a provider slot, and recent waits"""
+
+    def __init__(self, max_depth: int, max_wait: float, window: float):
+        self.max_depth = max_depth
+        self.max_wait = max_wait
+        self.window = window
+        self.active = 0            # In the AI stage: waiting or calling a provider
+        self.shed: Dict[str, int] = {SHED_QUEUE_DEPTH: 0, SHED_QUEUE_WAIT: 0}
+        self._waiting = set()      # Tickets not yet given a slot
+        self._waits = deque()      # (admitted at, seconds waited), last `window` seconds
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def enter(self):
+        """Hold a place in the queue while calling providers; yields the Ticket"""
+        ticket = Ticket(self)
+        with self._lock:
+            self.active += 1
+            self._waiting.add(ticket)
+        try:
+            yield ticket
+        finally:
+            with self._lock:
+                self.active -= 1
+                if ticket.waiting:
+                    # Gave up without a slot - that wait counts too
+                    self._waiting.discard(ticket)
+                    now = time.monotonic()
+                    self._waits.append((now, now - ticket.entered))
+
+    def _admitted(self, ticket: Ticket):
+        now = time.monotonic()
+        with self._lock:
+            ticket.waiting = False
+            self._waiting.discard(ticket)
+            self._waits.append((now, now - ticket.entered))
+
+    def wait_seconds(self) -> float:
+        """Mean recent slot wait, or the oldest current waiter's age if that is longer"""
+        now = time.monotonic()
+        with self._lock:
+            while self._waits and now - self._waits[0][0] > self.window:
+                self._waits.popleft()
+            recent = sum(wait for _, wait in self._waits) / len(self._waits) if self._waits else 0.0
+            oldest = max((now - t.entered for t in self._waiting), default=0.0)
+        return max(recent, oldest)
+
+    def overloaded(self) -> Optional[str]:
+        """Why a new analysis should skip the AI (None = admit it)"""
+        waiting = len(self._waiting)
+        if waiting >= self.max_depth:
+            return SHED_QUEUE_DEPTH
+        # Recent waits only count while there is a queue - once it has drained, admit again
+        if waiting and self.wait_seconds() >= self.max_wait:
+            return SHED_QUEUE_WAIT
+        return None
+
+    def idle(self) -> bool:
+        """Nothing waiting for a provider slot"""
+        return not self._waiting
+
+    def check(self) -> Optional[str]:
+        """overloaded(), counting the shed analysis when it says no"""
+        if not settings.AI_SHED_ENABLED:
+            return None
+        reason = self.overloaded()
+        if reason:
+            with self._lock:
+                self.shed[reason] += 1
+            metrics.analyses_shed.inc(reason)
+        return reason
+
+    def stats(self) -> Dict:
+        return {
+            "active": self.active,
+            "waiting": len(self._waiting),
+            "waitSeconds": round(self.wait_seconds(), 3),
+            "maxDepth": self.max_depth,
+            "maxWaitSeconds": self.max_wait,
+            "overloaded": self.overloaded(),
+            "shed": dict(self.shed),
+        }
+
+
+class AIUpgrades:
+    """
+    Background re-runs of shed analyses. Each waits (up to AI_UPGRADE_MAX_DELAY)
+    until nothing is waiting for a provider slot, so upgrades only use spare capacity.
+    """
+
+    def __init__(self, queue: AIQueue, workers: int, max_pending: int, max_delay: float):
+        self.queue = queue
+        self.workers = workers
+        self.max_pending = max_pending
+        self.max_delay = max_delay
+        self._pending = set()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def submit(self, key: str, fn: Callable, *args) -> bool:
+        """Queue fn(*args) once per key; False if the backlog is full"""
+        with self._lock:
+            if key in self._pending:
+                return True
+            if len(self._pending) >= self.max_pending:
+                metrics.ai_upgrades.inc("dropped")
+                return False
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="ai-upgrade")
+            self._pending.add(key)
+        metrics.ai_upgrades.inc("queued")
+        self._executor.submit(self._run, key, fn, args)
+        return True
+
+    def _run(self, key: str, fn: Callable, args):
+        try:
+            deadline = time.monotonic() + self.max_delay
+            while not self.queue.idle():
+                if time.monotonic() >= deadline:
+                    print(f"⏳ AI upgrade {key} dropped - AI queue still busy after {self.max_delay:g}s")
+                    metrics.ai_upgrades.inc("expired")
+                    return
+                time.sleep(0.25)
+            fn(*args)
+            metrics.ai_upgrades.inc("done")
+        except Exception as e:
+            print(f"❌ AI upgrade {key} failed: {e}")
+            metrics.ai_upgrades.inc("failed")
+        finally:
+            with self._lock:
+                self._pending.discard(key)
+
+    def stats(self) -> Dict:
+        return {"pending": len(self._pending), "maxPending": self.max_pending, "workers": self.workers}
+
+
+ai_queue = AIQueue(
+    max_depth=settings.AI_SHED_QUEUE_DEPTH,
+    max_wait=settings.AI_SHED_WAIT_SECONDS,
+    window=settings.AI_SHED_WINDOW
+)
+ai_upgrades = AIUpgrades(
+    ai_queue,
+    workers=settings.AI_UPGRADE_WORKERS,
+    max_pending=settings.AI_UPGRADE_MAX_PENDING,
+    max_delay=settings.AI_UPGRADE_MAX_DELAY
+)
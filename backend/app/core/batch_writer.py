@@ -0,0 +1,81 @@
+# app/core/batch_writer.py - Background batched writes
+
+"""
+Takes writes off the request path: items are queued and a background
+thread hands them to a write function in batches, once `batch_size` items
+are waiting or `flush_interval` seconds have passed.
+"""
+
+import queue
+import threading
+import time
+from typing import Any, Callable, List
+
+_STOP = object()
+
+
+class BatchWriter:
+    """Queue + writer thread calling write_batch(items) with up to batch_size items"""
+
+    def __init__(
+        self,
+        write_batch: Callable[[List[Any]], None],
+        batch_size: int = 64,
+        flush_interval: float = 0.5,
+        name: str = "batch-writer"
+    ):
+        self.write_batch = write_batch
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: "queue.Queue" = queue.Queue()
+        self._closed = False
+        self._thread = threading.Thread(target=self._loop, name=name, daemon=True)
+        self._thread.start()
+
+    def put(self, item: Any):
+        self._queue.put(item)
+
+    def flush(self):
+        """Block until every queued item is written"""
+        self._queue.join()
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join(timeout=10)
+
+    @property
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    def _loop(self):
+        while True:
+            item = self._queue.get()
+            batch = [item]
+
+            # Collect more items until the batch is full or the interval passes
+            deadline = time.monotonic() + self.flush_interval
+            while item is not _STOP and len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                batch.append(item)
+
+            items = [entry for entry in batch if entry is not _STOP]
+            try:
+                if items:
+                    self.write_batch(items)
+            except Exception as e:
+                print(f"❌ {self._thread.name} dropped {len(items)} items: {e}")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+            if batch[-1] is _STOP:
+                return
@@ -0,0 +1,287 @@
+# app/core/cache.py - In-process and shared on-disk caches
+
+"""
+Small, thread-safe caches shared by the generators and services.
+
+LRUCache lives in one process. DiskCache is a SQLite file (WAL mode)
+shared by every uvicorn worker and kept across restarts; TieredCache puts
+an LRUCache (L1) in front of it (L2).
+"""
+
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from app.core.config import settings
+
+
+class LRUCache:
+    """
+    Bounded mapping that evicts the least recently used entry.
+    With max_bytes, the entries' sizeof() total is bounded too, and a
+    value bigger than that on its own is not cached at all.
+    """
+
+    def __init__(self, maxsize: int = 256, max_bytes: Optional[int] = None,
+                 sizeof: Callable[[Any], int] = sys.getsizeof):
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._sizes: Dict[Hashable, int] = {}   # Only kept with max_bytes
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, default: Optional[Any] = None) -> Any:
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any):
+        if self.maxsize <= 0:
+            return
+        size = self.sizeof(value) if self.max_bytes is not None else 0
+        with self._lock:
+            if self.max_bytes is not None:
+                self._bytes -= self._sizes.pop(key, 0)
+                if size > self.max_bytes:
+                    self._data.pop(key, None)
+                    return
+                self._sizes[key] = size
+                self._bytes += size
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize or (self.max_bytes is not None and self._bytes > self.max_bytes):
+                evicted, _ = self._data.popitem(last=False)
+                self._bytes -= self._sizes.pop(evicted, 0)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._sizes.clear()
+            self._bytes = 0
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = {"size": len(self._data), "maxsize": self.maxsize, "hits": self.hits, "misses": self.misses}
+            if self.max_bytes is not None:
+                stats.update({"bytes": self._bytes, "maxBytes": self.max_bytes})
+            return stats
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+def freeze(value: Any) -> Hashable:
+    """Hashable, order-independent form of nested dicts/lists/models (for cache keys)"""
+    if value is None or isinstance(value, (str, int, float)):
+        return value
+    if isinstance(value, dict):
+        return tuple(sorted((k, freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(v) for v in value)
+    if isinstance(value, set):
+        return frozenset(freeze(v) for v in value)
+    if hasattr(value, "model_dump"):
+        # pydantic model - field values in declaration order
+        return (type(value).__name__,) + tuple(freeze(v) for v in value.__dict__.values())
+    return value
+
+
+# =========================
+# SHARED DISK CACHE (L2)
+# =========================
+class DiskCache:
+    """
+    Key/value cache in a SQLite file, safe to share between processes.
+    Least recently used entries are evicted once the values exceed max_bytes.
+    Errors are reported and treated as misses - the cache never fails a request.
+    """
+
+    TOUCH_INTERVAL = 60.0   # Seconds between access-time updates of one entry
+    EVICT_EVERY = 64        # Writes between size checks
+
+    def __init__(self, path: Optional[str] = None, max_bytes: Optional[int] = None):
+        self.path = path or settings.L2_CACHE_PATH
+        self.max_bytes = max_bytes or settings.L2_CACHE_MAX_BYTES
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._local = threading.local()
+        self._writes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evicted = 0
+
+        self._connection().executescript("""
+            CREATE TABLE IF NOT EXISTS entries (
+                namespace TEXT NOT NULL,
+                key TEXT NOT NULL,
+                value BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                accessed_at REAL NOT NULL,
+                PRIMARY KEY (namespace, key)
+            );
+            CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed_at);
+        """)
+
+    def _connection(self) -> sqlite3.Connection:
+        """One connection per thread"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, namespace: str, key: str) -> Optional[bytes]:
+        try:
+            conn = self._connection()
+            row = conn.execute(
+                "SELECT value, accessed_at FROM entries WHERE namespace = ? AND key = ?",
+                (namespace, key)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+
+            now = time.time()
+            if now - row[1] > self.TOUCH_INTERVAL:
+                with conn:
+                    conn.execute(
+                        "UPDATE entries SET accessed_at = ? WHERE namespace = ? AND key = ?",
+                        (now, namespace, key)
+                    )
+            self.hits += 1
+            return row[0]
+        except sqlite3.Error as e:
+            print(f"⚠️ L2 cache read failed: {e}")
+            self.misses += 1
+            return None
+
+    def put(self, namespace: str, key: str, value: bytes):
+        try:
+            conn = self._connection()
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO entries (namespace, key, value, size, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                    (namespace, key, value, len(value), time.time())
+                )
+            with self._lock:
+                self._writes += 1
+                check = self._writes % self.EVICT_EVERY == 0
+            if check:
+                self.evict()
+        except sqlite3.Error as e:
+            print(f"⚠️ L2 cache write failed: {e}")
+
+    def evict(self):
+        """Drop least recently used entries until under max_bytes (plus 10% headroom)"""
+        conn = self._connection()
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        target = total - int(self.max_bytes * 0.9)
+        victims = []
+        freed = 0
+        for namespace, key, size in conn.execute(
+            "SELECT namespace, key, size FROM entries ORDER BY accessed_at"
+        ):
+            victims.append((namespace, key))
+            freed += size
+            if freed >= target:
+                break
+
+        with conn:
+            conn.executemany("DELETE FROM entries WHERE namespace = ? AND key = ?", victims)
+        self.evicted += len(victims)
+
+    def stats(self) -> dict:
+        try:
+            entries, size = self._connection().execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries"
+            ).fetchone()
+        except sqlite3.Error:
+            entries = size = None
+        return {
+            "path": self.path,
+            "entries": entries,
+            "bytes": size,
+            "maxBytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evicted": self.evicted,
+        }
+
+
+class TieredCache:
+    """
+    LRUCache (L1) in front of a shared DiskCache (L2), for JSON values.
+    Keys are prefixed with `version` so a rule change invalidates old entries.
+    """
+
+    def __init__(self, namespace: str, disk: Optional[DiskCache] = None, l1_size: int = 256, version: str = ""):
+        self.namespace = namespace
+        self.disk = disk
+        self.version = version
+        self.l1 = LRUCache(l1_size)
+
+    def _key(self, key: str) -> str:
+        return f"{self.version}:{key}"
+
+    def get(self, key: str) -> Optional[Any]:
+        key = self._key(key)
+        value = self.l1.get(key)
+        if value is not None or self.disk is None:
+            return value
+
+        data = self.disk.get(self.namespace, key)
+        if data is None:
+            return None
+        value = json.loads(data)
+        self.l1.put(key, value)
+        return value
+
+    def put(self, key: str, value: Any):
+        key = self._key(key)
+        self.l1.put(key, value)
+        if self.disk is not None:
+            self.disk.put(self.namespace, key, json.dumps(value, ensure_ascii=False).encode("utf-8"))
+
+    def stats(self) -> dict:
+        return {"namespace": self.namespace, "version": self.version, "l1": self.l1.stats()}
+
+
+_disk_cache: Optional[DiskCache] = None
+_disk_cache_lock = threading.Lock()
+
+
+def get_disk_cache() -> Optional[DiskCache]:
+    """Process-wide L2 cache (None when L2_CACHE_ENABLED is off)"""
+    global _disk_cache
+    if not settings.L2_CACHE_ENABLED:
+        return None
+    if _disk_cache is None:
+        with _disk_cache_lock:
+            if _disk_cache is None:
+                _disk_cache = DiskCache()
+    return _disk_cache
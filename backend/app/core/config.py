@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings
-from typing import Optional, List
+from typing import Optional, List, Dict
 
 
 class Settings(BaseSettings):
@@ -14,7 +14,7 @@ class Settings(BaseSettings):
     DEBUG: bool = False
 
     # Provider priority (cheap → expensive)
-    AI_PROVIDERS: List[str] = ["gemini", "deepseek", "openai", "anthropic"]
+    AI_PROVIDERS: List[str] = ["gemini", "deepseek", "openai", "anthropic", "local"]
 
     # Model configs
     DEEPSEEK_MODEL: str = "deepseek-chat"
@@ -25,6 +25,43 @@ class Settings(BaseSettings):
 
     ANTHROPIC_MODEL: str = "claude-sonnet-4-20250514"
 
+    # Provider quotas (unset = unlimited); buckets hold PROVIDER_BURST_SECONDS of quota
+    PROVIDER_RPM: Dict[str, int] = {"gemini": 15}            # Gemini free tier
+    PROVIDER_TPM: Dict[str, int] = {"gemini": 1_000_000}
+    PROVIDER_BURST_SECONDS: float = 10.0
+    PROVIDER_EXPECTED_COMPLETION_TOKENS: int = 800   # reserved per call, settled against reported usage
+    # Adaptive (AIMD) concurrency per provider: halves on 429s and latency spikes
+    PROVIDER_CONCURRENCY_INITIAL: int = 4
+    PROVIDER_CONCURRENCY_MIN: int = 1
+    PROVIDER_CONCURRENCY_MAX: int = 32
+    PROVIDER_LATENCY_SPIKE_FACTOR: float = 2.5       # x the provider's usual latency
+    PROVIDER_QUEUE_TIMEOUT: float = 2.0              # seconds to wait for capacity when every provider is busy
+
+    # Load shedding: past these, new analyses skip the AI (keyword-validated answer, flagged degraded)
+    AI_SHED_ENABLED: bool = True
+    AI_SHED_QUEUE_DEPTH: int = 8                     # analyses waiting for a provider slot, per worker
+    AI_SHED_WAIT_SECONDS: float = 1.0                # recent wait for a provider slot
+    AI_SHED_WINDOW: float = 10.0                     # seconds of slot waits averaged
+    AI_UPGRADE_ENABLED: bool = True                  # re-run shed analyses with AI later (needs the analysis store)
+    AI_UPGRADE_WORKERS: int = 2
+    AI_UPGRADE_MAX_PENDING: int = 200                # shed analyses beyond this stay keyword-validated
+    AI_UPGRADE_MAX_DELAY: float = 300.0              # seconds an upgrade waits for the queue to drain
+
+    # Offline fake provider ("local") for load and latency tests - never enable in production
+    LOCAL_PROVIDER_ENABLED: bool = False
+    LOCAL_PROVIDER_MODEL: str = "local-fake"
+    LOCAL_PROVIDER_LATENCY: str = "lognormal"        # constant | uniform | exponential | lognormal
+    LOCAL_PROVIDER_LATENCY_MS: float = 800.0         # fixed / median / mean, per distribution
+    LOCAL_PROVIDER_LATENCY_SPREAD: float = 0.5       # lognormal sigma, or uniform +- fraction
+    LOCAL_PROVIDER_ERROR_RATE: float = 0.0           # raise (counts as a provider failure)
+    LOCAL_PROVIDER_EMPTY_RATE: float = 0.0           # empty reply
+    LOCAL_PROVIDER_TRUNCATE_RATE: float = 0.0        # JSON cut off as at the token limit
+    LOCAL_PROVIDER_MALFORMED_RATE: float = 0.0       # fenced JSON with chatter / trailing comma
+    LOCAL_PROVIDER_SECTIONS: List[str] = ["IPC 503"]  # answer when the prompt lists no keyword sections
+    LOCAL_PROVIDER_RESPONSES_PATH: Optional[str] = None  # JSON {category or "*": reply} overriding the canned answers
+    LOCAL_PROVIDER_SEED: Optional[int] = 0           # same prompt -> same latency and fault; unset for random
+    LOCAL_PROVIDER_RPM: Optional[int] = None         # answer 429 above this many calls a minute (unset = never)
+
     # Generation controls
     AI_MAX_TOKENS: int = 2000
     AI_TEMPERATURE: float = 0.1
@@ -33,6 +70,80 @@ class Settings(BaseSettings):
     MIN_CONFIDENCE: float = 0.50
     HIGH_CONFIDENCE: float = 0.75
 
+    # Long-document mode (multi-page complaint drafts)
+    LONG_DOCUMENT_THRESHOLD: int = 2000      # chars - longer descriptions are condensed
+    DOCUMENT_DIGEST_CHARS: int = 2000        # size of the condensed description
+    MAX_DOCUMENT_BYTES: int = 1_000_000      # hard upper bound (1 MB)
+    DOCUMENT_MEMO_MAX_BYTES: int = 32_000_000  # rendered FIRs/complaints memoized per worker
+
+    # Document export (PDF/DOCX)
+    PDF_FONT_PATH: Optional[str] = None              # Unicode TTF for Latin text (default: Helvetica)
+    PDF_DEVANAGARI_FONT_PATH: Optional[str] = None   # Hindi/Marathi TTF (default: bundled app/data/fonts/NotoSansDevanagari-Regular.ttf)
+    EXPORT_CACHE_DIR: str = ".cache/exports"
+    EXPORT_CACHE_MAX_BYTES: int = 200_000_000        # oldest files evicted past this size
+    EXPORT_CACHE_RESCAN_SECONDS: int = 300           # re-measure the directory (other workers write to it too)
+
+    # Police station dataset (default: app/data/police_stations.json)
+    POLICE_STATIONS_PATH: Optional[str] = None
+
+    # Lawyer directory for matching (default: app/data/lawyers.json)
+    LAWYERS_PATH: Optional[str] = None
+    MAX_RECOMMENDED_LAWYERS: int = 20
+
+    # Outcome simulation (Monte Carlo)
+    SIMULATION_TRIALS: int = 100_000                 # per case, default and cap for analytics
+    SIMULATION_REQUEST_TRIALS: int = 20_000          # per case in action plans (on /analyze-case)
+    SIMULATION_BATCH_TRIALS: int = 20_000            # per case on /api/analytics/simulate
+    SIMULATION_MAX_BATCH_CASES: int = 500
+
+    # Analysis store (SQLite, WAL mode)
+    ANALYSIS_STORE_ENABLED: bool = True
+    ANALYSIS_DB_PATH: str = ".cache/analyses.sqlite3"
+    ANALYSIS_REUSE_SECONDS: int = 86400              # identical requests reuse a stored result this long
+    ANALYSIS_WRITE_BATCH: int = 64                   # rows per write transaction
+    ANALYSIS_FLUSH_INTERVAL: float = 0.5             # seconds a write may wait for its batch
+    ANALYSIS_DB_MAX_BYTES: int = 200_000_000         # oldest analyses deleted past this size
+
+    # Shared on-disk (L2) cache for provider responses - one file for all workers
+    L2_CACHE_ENABLED: bool = True
+    L2_CACHE_PATH: str = ".cache/l2.sqlite3"
+    L2_CACHE_MAX_BYTES: int = 100_000_000
+    PROVIDER_CACHE_L1_SIZE: int = 256                # provider responses kept in memory per worker
+    ANALYSIS_L1_SIZE: int = 256                      # stored analyses kept in memory per worker
+    ANALYSIS_L1_MAX_BYTES: int = 32_000_000          # ... and their total size (a long-document analysis can be MBs)
+
+    # Provider call ledger (tokens, cost, latency, JSON parse path)
+    PROVIDER_LEDGER_ENABLED: bool = True
+    PROVIDER_LEDGER_PATH: str = ".cache/provider_ledger.sqlite3"
+    PROVIDER_LEDGER_BATCH: int = 128                 # entries per write transaction
+    PROVIDER_LEDGER_FLUSH_INTERVAL: float = 1.0      # seconds an entry may wait for its batch
+
+    # Provider record/replay: off | record | replay (replay never calls a provider)
+    PROVIDER_CASSETTE_MODE: str = "off"
+    PROVIDER_CASSETTE_PATH: str = ".cache/provider_cassette.sqlite3"
+    PROVIDER_CASSETTE_REPLAY_LATENCY: bool = False   # sleep for the recorded latency when replaying
+
+    # Admin-only debugging (X-Admin-Token header); disabled when unset
+    ADMIN_TOKEN: Optional[str] = None
+    PROFILE_STORE_SIZE: int = 50                     # per-request profiles kept in memory
+    SAMPLER_ENABLED: bool = True                     # background stack sampler (flame graphs; needs ADMIN_TOKEN)
+    SAMPLER_INTERVAL: float = 0.05                   # seconds between samples (~20 Hz)
+    SAMPLER_WINDOW: int = 900                        # seconds of samples kept
+    SAMPLER_BUCKET_SECONDS: int = 15                 # ring buffer slot width
+    SAMPLER_MAX_STACKS: int = 2000                   # distinct stacks per slot
+
+    # Tracing (OTLP JSON spans; X-Trace-Id response header)
+    TRACING_ENABLED: bool = True
+    TRACE_SAMPLE_RATE: float = 1.0                   # fraction of new traces recorded
+    TRACE_EXPORTER: str = "none"                     # "file", "otlp" (collector over HTTP) or "none"
+    TRACE_FILE_PATH: str = ".cache/traces.jsonl"
+    TRACE_FILE_MAX_BYTES: int = 50_000_000           # file exporter rolls over to <path>.1 past this
+    OTLP_ENDPOINT: str = "http://localhost:4318/v1/traces"
+    OTLP_TIMEOUT: float = 2.0
+    TRACE_SERVICE_NAME: str = "legalai-api"
+    TRACE_EXPORT_BATCH: int = 256                    # spans per export request
+    TRACE_EXPORT_INTERVAL: float = 2.0               # seconds a span may wait for its batch
+
     class Config:
         env_file = ".env"
 
@@ -0,0 +1,83 @@
+# app/core/fieldsets.py - Sparse fieldsets (?fields=...)
+
+"""
+Parses `fields=sections,severity,actionPlan.immediateSteps` into the set of
+response fields a client renders. Producers check `wants()` before doing
+work, and `include()` feeds pydantic's model_dump(include=...).
+"""
+
+from typing import Dict, Iterable, Optional, Set
+
+
+class FieldSet:
+    """Requested top-level fields, each with an optional set of sub-fields"""
+
+    def __init__(self, fields: Optional[Dict[str, Optional[Set[str]]]] = None):
+        # None = every field; {name: None} = the whole field; {name: {...}} = only those keys
+        self.fields = fields
+
+    @classmethod
+    def parse(
+        cls,
+        spec: Optional[str],
+        allowed: Dict[str, Optional[Iterable[str]]]
+    ) -> "FieldSet":
+        """
+        Parse a comma-separated spec. `allowed` maps each top-level field to
+        its valid sub-fields (None if it has none). Raises ValueError.
+        """
+        if spec is None or not spec.strip():
+            return cls()
+
+        fields: Dict[str, Optional[Set[str]]] = {}
+        for item in spec.split(","):
+            item = item.strip()
+            if not item:
+                continue
+            name, _, sub = item.partition(".")
+            if name not in allowed:
+                raise ValueError(f"Unknown field '{name}' (choose from {sorted(allowed)})")
+
+            if not sub:
+                fields[name] = None
+                continue
+
+            valid = allowed[name]
+            if valid is None or sub not in valid:
+                raise ValueError(f"Unknown field '{item}'")
+            if name in fields and fields[name] is None:
+                continue  # Whole field already requested
+            fields.setdefault(name, set()).add(sub)
+
+        return cls(fields)
+
+    @property
+    def is_all(self) -> bool:
+        return self.fields is None
+
+    def wants(self, name: str, sub: Optional[str] = None) -> bool:
+        if self.fields is None:
+            return True
+        if name not in self.fields:
+            return False
+        subs = self.fields[name]
+        return subs is None or sub is None or sub in subs
+
+    def subfields(self, name: str) -> Optional[Set[str]]:
+        """Requested sub-fields of `name` (None = all of them)"""
+        if self.fields is None:
+            return None
+        return self.fields.get(name)
+
+    def include(self) -> Optional[Dict]:
+        """Include spec for BaseModel.model_dump"""
+        if self.fields is None:
+            return None
+        return {
+            name: True if subs is None else {sub: True for sub in subs}
+            for name, subs in self.fields.items()
+        }
+
+
+# Every field
+ALL_FIELDS = FieldSet()
@@ -0,0 +1,112 @@
+# app/core/keyword_engine.py - Shared compiled keyword engine
+
+"""
+Compiles keyword lists into a single regex so a description is scanned
+once per list instead of once per keyword.
+
+Matching keeps the substring semantics of `kw in desc_lower` used across
+the services (e.g. "intimidat" matches "intimidated").
+"""
+
+import re
+from typing import Dict, Iterable, Iterator, List, Optional
+
+
+def _trie_pattern(keywords: Iterable[str]) -> str:
+    """
+    Build a prefix-factored, greedy regex for a keyword list.
+    A flat alternation retries every keyword at every position; the trie
+    shares prefixes, and greediness reports the longest keyword at each
+    position.
+    """
+    trie: Dict = {}
+    for kw in keywords:
+        node = trie
+        for char in kw:
+            node = node.setdefault(char, {})
+        node[""] = {}  # End of keyword
+
+    def build(node: Dict) -> str:
+        branches = []
+        terminal = False
+        for char in sorted(node):
+            if char == "":
+                terminal = True
+            else:
+                branches.append(re.escape(char) + build(node[char]))
+        if not branches:
+            return ""
+        if len(branches) == 1 and not terminal:
+            return branches[0]
+        body = "|".join(branches)
+        return f"(?:{body})?" if terminal else f"(?:{body})"
+
+    return build(trie)
+
+
+class KeywordSet:
+    """A list of lowercase keywords compiled into one alternation"""
+
+    def __init__(self, name: str, keywords: Iterable[str]):
+        self.name = name
+        self.keywords = tuple(dict.fromkeys(kw.lower() for kw in keywords if kw))
+        self.max_length = max((len(kw) for kw in self.keywords), default=0)
+
+        alternation = _trie_pattern(self.keywords) if self.keywords else "(?!)"
+
+        self._any = re.compile(alternation)
+        self._all = re.compile(f"(?=({alternation}))")
+
+        # Any other keyword matching at the same position is a prefix
+        # of the longest one, so prefixes are added back after the scan
+        self._prefixes = {
+            kw: tuple(p for p in self.keywords if p != kw and kw.startswith(p))
+            for kw in self.keywords
+        }
+
+    def first(self, text_lower: str) -> Optional[str]:
+        """Leftmost keyword found in the text, or None"""
+        match = self._any.search(text_lower)
+        return match.group(0) if match else None
+
+    def find_all(self, text_lower: str) -> List[str]:
+        """All keywords found in the text, in declaration order"""
+        found = set()
+        for match in self._all.finditer(text_lower):
+            kw = match.group(1)
+            if kw not in found:
+                found.add(kw)
+                found.update(self._prefixes[kw])
+        return [kw for kw in self.keywords if kw in found]
+
+    def occurrences(self, text_lower: str, limit: Optional[int] = None) -> Iterator[str]:
+        """
+        Every keyword occurrence (overlaps included) starting before `limit`.
+        Lets callers scan a little past a chunk boundary without
+        double-counting keywords that belong to the next chunk.
+        """
+        for match in self._all.finditer(text_lower):
+            if limit is not None and match.start() >= limit:
+                break
+            kw = match.group(1)
+            yield kw
+            yield from self._prefixes[kw]
+
+    def __len__(self) -> int:
+        return len(self.keywords)
+
+
+# Process-wide registry of compiled sets
+_REGISTRY: Dict[str, KeywordSet] = {}
+
+
+def compile_keywords(name: str, keywords: Iterable[str]) -> KeywordSet:
+    """Compile and register a keyword set under `name`"""
+    keyword_set = KeywordSet(name, keywords)
+    _REGISTRY[name] = keyword_set
+    return keyword_set
+
+
+def get_keywords(name: str) -> KeywordSet:
+    """Look up a previously compiled keyword set"""
+    return _REGISTRY[name]
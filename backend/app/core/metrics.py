@@ -0,0 +1,250 @@
+# app/core/metrics.py - Prometheus metrics
+
+"""
+Counters, gauges and histograms rendered in the Prometheus text format
+at /metrics.
+
+Like rule_stats, every thread records into its own shard, so observing a
+value never takes a lock; shards are merged only when /metrics is scraped.
+Values are per worker process (each uvicorn worker is a separate target).
+"""
+
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Dict, List, Sequence, Tuple
+
+from app.core.rule_stats import ShardedCounter
+
+# Seconds - from in-memory stages (~0.1 ms) up to slow provider calls
+LATENCY_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0
+)
+
+# Analysis outcome paths: the analyzer's `method` plus the exits taken before or after it
+OUTCOME_SAFETY_BLOCKED = "safety_blocked"
+OUTCOME_CIVIL_DISPUTE = "civil_dispute"
+OUTCOME_NO_SECTIONS = "no_sections"
+OUTCOME_STORED = "stored"
+OUTCOME_ERROR = "error"
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        super().__init__(name, help, labels)
+        self._counts = ShardedCounter()
+
+    def inc(self, *label_values: str, amount: float = 1):
+        self._counts.add(label_values, amount)
+
+    def values(self) -> Dict[Tuple[str, ...], float]:
+        return dict(self._counts.snapshot())
+
+    def render(self) -> List[str]:
+        lines = self.header()
+        counts = self.values()
+        if not counts and not self.labels:
+            counts = {(): 0}
+        for values, count in sorted(counts.items()):
+            lines.append(f"{self.name}{_labels(self.labels, values)} {_number(count)}")
+        return lines
+
+
+class Gauge(Counter):
+    """Up/down value (e.g. calls in flight), sharded like Counter"""
+    kind = "gauge"
+
+    def dec(self, *label_values: str, amount: float = 1):
+        self._counts.add(label_values, -amount)
+
+    @contextmanager
+    def track(self, *label_values: str):
+        self.inc(*label_values)
+        try:
+            yield
+        finally:
+            self.dec(*label_values)
+
+
+class Histogram(_Metric):
+    """Fixed buckets; each shard keeps per-label [bucket counts..., +Inf count, sum]"""
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(sorted(buckets))
+        self._local = threading.local()
+        self._shards: List[Dict[Tuple[str, ...], List[float]]] = []
+        self._lock = threading.Lock()  # Only taken on shard registration and scrape
+
+    def _shard(self) -> Dict[Tuple[str, ...], List[float]]:
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = {}
+            with self._lock:
+                self._shards.append(shard)
+            self._local.shard = shard
+        return shard
+
+    def observe(self, value: float, *label_values: str):
+        shard = self._shard()
+        slots = shard.get(label_values)
+        if slots is None:
+            slots = shard[label_values] = [0] * (len(self.buckets) + 1) + [0.0]
+        slots[bisect_left(self.buckets, value)] += 1
+        slots[-1] += value
+
+    def time(self, *label_values: str) -> "_Timer":
+        """with histogram.time("stage"): ... - observes the elapsed seconds"""
+        return _Timer(self, label_values)
+
+    def values(self) -> Dict[Tuple[str, ...], List[float]]:
+        """Merged per-bucket (not cumulative) counts, +Inf count and sum per label set"""
+        with self._lock:
+            shards = list(self._shards)
+
+        merged: Dict[Tuple[str, ...], List[float]] = {}
+        for shard in shards:
+            for values, slots in list(shard.items()):
+                slots = list(slots)
+                total = merged.get(values)
+                if total is None:
+                    merged[values] = slots
+                else:
+                    for i, count in enumerate(slots):
+                        total[i] += count
+        return merged
+
+    def render(self) -> List[str]:
+        lines = self.header()
+        for values, slots in sorted(self.values().items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), slots):
+                cumulative += count
+                le = f'le="{_number(bound)}"'
+                lines.append(f"{self.name}_bucket{_labels(self.labels, values, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labels, values)} {_number(round(slots[-1], 6))}")
+            lines.append(f"{self.name}_count{_labels(self.labels, values)} {cumulative}")
+        return lines
+
+
+class _Timer:
+    """Context manager for Histogram.time (a plain class - cheaper than @contextmanager)"""
+    __slots__ = ("histogram", "label_values", "start")
+
+    def __init__(self, histogram: Histogram, label_values: Tuple[str, ...]):
+        self.histogram = histogram
+        self.label_values = label_values
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram.observe(time.perf_counter() - self.start, *self.label_values)
+        return False
+
+
+# =========================
+# REGISTRY
+# =========================
+REGISTRY: List[_Metric] = []
+
+
+def _register(metric):
+    REGISTRY.append(metric)
+    return metric
+
+
+http_requests = _register(Counter(
+    "legalai_http_requests_total", "HTTP requests by route and status", ("method", "route", "status")
+))
+http_latency = _register(Histogram(
+    "legalai_http_request_duration_seconds", "HTTP request latency by route", ("method", "route")
+))
+analyses = _register(Counter(
+    "legalai_analyses_total", "Case analyses by outcome path", ("path",)
+))
+analysis_latency = _register(Histogram(
+    "legalai_analysis_duration_seconds", "Case analysis latency by outcome path", ("path",)
+))
+stage_latency = _register(Histogram(
+    "legalai_stage_duration_seconds",
+    "Pipeline stage latency (classify, match, ai, validate, action_plan, documents)",
+    ("stage",)
+))
+provider_calls = _register(Counter(
+    "legalai_provider_calls_total", "AI provider calls by result (success, empty, error)", ("provider", "result")
+))
+provider_fallbacks = _register(Counter(
+    "legalai_provider_fallbacks_total", "Times a provider failed and the next one was tried", ("provider",)
+))
+provider_throttled = _register(Counter(
+    "legalai_provider_throttled_total",
+    "Provider attempts deferred by its own quota buckets or concurrency limit", ("provider", "reason")
+))
+provider_cache_hits = _register(Counter(
+    "legalai_provider_cache_hits_total", "AI calls answered from the response cache"
+))
+ai_in_flight = _register(Gauge(
+    "legalai_ai_calls_in_flight", "AI provider calls currently waiting for a response"
+))
+analyses_shed = _register(Counter(
+    "legalai_analyses_shed_total", "Analyses answered without AI because the AI queue was saturated", ("reason",)
+))
+ai_upgrades = _register(Counter(
+    "legalai_ai_upgrades_total", "Background AI re-runs of shed analyses (queued, done, dropped, expired, failed)",
+    ("result",)
+))
+
+_started_at = time.time()
+
+
+def observe_analysis(path: str, seconds: float):
+    analyses.inc(path)
+    analysis_latency.observe(seconds, path)
+
+
+def render() -> str:
+    """All metrics in the Prometheus text exposition format"""
+    lines = [
+        "# HELP legalai_process_start_time_seconds Start time of the worker process",
+        "# TYPE legalai_process_start_time_seconds gauge",
+        f'legalai_process_start_time_seconds{{pid="{os.getpid()}"}} {_started_at}',
+    ]
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,166 @@
+# app/core/profiling.py - Per-request profiling
+
+"""
+Runs one call under cProfile and condenses the result into a call tree
+(time per caller -> callee edge, pruned to the branches that matter), the
+top functions by own time, and folded stacks for flame-graph tools.
+
+cProfile records caller/callee pairs rather than whole stacks, so the tree
+and folded stacks follow the heaviest edges from the entry point - exact
+for the usual single-caller hot paths, approximate for functions called
+from several places. Profiles are kept in memory under an id.
+"""
+
+import cProfile
+import os
+import pstats
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from app.core.cache import LRUCache
+from app.core.config import settings
+
+MAX_DEPTH = 40
+MAX_CHILDREN = 8
+MIN_FRACTION = 0.005   # Branches under 0.5% of the total are dropped
+TOP_FUNCTIONS = 25
+
+Func = Tuple[str, int, str]   # (file, line, function) as in pstats
+
+_BACKEND_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class ProfilerBusy(RuntimeError):
+    """Raised when another request is already being profiled"""
+
+
+def func_label(func: Func) -> str:
+    """Short 'file:line(function)' label, paths relative to the backend"""
+    filename, line, name = func
+    if filename == "~":
+        return name   # Built-in, e.g. <built-in method builtins.len>
+    if filename.startswith(_BACKEND_ROOT):
+        filename = os.path.relpath(filename, _BACKEND_ROOT)
+    elif "site-packages" in filename:
+        filename = filename.split("site-packages" + os.sep, 1)[1]
+    else:
+        filename = os.path.basename(filename)
+    return f"{filename}:{line}({name})"
+
+
+class CallProfile:
+    """Condensed cProfile result"""
+
+    def __init__(self, stats: pstats.Stats, wall_ms: float, entry: str):
+        self.id = uuid.uuid4().hex[:16]
+        self.created_at = time.time()
+        self.wall_ms = wall_ms
+        self.entry = entry
+
+        raw = stats.stats
+        self._callees: Dict[Func, Dict[Func, float]] = {}
+        for func, (_, _, _, _, callers) in raw.items():
+            for caller, (_, _, _, cumulative) in callers.items():
+                self._callees.setdefault(caller, {})[func] = cumulative
+        self._raw = raw
+        self.total_ms = max((ct for _, _, _, ct, _ in raw.values()), default=0.0) * 1000
+
+    def _root(self) -> Optional[Func]:
+        entry = [f for f in self._raw if f[2] == self.entry]
+        if entry:
+            return max(entry, key=lambda f: self._raw[f][3])
+        return max(self._raw, key=lambda f: self._raw[f][3], default=None)
+
+    def tree(self) -> Optional[Dict]:
+        root = self._root()
+        if root is None:
+            return None
+        threshold = self.total_ms * MIN_FRACTION
+        return self._node(root, self._raw[root][3] * 1000, self._raw[root][1], threshold, (root,))
+
+    def _node(self, func: Func, ms: float, calls: int, threshold: float, path: Tuple[Func, ...]) -> Dict:
+        children = []
+        if len(path) < MAX_DEPTH:
+            callees = sorted(self._callees.get(func, {}).items(), key=lambda c: -c[1])
+            for callee, seconds in callees[:MAX_CHILDREN]:
+                child_ms = seconds * 1000
+                if child_ms < threshold or callee in path:
+                    continue
+                calls_from_here = self._raw[callee][4].get(func, (0, 0))[1]
+                children.append(self._node(callee, child_ms, calls_from_here, threshold, path + (callee,)))
+        return {
+            "name": func_label(func),
+            "ms": round(ms, 3),
+            "calls": calls,
+            "children": children,
+        }
+
+    def top(self, limit: int = TOP_FUNCTIONS) -> List[Dict]:
+        ranked = sorted(self._raw.items(), key=lambda item: -item[1][2])[:limit]
+        return [
+            {
+                "name": func_label(func),
+                "selfMs": round(tt * 1000, 3),
+                "totalMs": round(ct * 1000, 3),
+                "calls": nc,
+            }
+            for func, (_, nc, tt, ct, _) in ranked
+        ]
+
+    def folded(self) -> str:
+        """Folded stacks ("a;b;c <microseconds>" per line) from the call tree"""
+        lines: List[str] = []
+
+        def walk(node: Dict, prefix: str):
+            stack = f"{prefix};{node['name']}" if prefix else node["name"]
+            own = node["ms"] - sum(child["ms"] for child in node["children"])
+            if own > 0:
+                lines.append(f"{stack} {int(own * 1000)}")
+            for child in node["children"]:
+                walk(child, stack)
+
+        root = self.tree()
+        if root is not None:
+            walk(root, "")
+        return "\n".join(lines) + "\n"
+
+    def to_dict(self) -> Dict:
+        return {
+            "id": self.id,
+            "createdAt": self.created_at,
+            "wallMs": round(self.wall_ms, 3),
+            "profiledMs": round(self.total_ms, 3),
+            "tree": self.tree(),
+            "top": self.top(),
+        }
+
+
+_profiles = LRUCache(settings.PROFILE_STORE_SIZE)
+_profile_lock = threading.Lock()
+
+
+def profile_call(fn: Callable, *args, **kwargs) -> Tuple[Any, CallProfile]:
+    """Run fn under cProfile; returns (result, profile) and keeps the profile"""
+    if not _profile_lock.acquire(blocking=False):
+        raise ProfilerBusy("Another request is being profiled")
+    try:
+        profiler = cProfile.Profile()
+        start = time.perf_counter()
+        profiler.enable()
+        try:
+            result = fn(*args, **kwargs)
+        finally:
+            profiler.disable()
+        wall_ms = (time.perf_counter() - start) * 1000
+    finally:
+        _profile_lock.release()
+
+    profile = CallProfile(pstats.Stats(profiler), wall_ms, getattr(fn, "__name__", ""))
+    _profiles.put(profile.id, profile)
+    return result, profile
+
+
+def get_profile(profile_id: str) -> Optional[CallProfile]:
+    return _profiles.get(profile_id)
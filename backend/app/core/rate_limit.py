@@ -0,0 +1,241 @@
+# app/core/rate_limit.py - Provider quotas and adaptive concurrency
+
+"""
+Each AI provider gets a ProviderGate:
+
+- token buckets for its requests-per-minute and tokens-per-minute quotas
+  (PROVIDER_RPM / PROVIDER_TPM), so bursts are spread out before the
+  provider starts answering 429;
+- an AIMD concurrency limit: +1/limit per success (about +1 per limit's
+  worth of calls), halved on a 429 or a latency spike (PROVIDER_LATENCY_SPIKE_FACTOR
+  times the provider's usual latency), at most once per cooldown.
+
+try_admit never blocks; it returns a Permit or how long to wait, so the
+analyzer can route to the next provider with capacity or wait briefly.
+Limits are per worker process.
+"""
+
+import re
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from app.core import metrics
+
+EWMA_ALPHA = 0.1   # Weight of a new sample in the latency baseline
+
+# =========================
+# RATE-LIMIT ERRORS
+# =========================
+# SDK exception types that mean "429" (only those installed)
+RATE_LIMIT_ERRORS: Tuple[type, ...] = ()
+try:
+    import openai
+    RATE_LIMIT_ERRORS += (openai.RateLimitError,)
+except ImportError:
+    pass
+try:
+    import anthropic
+    RATE_LIMIT_ERRORS += (anthropic.RateLimitError,)
+except ImportError:
+    pass
+try:
+    from google.api_core import exceptions as google_exceptions
+    RATE_LIMIT_ERRORS += (google_exceptions.TooManyRequests, google_exceptions.ResourceExhausted)
+except ImportError:
+    pass
+
+# Last resort, for errors that only survive as text (e.g. replayed from a cassette):
+# the SDKs' own 429 wording, never a bare "429" or "quota" anywhere in the message
+RATE_LIMIT_TEXT = re.compile(
+    r"^(error code: )?429\b|\b429 too many requests\b|\bresource_exhausted\b|\brate_limit_(error|exceeded)\b"
+)
+
+
+def is_rate_limit_error(error: Optional[BaseException]) -> bool:
+    """429 / quota exhaustion, across the provider SDKs"""
+    if error is None:
+        return False
+    if isinstance(error, RATE_LIMIT_ERRORS):
+        return True
+    response = getattr(error, "response", None)
+    # HTTP status as the SDKs expose it (google-genai: code=429, status="RESOURCE_EXHAUSTED")
+    for status in (getattr(error, "status_code", None), getattr(error, "code", None),
+                   getattr(response, "status_code", None)):
+        if isinstance(status, int):
+            return status == 429
+    if getattr(error, "status", None) == "RESOURCE_EXHAUSTED":
+        return True
+    return RATE_LIMIT_TEXT.search(str(error).lower()) is not None
+
+
+class TokenBucket:
+    """`rate` tokens per second, holding at most `capacity`"""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until `amount` tokens are available (0 = now)"""
+        with self._lock:
+            self._refill(time.monotonic())
+            # A request larger than the bucket only needs a full bucket
+            missing = min(amount, self.capacity) - self.tokens
+            return max(0.0, missing / self.rate)
+
+    def take(self, amount: float):
+        """Consume `amount` (may go into debt, repaid by later refills)"""
+        with self._lock:
+            self._refill(time.monotonic())
+            self.tokens -= amount
+
+    def refund(self, amount: float):
+        with self._lock:
+            self.tokens = min(self.capacity, self.tokens + amount)
+
+
+class AdaptiveLimiter:
+    """AIMD limit on calls in flight"""
+
+    def __init__(self, initial: int, minimum: int, maximum: int, spike_factor: float):
+        self.limit = float(initial)
+        self.minimum = minimum
+        self.maximum = maximum
+        self.spike_factor = spike_factor
+        self.in_flight = 0
+        self.baseline_ms: Optional[float] = None
+        self._last_decrease = 0.0
+        self._lock = threading.Lock()
+
+    def try_acquire(self) -> bool:
+        with self._lock:
+            if self.in_flight >= int(self.limit):
+                return False
+            self.in_flight += 1
+            return True
+
+    def release(self, latency_ms: float, rate_limited: bool = False, failed: bool = False) -> Optional[str]:
+        """Adjust the limit from one finished call; returns the reason if it backed off"""
+        with self._lock:
+            self.in_flight -= 1
+            spike = (
+                self.baseline_ms is not None and not failed
+                and latency_ms > self.baseline_ms * self.spike_factor
+            )
+            if not failed and not spike:
+                self.baseline_ms = latency_ms if self.baseline_ms is None else (
+                    (1 - EWMA_ALPHA) * self.baseline_ms + EWMA_ALPHA * latency_ms
+                )
+
+            if rate_limited or spike:
+                now = time.monotonic()
+                # One decrease per burst: calls already in flight report the same congestion
+                cooldown = (self.baseline_ms or latency_ms) / 1000
+                if now - self._last_decrease >= cooldown:
+                    self.limit = max(self.minimum, self.limit / 2)
+                    self._last_decrease = now
+                return "rate_limited" if rate_limited else "latency"
+            if not failed:
+                self.limit = min(self.maximum, self.limit + 1 / self.limit)
+            return None
+
+
+class Permit:
+    """One admitted call; release() must be called when it finishes"""
+
+    __slots__ = ("gate", "tokens")
+
+    def __init__(self, gate: "ProviderGate", tokens: int):
+        self.gate = gate
+        self.tokens = tokens
+
+    def release(self, latency_ms: float, error: Optional[BaseException] = None, usage: Optional[Dict] = None):
+        """latency_ms is the provider call alone (not time spent queued before it)"""
+        self.gate._finish(self, latency_ms, error, usage or {})
+
+
+class ProviderGate:
+    """Quota buckets + adaptive concurrency for one provider"""
+
+    def __init__(
+        self,
+        name: str,
+        rpm: Optional[int] = None,
+        tpm: Optional[int] = None,
+        burst_seconds: float = 10.0,
+        initial: int = 4,
+        minimum: int = 1,
+        maximum: int = 32,
+        spike_factor: float = 2.5
+    ):
+        self.name = name
+        # Buckets hold `burst_seconds` of quota, so a burst cannot spend the whole minute at once
+        self.requests = TokenBucket(rpm / 60, max(1.0, rpm * burst_seconds / 60)) if rpm else None
+        self.tokens = TokenBucket(tpm / 60, max(1.0, tpm * burst_seconds / 60)) if tpm else None
+        self.limiter = AdaptiveLimiter(initial, minimum, maximum, spike_factor)
+        self.throttled: Dict[str, int] = {"rpm": 0, "tpm": 0, "concurrency": 0}
+        self.backoffs: Dict[str, int] = {"rate_limited": 0, "latency": 0}
+        self._lock = threading.Lock()   # Admission checks + takes are atomic across buckets
+
+    def try_admit(self, tokens: int, record: bool = True) -> Tuple[Optional[Permit], float]:
+        """
+        (permit, 0) or (None, seconds worth waiting before retrying).
+        record=False for retries of a request already counted as throttled.
+        """
+        with self._lock:
+            wait = self.requests.wait_time(1) if self.requests else 0.0
+            reason = "rpm" if wait else None
+            if not wait and self.tokens:
+                wait = self.tokens.wait_time(tokens)
+                reason = "tpm" if wait else None
+            if not wait and not self.limiter.try_acquire():
+                # No hint for a free slot - poll again shortly
+                wait, reason = 0.05, "concurrency"
+            if reason:
+                if record:
+                    self.throttled[reason] += 1
+                    metrics.provider_throttled.inc(self.name, reason)
+                return None, wait
+
+            if self.requests:
+                self.requests.take(1)
+            if self.tokens:
+                self.tokens.take(tokens)
+            return Permit(self, tokens), 0.0
+
+    def _finish(self, permit: Permit, latency_ms: float, error: Optional[BaseException], usage: Dict):
+        rate_limited = is_rate_limit_error(error)
+        reason = self.limiter.release(latency_ms, rate_limited=rate_limited, failed=error is not None)
+        if reason:
+            self.backoffs[reason] += 1
+        if self.tokens:
+            used = (usage.get("prompt_tokens") or 0) + (usage.get("completion_tokens") or 0)
+            if used:
+                # Settle the estimate against what the provider reported
+                if used > permit.tokens:
+                    self.tokens.take(used - permit.tokens)
+                else:
+                    self.tokens.refund(permit.tokens - used)
+        if rate_limited and self.requests:
+            # The provider disagrees with our bucket - drain it so we pause instead of hammering
+            self.requests.take(max(0.0, self.requests.tokens))
+
+    def stats(self) -> Dict:
+        limiter = self.limiter
+        return {
+            "concurrencyLimit": round(limiter.limit, 2),
+            "inFlight": limiter.in_flight,
+            "baselineLatencyMs": round(limiter.baseline_ms, 1) if limiter.baseline_ms is not None else None,
+            "requestTokens": round(self.requests.tokens, 2) if self.requests else None,
+            "tpmTokens": round(self.tokens.tokens) if self.tokens else None,
+            "throttled": dict(self.throttled),
+            "backoffs": dict(self.backoffs),
+        }
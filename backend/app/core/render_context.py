@@ -0,0 +1,104 @@
+# app/core/render_context.py - Clock and locale for generated documents
+
+"""
+Time-dependent fields (today's date, deadlines) are the only thing that
+stops two identical requests from producing identical documents.
+
+Generators render those fields as placeholder tokens, memoize the
+rendered text, and bind the tokens from a RenderContext on the way out.
+Tests and batch jobs can pass a fixed clock to get reproducible output.
+Output that is stored and served later (the analysis store) is rendered
+with deferred_context, which leaves the tokens in, and bound when served.
+"""
+
+import re
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Optional
+
+# Date formats per locale
+DATE_FORMATS = {
+    "en-IN": "%d/%m/%Y",
+    "hi-IN": "%d/%m/%Y",
+    "mr-IN": "%d/%m/%Y",
+    "en-US": "%m/%d/%Y",
+    "iso": "%Y-%m-%d",
+}
+
+# Private-use code points - never produced by user text or templates
+_TOKEN = "\ue000{}\ue001"
+DATE = _TOKEN.format("date")              # Locale date, e.g. 02/01/2026
+ISO_DATE = _TOKEN.format("iso_date")      # 2026-01-02
+TIMESTAMP = _TOKEN.format("timestamp")    # 2026-01-02 03:04:05
+
+_TOKEN_PATTERN = re.compile("\ue000(\\w+)(?:\\+(\\d+))?\ue001")   # iso_date+7 = a deadline
+
+
+class RenderContext:
+    """Clock + locale used to bind time-dependent placeholders"""
+
+    def __init__(
+        self,
+        clock: Callable[[], datetime] = datetime.now,
+        locale: str = "en-IN"
+    ):
+        if locale not in DATE_FORMATS:
+            raise ValueError(f"Unsupported locale: {locale}")
+        self.clock = clock
+        self.locale = locale
+        self.date_format = DATE_FORMATS[locale]
+        self._day_values = (None, "", "")
+
+    def now(self) -> datetime:
+        return self.clock()
+
+    def values(self, now: Optional[datetime] = None) -> Dict[str, str]:
+        """Placeholder values at one instant"""
+        now = now or self.now()
+        day = now.date()
+        cached = self._day_values
+        if cached[0] != day:
+            # Date strings only change once a day
+            cached = self._day_values = (day, now.strftime(self.date_format), now.strftime("%Y-%m-%d"))
+        return {
+            "date": cached[1],
+            "iso_date": cached[2],
+            "timestamp": now.strftime("%Y-%m-%d %H:%M:%S"),
+        }
+
+    def bind(self, text: str, values: Optional[Dict[str, str]] = None) -> str:
+        """Replace placeholder tokens in rendered text"""
+        if "\ue000" not in text:
+            return text
+        values = values or self.values()
+        today = None
+
+        def replace(match):
+            nonlocal today
+            if match.group(2) is None:
+                return values.get(match.group(1), match.group(0))
+            today = today or self.now()
+            return self.days_from_now(int(match.group(2)), today)
+
+        return _TOKEN_PATTERN.sub(replace, text)
+
+    def days_from_now(self, days: int, now: Optional[datetime] = None) -> str:
+        """ISO date `days` after now (deadlines)"""
+        return ((now or self.now()).date() + timedelta(days=days)).isoformat()
+
+
+class DeferredContext(RenderContext):
+    """Leaves every placeholder unbound - for output bound later, when it is served"""
+
+    def values(self, now: Optional[datetime] = None) -> Dict[str, str]:
+        return {"date": DATE, "iso_date": ISO_DATE, "timestamp": TIMESTAMP}
+
+    def bind(self, text: str, values: Optional[Dict[str, str]] = None) -> str:
+        return text
+
+    def days_from_now(self, days: int, now: Optional[datetime] = None) -> str:
+        return _TOKEN.format(f"iso_date+{days}")
+
+
+# Wall clock, Indian date format
+default_context = RenderContext()
+deferred_context = DeferredContext()
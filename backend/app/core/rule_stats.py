@@ -0,0 +1,149 @@
+# app/core/rule_stats.py - Rule hit-rate telemetry
+
+"""
+Low-overhead hit counters for the rule tables
+(CRIME_PATTERNS, SECTION_MAPPINGS, SECTION_REQUIREMENTS, IPC_420_RULES).
+
+Every thread increments its own Counter shard, so the hot path never takes
+a lock. Shards are summed only when the stats endpoint is scraped.
+Counters are per worker process - each uvicorn worker reports its own pid.
+"""
+
+import os
+import threading
+import time
+from collections import Counter
+from typing import Dict, Iterable, List, Tuple
+
+# Counter kinds
+PATTERN_KEYWORD = "pattern_keyword"            # CrimeClassifier.CRIME_PATTERNS keyword hit
+WINNING_PATTERN = "winning_pattern"            # Pattern chosen by the classifier
+SECTION_KEYWORD = "section_keyword"            # KeywordMatcher.SECTION_MAPPINGS keyword hit
+EXCLUSION = "exclusion"                        # SECTION_MAPPINGS exclusion keyword applied
+REQUIREMENT_KEYWORD = "requirement_keyword"    # SECTION_REQUIREMENTS required keyword hit
+BLOCKER = "blocker"                            # SECTION_REQUIREMENTS blocking keyword hit
+IPC_420_KEYWORD = "ipc420_keyword"             # IPC_420_RULES essential element keyword hit
+IPC_420_ANTI_KEYWORD = "ipc420_anti_keyword"   # IPC_420_RULES anti-keyword hit
+IPC_420_DISQUALIFIER = "ipc420_disqualifier"   # IPC_420_RULES disqualifier indicator hit
+AI_ONLY_PATH = "ai_only_path"                  # Category that fell through to AI-only analysis
+AI_ONLY_KEYWORD = "ai_only_keyword"            # Classifier keyword seen on the AI-only path
+SAFETY_BLOCK = "safety_block"                  # SafetyFilter illegal-intent phrase hit
+LLM_CALLS_SAVED = "llm_calls_saved"            # Provider calls skipped by early-exit stages
+
+RuleKey = Tuple[str, str, str]  # (kind, rule, keyword)
+
+
+class ShardedCounter:
+    """Per-thread Counter shards, aggregated on read"""
+
+    def __init__(self):
+        self._local = threading.local()
+        self._shards: List[Counter] = []
+        self._lock = threading.Lock()  # Only taken on shard registration and scrape
+
+    def _shard(self) -> Counter:
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = Counter()
+            with self._lock:
+                self._shards.append(shard)
+            self._local.shard = shard
+        return shard
+
+    def add(self, key, amount: int = 1):
+        self._shard()[key] += amount
+
+    def update(self, keys: Iterable):
+        self._shard().update(keys)
+
+    def snapshot(self) -> Counter:
+        with self._lock:
+            shards = list(self._shards)
+
+        total = Counter()
+        for shard in shards:
+            # dict() copies in C while holding the GIL, so the owning
+            # thread cannot resize the shard mid-copy
+            total.update(dict(shard))
+        return total
+
+    def reset(self):
+        with self._lock:
+            for shard in self._shards:
+                shard.clear()
+
+
+class RuleStats:
+    """
+    Rule hit counters plus a catalogue of every known rule,
+    so rules that never fire show up with zero hits
+    """
+
+    def __init__(self):
+        self._counter = ShardedCounter()
+        self._catalogue: Dict[str, set] = {}
+        self._started_at = time.time()
+
+    # =========================
+    # CATALOGUE
+    # =========================
+    def register(self, kind: str, rules: Dict[str, Iterable[str]]):
+        """Register the full set of (rule, keyword) pairs for a kind"""
+        entries = self._catalogue.setdefault(kind, set())
+        for rule, keywords in rules.items():
+            keywords = list(keywords)
+            if not keywords:
+                entries.add((rule, ""))
+            for keyword in keywords:
+                entries.add((rule, keyword))
+
+    # =========================
+    # HOT PATH
+    # =========================
+    def hit(self, kind: str, rule: str, keyword: str = ""):
+        self._counter.add((kind, rule, keyword))
+
+    def hits(self, kind: str, rule: str, keywords: Iterable[str]):
+        self._counter.update((kind, rule, kw) for kw in keywords)
+
+    # =========================
+    # SCRAPE
+    # =========================
+    def snapshot(self) -> Dict:
+        """Aggregate all shards into a JSON-friendly report"""
+        counts = self._counter.snapshot()
+
+        rules: Dict[str, List[Dict]] = {}
+        totals: Dict[str, int] = {}
+        for (kind, rule, keyword), hits in counts.items():
+            rules.setdefault(kind, []).append({"rule": rule, "keyword": keyword, "hits": hits})
+            totals[kind] = totals.get(kind, 0) + hits
+
+        for entries in rules.values():
+            entries.sort(key=lambda e: (-e["hits"], e["rule"], e["keyword"]))
+
+        dead_rules: Dict[str, List[Dict]] = {}
+        for kind, entries in self._catalogue.items():
+            dead = [
+                {"rule": rule, "keyword": keyword}
+                for rule, keyword in sorted(entries)
+                if counts.get((kind, rule, keyword), 0) == 0
+            ]
+            if dead:
+                dead_rules[kind] = dead
+
+        return {
+            "pid": os.getpid(),
+            "since": self._started_at,
+            "totals": totals,
+            "rules": rules,
+            "deadRules": dead_rules,
+        }
+
+    def reset(self):
+        self._counter.reset()
+        self._started_at = time.time()
+
+
+# Process-wide instance
+rule_stats = RuleStats()
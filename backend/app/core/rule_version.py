@@ -0,0 +1,60 @@
+# app/core/rule_version.py - Fingerprint of the rule tables
+
+"""
+A short hash of every rule table the pipeline reads. Cache keys and stored
+analysis ids include it, so editing a rule invalidates results computed
+under the old rules - in every worker, and across restarts.
+"""
+
+import hashlib
+import json
+from enum import Enum
+from functools import lru_cache
+
+
+def _canonical(value):
+    """JSON-friendly form with a stable order (sets sorted, enums by value)"""
+    if isinstance(value, dict):
+        return {str(k): _canonical(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_canonical(v) for v in value]
+    if isinstance(value, (set, frozenset)):
+        return sorted((_canonical(v) for v in value), key=repr)
+    if isinstance(value, Enum):
+        return value.value
+    return value
+
+
+@lru_cache(maxsize=1)
+def rule_version() -> str:
+    # Imported here - the rule tables live in services that import app.core
+    from app.core.safety import SafetyFilter
+    from app.data import legal_rules, outcome_tables
+    from app.data.ipc_sections import IPC_SECTIONS
+    from app.services.classifier import CrimeClassifier
+    from app.services.keyword_matcher import KeywordMatcher
+    from app.services.validator import SectionValidator
+
+    tables = {
+        "crime_patterns": CrimeClassifier.CRIME_PATTERNS,
+        "section_mappings": KeywordMatcher.SECTION_MAPPINGS,
+        "asset_indicators": KeywordMatcher.ASSET_INDICATORS,
+        "exclusion_rules": SectionValidator.EXCLUSION_RULES,
+        "digital_context": SectionValidator.DIGITAL_CONTEXT,
+        "physical_context": SectionValidator.PHYSICAL_CONTEXT,
+        "ipc_420_disqualifiers": SectionValidator.IPC_420_DISQUALIFIERS,
+        "section_requirements": SectionValidator.SECTION_REQUIREMENTS,
+        "ipc_420_rules": legal_rules.IPC_420_RULES,
+        "money_dispute": legal_rules.MONEY_DISPUTE_CLASSIFICATION,
+        "asset_types": legal_rules.ASSET_TYPE_RULES,
+        "threats": legal_rules.THREAT_CLASSIFICATION,
+        "confidence": legal_rules.CONFIDENCE_RULES,
+        "ipc_sections": IPC_SECTIONS,
+        "safety": [SafetyFilter.ILLEGAL_KEYWORDS, SafetyFilter.REQUIRES_DISCLAIMER],
+        "outcomes": {
+            name: getattr(outcome_tables, name)
+            for name in dir(outcome_tables) if name.isupper()
+        },
+    }
+    canonical = json.dumps(_canonical(tables), sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:12]
@@ -1,37 +1,57 @@
 from typing import List
 
+from app.core.keyword_engine import compile_keywords
+from app.core.rule_stats import rule_stats, SAFETY_BLOCK
+
 class SafetyFilter:
     """Prevents misuse and harmful queries"""
-    
+
+    # Phrased as requests for help or first-person intent, so victims describing
+    # a crime ("he threatened to murder me", "the accused is evading arrest") are not refused
     ILLEGAL_KEYWORDS = [
-        "how to kill", "murder", "bomb", "poison",
-        "evade", "hide evidence", "destroy evidence",
-        "fake", "forge documents", "bribe"
+        "how to kill", "how do i kill", "how can i kill", "help me kill",
+        "how to murder", "how do i murder", "how can i murder",
+        "how to make a bomb", "how to build a bomb", "how to make bomb",
+        "how to poison", "how do i poison", "how can i poison",
+        "how to evade", "how do i evade", "how can i evade", "help me evade",
+        "i want to evade", "i need to evade",
+        "how to hide evidence", "help me hide evidence",
+        "how to destroy evidence", "help me destroy evidence",
+        "how to forge", "help me forge", "forge documents for me",
+        "how to fake documents", "how to make fake documents",
+        "how to bribe", "help me bribe"
     ]
-    
+
     REQUIRES_DISCLAIMER = [
         "invest", "contract", "agreement", "property",
         "will", "custody", "divorce"
     ]
-    
+
     @staticmethod
     def check_query(description: str) -> dict:
         """Check if query is safe and legal"""
         desc_lower = description.lower()
-        
+
         # Check for illegal intent
-        for keyword in SafetyFilter.ILLEGAL_KEYWORDS:
-            if keyword in desc_lower:
-                return {
-                    "safe": False,
-                    "reason": "This query appears to request assistance with illegal activities",
-                    "message": "I cannot provide guidance on illegal activities. If you're facing a legal issue, please consult a lawyer."
-                }
-        
+        keyword = ILLEGAL_INTENT.first(desc_lower)
+        if keyword:
+            return {
+                "safe": False,
+                "keyword": keyword,
+                "reason": "This query appears to request assistance with illegal activities",
+                "message": "I cannot provide guidance on illegal activities. If you're facing a legal issue, please consult a lawyer."
+            }
+
         # Check if civil law disclaimer needed
-        needs_disclaimer = any(kw in desc_lower for kw in SafetyFilter.REQUIRES_DISCLAIMER)
-        
+        needs_disclaimer = CIVIL_DISCLAIMER.first(desc_lower) is not None
+
         return {
             "safe": True,
             "needs_civil_disclaimer": needs_disclaimer
         }
+
+
+ILLEGAL_INTENT = compile_keywords("safety.illegal_intent", SafetyFilter.ILLEGAL_KEYWORDS)
+CIVIL_DISCLAIMER = compile_keywords("safety.civil_disclaimer", SafetyFilter.REQUIRES_DISCLAIMER)
+
+rule_stats.register(SAFETY_BLOCK, {kw: [] for kw in ILLEGAL_INTENT.keywords})
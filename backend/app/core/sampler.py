@@ -0,0 +1,222 @@
+# app/core/sampler.py - Continuous sampling profiler
+
+"""
+A background thread that snapshots every thread's stack (sys._current_frames)
+a few times a second and counts folded stacks ("outer;...;inner") in a ring
+buffer of time slots, so /api/admin/flamegraph can show where the worker
+spends its time under real traffic.
+
+Unlike cProfile nothing is hooked into the code being measured: the cost is
+one stack walk per thread per tick, reported as overheadPercent in stats().
+Threads parked in a wait (idle pool workers, the event loop's select, socket
+reads to AI providers) are counted separately as idle, so the default graph
+shows CPU work.
+"""
+
+import os
+import random
+import re
+import sys
+import threading
+import time
+from collections import deque
+from typing import Dict, Optional
+
+from app.core.config import settings
+from app.core.profiling import func_label
+
+MAX_DEPTH = 128
+TRUNCATED = "[truncated]"   # Stacks beyond a slot's max_stacks are counted here
+THREAD_SUFFIX = re.compile(r"[-_][0-9a-f_]+(?= |$)")   # "-3", "-0_1", "-7f4f14eae3d"
+
+# Leaf frames of threads that are blocked rather than running
+IDLE_FRAMES = {
+    ("threading.py", "wait"),
+    ("threading.py", "_wait_for_tstate_lock"),
+    ("queue.py", "get"),
+    ("selectors.py", "select"),
+    ("socket.py", "readinto"),
+    ("ssl.py", "read"),
+}
+
+
+class _Slot:
+    __slots__ = ("start", "busy", "idle")
+
+    def __init__(self, start: float):
+        self.start = start
+        self.busy: Dict[str, int] = {}
+        self.idle: Dict[str, int] = {}
+
+
+class StackSampler:
+    """Samples all threads every `interval` seconds into `window` seconds of slots"""
+
+    def __init__(self, interval: float, window: int, bucket_seconds: int, max_stacks: int):
+        self.interval = interval
+        self.bucket_seconds = bucket_seconds
+        self.max_stacks = max_stacks
+        self._slots: deque = deque(maxlen=max(1, window // bucket_seconds))
+        self._labels: Dict[object, str] = {}   # code object -> label
+        self._lock = threading.Lock()          # Guards _slots against readers
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.samples = 0
+        self.sample_seconds = 0.0
+        self.started_at: Optional[float] = None
+
+    # =========================
+    # LIFECYCLE
+    # =========================
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self.started_at = time.time()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1)
+            self._thread = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def _run(self):
+        # Jittered interval so sampling does not phase-lock with periodic work
+        while not self._stop.wait(self.interval * random.uniform(0.5, 1.5)):
+            start = time.perf_counter()
+            try:
+                self.sample()
+            except Exception as e:   # Never let the sampler take the worker down
+                print(f"⚠️ Stack sampler error: {e}")
+            self.sample_seconds += time.perf_counter() - start
+
+    # =========================
+    # SAMPLING
+    # =========================
+    def _label(self, code) -> str:
+        label = self._labels.get(code)
+        if label is None:
+            if len(self._labels) > 20000:
+                self._labels.clear()
+            label = self._labels[code] = func_label((code.co_filename, code.co_firstlineno, code.co_name))
+        return label
+
+    def sample(self):
+        """Record one stack per thread (except the sampler's own)"""
+        own = threading.get_ident()
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        now = time.time()
+
+        stacks = []
+        for ident, frame in sys._current_frames().items():
+            if ident == own:
+                continue
+            leaf = frame.f_code
+            idle = (os.path.basename(leaf.co_filename), leaf.co_name) in IDLE_FRAMES
+            labels = []
+            while frame is not None and len(labels) < MAX_DEPTH:
+                labels.append(self._label(frame.f_code))
+                frame = frame.f_back
+            labels.append(_thread_group(names.get(ident, "thread")))
+            labels.reverse()
+            stacks.append((";".join(labels), idle))
+
+        with self._lock:
+            slot = self._slots[-1] if self._slots else None
+            if slot is None or now - slot.start >= self.bucket_seconds:
+                slot = _Slot(now)
+                self._slots.append(slot)
+            for stack, idle in stacks:
+                counts = slot.idle if idle else slot.busy
+                if stack not in counts and len(counts) >= self.max_stacks:
+                    stack = TRUNCATED
+                counts[stack] = counts.get(stack, 0) + 1
+            self.samples += 1
+
+    # =========================
+    # READING
+    # =========================
+    def folded(self, seconds: Optional[float] = None, include_idle: bool = False) -> Dict[str, int]:
+        """Merged stack counts over the last `seconds` (default: the whole window)"""
+        since = time.time() - seconds if seconds else 0
+        with self._lock:
+            slots = [slot for slot in self._slots if slot.start + self.bucket_seconds > since]
+            merged: Dict[str, int] = {}
+            for slot in slots:
+                sources = (slot.busy, slot.idle) if include_idle else (slot.busy,)
+                for counts in sources:
+                    for stack, count in counts.items():
+                        merged[stack] = merged.get(stack, 0) + count
+        return merged
+
+    def reset(self):
+        with self._lock:
+            self._slots.clear()
+
+    def stats(self) -> Dict:
+        elapsed = time.time() - self.started_at if self.started_at else 0
+        with self._lock:
+            oldest = self._slots[0].start if self._slots else None
+        return {
+            "running": self.running,
+            "intervalMs": round(self.interval * 1000, 1),
+            "samples": self.samples,
+            "windowSeconds": self.bucket_seconds * self._slots.maxlen,
+            "coveredSeconds": round(time.time() - oldest, 1) if oldest else 0,
+            "avgSampleUs": round(self.sample_seconds / self.samples * 1e6, 1) if self.samples else 0,
+            "overheadPercent": round(self.sample_seconds / elapsed * 100, 3) if elapsed else 0,
+        }
+
+
+def _thread_group(name: str) -> str:
+    """Root frame for a thread: pool threads share one root (e.g. 'AnyIO worker thread')"""
+    return "[" + THREAD_SUFFIX.sub("", name) + "]"
+
+
+def folded_text(counts: Dict[str, int]) -> str:
+    """Brendan Gregg's folded format, for flamegraph.pl / speedscope"""
+    return "".join(f"{stack} {count}\n" for stack, count in sorted(counts.items()))
+
+
+def flame_tree(counts: Dict[str, int], name: str = "all") -> Dict:
+    """Nested {name, value, children} (d3-flame-graph format)"""
+    root = {"name": name, "value": 0, "children": {}}
+    for stack, count in counts.items():
+        root["value"] += count
+        node = root
+        for frame in stack.split(";"):
+            child = node["children"].get(frame)
+            if child is None:
+                child = node["children"][frame] = {"name": frame, "value": 0, "children": {}}
+            child["value"] += count
+            node = child
+
+    def finish(node: Dict) -> Dict:
+        children = sorted(node["children"].values(), key=lambda c: -c["value"])
+        node["children"] = [finish(child) for child in children]
+        return node
+
+    return finish(root)
+
+
+_sampler: Optional[StackSampler] = None
+_sampler_lock = threading.Lock()
+
+
+def get_sampler() -> StackSampler:
+    """Process-wide sampler (created stopped; main.py starts it when enabled)"""
+    global _sampler
+    if _sampler is None:
+        with _sampler_lock:
+            if _sampler is None:
+                _sampler = StackSampler(
+                    settings.SAMPLER_INTERVAL, settings.SAMPLER_WINDOW,
+                    settings.SAMPLER_BUCKET_SECONDS, settings.SAMPLER_MAX_STACKS
+                )
+    return _sampler
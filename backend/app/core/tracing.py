@@ -0,0 +1,297 @@
+# app/core/tracing.py - Lightweight request tracing
+
+"""
+Spans around the pipeline stages (classification, matching, each provider
+attempt, JSON parsing, validation, document generation), exported in the
+OTLP JSON format either to a file (one ExportTraceServiceRequest per line,
+readable by the collector's otlpjsonfile receiver) or to a collector's
+OTLP/HTTP endpoint. Export is off unless TRACE_EXPORTER is set; the file
+is capped at TRACE_FILE_MAX_BYTES, rolling over to one previous file.
+
+The current span lives in a contextvar, so nested `with span(...)` blocks
+form a tree without passing anything around; FastAPI copies the context
+into the threadpool that runs sync endpoints. Finished spans are queued
+and exported in batches by a background thread.
+"""
+
+import atexit
+import contextvars
+import json
+import os
+import random
+import re
+import threading
+import time
+import urllib.request
+from typing import Any, Dict, List, Optional
+
+from app.core import metrics
+from app.core.batch_writer import BatchWriter
+from app.core.config import settings
+
+# OTLP span kinds / status codes
+KIND_INTERNAL = 1
+KIND_SERVER = 2
+KIND_CLIENT = 3
+STATUS_OK = 1
+STATUS_ERROR = 2
+
+TRACEPARENT = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$")
+
+_current: "contextvars.ContextVar[Optional[Span]]" = contextvars.ContextVar("current_span", default=None)
+
+
+def _attribute(key: str, value: Any) -> Dict:
+    if isinstance(value, bool):
+        typed = {"boolValue": value}
+    elif isinstance(value, int):
+        typed = {"intValue": str(value)}
+    elif isinstance(value, float):
+        typed = {"doubleValue": value}
+    else:
+        typed = {"stringValue": str(value)}
+    return {"key": key, "value": typed}
+
+
+class Span:
+    """One timed operation; use as a context manager"""
+
+    __slots__ = ("trace_id", "span_id", "parent_id", "name", "kind", "attributes",
+                 "start_ns", "end_ns", "status", "message", "_token")
+
+    def __init__(self, name: str, trace_id: str, parent_id: Optional[str] = None,
+                 kind: int = KIND_INTERNAL, attributes: Optional[Dict] = None):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent_id
+        self.kind = kind
+        self.attributes = attributes or {}
+        self.start_ns = 0
+        self.end_ns = 0
+        self.status = 0
+        self.message = ""
+        self._token = None
+
+    def set_attribute(self, key: str, value: Any):
+        self.attributes[key] = value
+
+    def rename(self, name: str):
+        self.name = name
+
+    def set_error(self, message: str):
+        self.status = STATUS_ERROR
+        self.message = message[:500]
+
+    def __enter__(self) -> "Span":
+        self.start_ns = time.time_ns()
+        self._token = _current.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.end_ns = time.time_ns()
+        _current.reset(self._token)
+        if exc is not None and self.status != STATUS_ERROR:
+            self.set_error(f"{exc_type.__name__}: {exc}")
+        exporter = get_exporter()
+        if exporter is not None:
+            exporter.export(self)
+        return False
+
+    def to_otlp(self) -> Dict:
+        span = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": self.kind,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns),
+            "attributes": [_attribute(k, v) for k, v in self.attributes.items() if v is not None],
+        }
+        if self.parent_id:
+            span["parentSpanId"] = self.parent_id
+        if self.status:
+            span["status"] = {"code": self.status, "message": self.message}
+        return span
+
+
+class _NoopSpan:
+    """Stands in for a span when tracing is off or the trace is not sampled"""
+
+    trace_id = None
+
+    def set_attribute(self, key: str, value: Any):
+        pass
+
+    def rename(self, name: str):
+        pass
+
+    def set_error(self, message: str):
+        pass
+
+    def __enter__(self) -> "_NoopSpan":
+        self._token = _current.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        _current.reset(self._token)
+        return False
+
+
+def _sampled() -> bool:
+    return settings.TRACING_ENABLED and random.random() < settings.TRACE_SAMPLE_RATE
+
+
+def span(name: str, kind: int = KIND_INTERNAL, **attributes):
+    """Child of the current span, or the root of a new trace if there is none"""
+    parent = _current.get()
+    if isinstance(parent, _NoopSpan) or (parent is None and not _sampled()):
+        return _NoopSpan()
+    if parent is None:
+        return Span(name, os.urandom(16).hex(), kind=kind, attributes=attributes)
+    return Span(name, parent.trace_id, parent.span_id, kind, attributes)
+
+
+def request_span(name: str, traceparent: Optional[str] = None, **attributes):
+    """Root span for an incoming request, continuing a W3C traceparent if given"""
+    match = TRACEPARENT.match(traceparent.strip().lower()) if traceparent else None
+    if match:
+        if not settings.TRACING_ENABLED or not int(match.group(3), 16) & 1:
+            return _NoopSpan()
+        return Span(name, match.group(1), match.group(2), KIND_SERVER, attributes)
+    if not _sampled():
+        return _NoopSpan()
+    return Span(name, os.urandom(16).hex(), kind=KIND_SERVER, attributes=attributes)
+
+
+def current_span():
+    return _current.get()
+
+
+def current_trace_id() -> Optional[str]:
+    current = _current.get()
+    return current.trace_id if current is not None else None
+
+
+# =========================
+# EXPORT
+# =========================
+class SpanExporter:
+    """Batches finished spans into OTLP JSON requests for a file or a collector"""
+
+    def __init__(self, target: str, path: Optional[str] = None, endpoint: Optional[str] = None):
+        self.target = target
+        self.path = path or settings.TRACE_FILE_PATH
+        self.endpoint = endpoint or settings.OTLP_ENDPOINT
+        self.exported = 0
+        self.failed = 0
+        if target == "file":
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+        self._writer = BatchWriter(
+            self._write_batch, settings.TRACE_EXPORT_BATCH, settings.TRACE_EXPORT_INTERVAL,
+            name="span-exporter"
+        )
+
+    def export(self, finished: Span):
+        self._writer.put(finished)
+
+    def flush(self):
+        self._writer.flush()
+
+    def close(self):
+        self._writer.close()
+
+    def _request(self, spans: List[Span]) -> Dict:
+        return {"resourceSpans": [{
+            "resource": {"attributes": [
+                _attribute("service.name", settings.TRACE_SERVICE_NAME),
+                _attribute("process.pid", os.getpid()),
+            ]},
+            "scopeSpans": [{
+                "scope": {"name": "legalai.tracing"},
+                "spans": [s.to_otlp() for s in spans],
+            }],
+        }]}
+
+    def _write_batch(self, spans: List[Span]):
+        body = json.dumps(self._request(spans), separators=(",", ":"))
+        try:
+            if self.target == "otlp":
+                request = urllib.request.Request(
+                    self.endpoint, data=body.encode("utf-8"),
+                    headers={"Content-Type": "application/json"}, method="POST"
+                )
+                with urllib.request.urlopen(request, timeout=settings.OTLP_TIMEOUT) as response:
+                    response.read()
+            else:
+                self._rotate()
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(body + "\n")
+            self.exported += len(spans)
+        except OSError as e:
+            self.failed += len(spans)
+            print(f"⚠️ Span export to {self.endpoint if self.target == 'otlp' else self.path} failed: {e}")
+
+    def _rotate(self):
+        """Keep the file under TRACE_FILE_MAX_BYTES - the previous file is kept as <path>.1"""
+        try:
+            if os.path.getsize(self.path) < settings.TRACE_FILE_MAX_BYTES:
+                return
+        except OSError:
+            return
+        os.replace(self.path, self.path + ".1")
+
+    def stats(self) -> Dict:
+        return {
+            "target": self.target,
+            "destination": self.endpoint if self.target == "otlp" else self.path,
+            "exported": self.exported,
+            "failed": self.failed,
+            "pending": self._writer.pending,
+        }
+
+
+_exporter: Optional[SpanExporter] = None
+_exporter_lock = threading.Lock()
+
+
+def get_exporter() -> Optional[SpanExporter]:
+    """Process-wide exporter (None when tracing or export is off)"""
+    global _exporter
+    if not settings.TRACING_ENABLED or settings.TRACE_EXPORTER not in ("file", "otlp"):
+        return None
+    if _exporter is None:
+        with _exporter_lock:
+            if _exporter is None:
+                _exporter = SpanExporter(settings.TRACE_EXPORTER)
+                atexit.register(_exporter.close)
+                print(f"🔭 Exporting spans ({_exporter.target}): {_exporter.stats()['destination']}")
+    return _exporter
+
+
+# =========================
+# PIPELINE STAGES
+# =========================
+class _Stage:
+    """Span plus a legalai_stage_duration_seconds observation"""
+
+    __slots__ = ("timer", "span")
+
+    def __init__(self, name: str, attributes: Dict):
+        self.timer = metrics.stage_latency.time(name)
+        self.span = span(name, **attributes)
+
+    def __enter__(self):
+        self.timer.__enter__()
+        return self.span.__enter__()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.span.__exit__(exc_type, exc, tb)
+        return self.timer.__exit__(exc_type, exc, tb)
+
+
+def stage(name: str, **attributes) -> _Stage:
+    """with stage("classify"): ... - traced and timed pipeline stage"""
+    return _Stage(name, attributes)
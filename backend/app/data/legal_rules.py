@@ -8,6 +8,13 @@ Following Supreme Court precedents and statutory requirements
 from typing import Dict, List, Set
 from enum import Enum
 
+from app.core.rule_stats import (
+    rule_stats,
+    IPC_420_KEYWORD,
+    IPC_420_ANTI_KEYWORD,
+    IPC_420_DISQUALIFIER
+)
+
 class LegalDomain(Enum):
     CRIMINAL = "criminal"
     CIVIL = "civil"
@@ -231,6 +238,15 @@ CONFIDENCE_RULES = {
 # VALIDATION FUNCTIONS
 # ============================================
 
+def _element_present(desc_lower: str, element: str, field: str = "keywords") -> bool:
+    """Check an IPC 420 element's keywords and record which ones fired"""
+    found = [kw for kw in IPC_420_RULES["essential_elements"][element][field] if kw in desc_lower]
+    if found:
+        kind = IPC_420_KEYWORD if field == "keywords" else IPC_420_ANTI_KEYWORD
+        rule_stats.hits(kind, element, found)
+    return bool(found)
+
+
 def validate_ipc_420(description: str, keywords_found: List[str]) -> Dict:
     """
     Validate if IPC 420 (Cheating) applies with STRICT requirements
@@ -247,13 +263,15 @@ def validate_ipc_420(description: str, keywords_found: List[str]) -> Dict:
     desc_lower = description.lower()
     
     # Check essential elements
-    has_deception = any(kw in desc_lower for kw in IPC_420_RULES["essential_elements"]["deception"]["keywords"])
-    has_intention = any(kw in desc_lower for kw in IPC_420_RULES["essential_elements"]["dishonest_intention"]["keywords"])
-    has_delivery = any(kw in desc_lower for kw in IPC_420_RULES["essential_elements"]["property_delivery"]["keywords"])
+    has_deception = _element_present(desc_lower, "deception")
+    has_intention = _element_present(desc_lower, "dishonest_intention")
+    has_delivery = _element_present(desc_lower, "property_delivery")
     
     # Check disqualifiers (these BLOCK IPC 420)
     for disqualifier in IPC_420_RULES["disqualifiers"]:
-        if any(indicator in desc_lower for indicator in disqualifier["indicators"]):
+        indicators_found = [ind for ind in disqualifier["indicators"] if ind in desc_lower]
+        if indicators_found:
+            rule_stats.hits(IPC_420_DISQUALIFIER, disqualifier["pattern"], indicators_found)
             return {
                 "applies": False,
                 "confidence": 0.0,
@@ -263,8 +281,8 @@ def validate_ipc_420(description: str, keywords_found: List[str]) -> Dict:
             }
     
     # Check anti-keywords
-    has_anti_deception = any(kw in desc_lower for kw in IPC_420_RULES["essential_elements"]["deception"]["anti_keywords"])
-    has_anti_intention = any(kw in desc_lower for kw in IPC_420_RULES["essential_elements"]["dishonest_intention"]["anti_keywords"])
+    has_anti_deception = _element_present(desc_lower, "deception", "anti_keywords")
+    has_anti_intention = _element_present(desc_lower, "dishonest_intention", "anti_keywords")
     
     if has_anti_deception or has_anti_intention:
         return {
@@ -346,6 +364,20 @@ def classify_money_dispute(description: str) -> Dict:
     }
 
 
+rule_stats.register(
+    IPC_420_KEYWORD,
+    {name: el["keywords"] for name, el in IPC_420_RULES["essential_elements"].items()}
+)
+rule_stats.register(
+    IPC_420_ANTI_KEYWORD,
+    {name: el["anti_keywords"] for name, el in IPC_420_RULES["essential_elements"].items()}
+)
+rule_stats.register(
+    IPC_420_DISQUALIFIER,
+    {d["pattern"]: d["indicators"] for d in IPC_420_RULES["disqualifiers"]}
+)
+
+
 # Export all rules
 __all__ = [
     'IPC_420_RULES',
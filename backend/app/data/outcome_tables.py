@@ -0,0 +1,119 @@
+# app/data/outcome_tables.py - Outcome probability tables for case simulation
+
+"""
+Per-stage probabilities, durations and costs used by the outcome simulator.
+
+A case profile starts from DEFAULT_PROFILE and is overridden, in order, by
+the non-bailable profile, the offence category and the specific section.
+Description signals then shift the stage probabilities on the log-odds
+scale. These are starting estimates - recalibrate against outcome data.
+"""
+
+from typing import Dict, List, Tuple
+
+# Probabilities are per stage, conditional on reaching it:
+#   fir         - FIR registered
+#   settlement  - compromise / compounding after registration
+#   chargesheet - chargesheet filed (otherwise closure report)
+#   bail        - accused granted bail
+#   conviction  - trial ends in conviction
+DEFAULT_PROFILE: Dict[str, float] = {
+    "fir": 0.88,
+    "settlement": 0.08,
+    "chargesheet": 0.78,
+    "bail": 0.70,
+    "conviction": 0.70,
+    # Months
+    "investigation_min": 2,
+    "investigation_max": 6,
+    "chargesheet_min": 1,
+    "chargesheet_max": 3,
+    "trial_median": 18,
+    "trial_sigma": 0.45,       # Log-normal spread of the trial length
+    # Rupees
+    "hearings_per_month": 1.0,
+    "hearing_cost_min": 2000,
+    "hearing_cost_max": 10000,
+    "fixed_cost_min": 20000,   # Consultation + retainer + misc
+    "fixed_cost_max": 80000,
+    "expert_cost_min": 0,      # Forensics / medical experts (prosecuted cases)
+    "expert_cost_max": 0,
+    "bail_cost_min": 0,        # Opposing bail (prosecuted cases)
+    "bail_cost_max": 0,
+}
+
+NON_BAILABLE_PROFILE: Dict[str, float] = {
+    "bail": 0.45,
+    "trial_median": 22,
+    "fixed_cost_min": 30000,
+    "fixed_cost_max": 120000,
+    "bail_cost_min": 10000,
+    "bail_cost_max": 50000,
+}
+
+# Category -> (section code fragments, overrides)
+CATEGORY_PROFILES: Dict[str, Tuple[Tuple[str, ...], Dict[str, float]]] = {
+    "cyber": (("IT Act",), {
+        "fir": 0.80,
+        "chargesheet": 0.62,
+        "conviction": 0.62,
+        "investigation_max": 9,
+        "expert_cost_min": 15000,
+        "expert_cost_max": 75000,
+    }),
+    "financial": (("IPC 420", "IPC 406", "IPC 415"), {
+        "settlement": 0.18,
+        "chargesheet": 0.72,
+        "conviction": 0.60,
+        "trial_median": 24,
+        "expert_cost_min": 20000,
+        "expert_cost_max": 100000,
+    }),
+    "violent": (("IPC 323", "IPC 325", "IPC 326", "IPC 307", "IPC 302"), {
+        "fir": 0.92,
+        "chargesheet": 0.85,
+        "expert_cost_min": 10000,
+        "expert_cost_max": 50000,
+    }),
+    "sexual": (("IPC 354", "IPC 375", "IPC 376", "POCSO"), {
+        "fir": 0.90,
+        "settlement": 0.0,         # Not compoundable
+        "chargesheet": 0.86,
+        "trial_median": 24,
+        "expert_cost_min": 10000,
+        "expert_cost_max": 50000,
+    }),
+    "domestic": (("DV Act", "Dowry Act", "IPC 498A"), {
+        "settlement": 0.25,
+        "conviction": 0.55,
+    }),
+}
+
+# Section-specific overrides (applied last)
+SECTION_PROFILES: Dict[str, Dict[str, float]] = {
+    "IPC 302": {"bail": 0.20, "conviction": 0.62, "trial_median": 36, "settlement": 0.0},
+    "IPC 307": {"bail": 0.35, "trial_median": 30, "settlement": 0.0},
+    "IPC 376": {"bail": 0.25, "conviction": 0.60, "trial_median": 30},
+    "IPC 323": {"settlement": 0.30, "trial_median": 12},
+    "IPC 379": {"settlement": 0.15, "chargesheet": 0.65, "trial_median": 12},
+    "IPC 500": {"fir": 0.60, "settlement": 0.30},
+    "IPC 506": {"settlement": 0.20},
+    "IT Act 66C": {"chargesheet": 0.55},
+    "IT Act 66D": {"chargesheet": 0.55},
+}
+
+# Description keywords -> log-odds shift of stage probabilities
+EVIDENCE_KEYWORDS = ("screenshot", "cctv", "recording", "witness", "photo", "video", "proof", "document")
+EVIDENCE_SHIFT = {"chargesheet": 0.20, "conviction": 0.25}   # Per evidence item (max 3)
+MAX_EVIDENCE_ITEMS = 3
+
+SIGNAL_SHIFTS: List[Tuple[str, Tuple[str, ...], Dict[str, float]]] = [
+    ("prompt_report", ("immediately", "right away"), {"fir": 0.30, "conviction": 0.10}),
+    ("delayed_report", ("days ago", "weeks ago", "delayed"), {"fir": -0.40, "conviction": -0.25}),
+    ("no_witness", ("no witness",), {"conviction": -0.30}),
+]
+
+# Extra sections corroborate the primary charge
+MULTI_SECTION_SHIFT = {"conviction": 0.10}   # Per extra section (max 2)
+
+COMPLEX_TRIAL_FACTOR = 1.35                  # Multiple accused / transactions
@@ -0,0 +1,187 @@
+# app/data/practice_areas.py - Section / case type to practice area mappings
+
+"""
+Practice areas a lawyer should cover for each section code and case type.
+Ported from src/lib/lawyerMatcher.ts (PRACTICE_AREA_MAPPING,
+CASE_TYPE_MAPPING) - keep the two in sync while the frontend still scores
+locally.
+"""
+
+from typing import Dict, List, Tuple
+
+PRACTICE_AREA_MAPPING: Dict[str, List[str]] = {
+    # Cyber Crime & IT Act
+    "IPC 66": ["Cyber Crime", "IT Law", "Criminal Law"],
+    "IPC 66A": ["Cyber Crime", "IT Law", "Criminal Law"],
+    "IPC 66B": ["Cyber Crime", "IT Law", "Criminal Law"],
+    "IPC 66C": ["Cyber Crime", "IT Law", "Criminal Law"],
+    "IPC 66D": ["Cyber Crime", "IT Law", "Criminal Law"],
+    "IPC 66E": ["Cyber Crime", "IT Law", "Criminal Law"],
+    "IPC 66F": ["Cyber Crime", "IT Law", "Criminal Law"],
+    "IT Act 43": ["Cyber Crime", "IT Law", "Criminal Law"],
+    "IT Act 65": ["Cyber Crime", "IT Law", "Criminal Law"],
+    "IT Act 66C": ["Cyber Crime", "IT Law", "Criminal Law"],
+    "IT Act 66D": ["Cyber Crime", "IT Law", "Criminal Law"],
+    "IT Act 66E": ["Cyber Crime", "IT Law", "Criminal Law"],
+    "IT Act 67": ["Cyber Crime", "IT Law", "Criminal Law"],
+
+    # Theft & Property Crimes
+    "IPC 378": ["Criminal Law", "Property Law", "Theft"],
+    "IPC 379": ["Criminal Law", "Property Law", "Theft"],
+    "IPC 380": ["Criminal Law", "Property Law", "Theft"],
+    "IPC 381": ["Criminal Law", "Property Law", "Theft"],
+    "IPC 382": ["Criminal Law", "Property Law", "Theft"],
+    "IPC 403": ["Criminal Law", "Property Law", "Theft"],
+    "IPC 404": ["Criminal Law", "Property Law", "Theft"],
+    "IPC 405": ["Criminal Law", "Property Law", "Criminal Breach of Trust"],
+    "IPC 406": ["Criminal Law", "Property Law", "Criminal Breach of Trust"],
+    "IPC 407": ["Criminal Law", "Property Law", "Criminal Breach of Trust"],
+    "IPC 408": ["Criminal Law", "Property Law", "Criminal Breach of Trust"],
+    "IPC 409": ["Criminal Law", "Property Law", "Criminal Breach of Trust"],
+
+    # Robbery & Dacoity
+    "IPC 390": ["Criminal Law", "Robbery", "Serious Offenses"],
+    "IPC 392": ["Criminal Law", "Robbery", "Serious Offenses"],
+    "IPC 393": ["Criminal Law", "Robbery", "Serious Offenses"],
+    "IPC 394": ["Criminal Law", "Robbery", "Serious Offenses"],
+    "IPC 395": ["Criminal Law", "Robbery", "Serious Offenses"],  # Dacoity
+    "IPC 396": ["Criminal Law", "Robbery", "Murder", "Serious Offenses"],
+
+    # Cheating & Fraud
+    "IPC 415": ["Criminal Law", "Fraud", "Economic Offenses"],
+    "IPC 416": ["Criminal Law", "Fraud", "Economic Offenses"],
+    "IPC 417": ["Criminal Law", "Fraud", "Economic Offenses"],
+    "IPC 418": ["Criminal Law", "Fraud", "Economic Offenses"],
+    "IPC 419": ["Criminal Law", "Fraud", "Economic Offenses"],
+    "IPC 420": ["Criminal Law", "Fraud", "Economic Offenses", "IPC 420"],
+
+    # Extortion & Threats
+    "IPC 383": ["Criminal Law", "Extortion"],
+    "IPC 384": ["Criminal Law", "Extortion"],
+    "IPC 385": ["Criminal Law", "Extortion"],
+    "IPC 386": ["Criminal Law", "Extortion"],
+    "IPC 387": ["Criminal Law", "Extortion"],
+    "IPC 503": ["Criminal Law", "Intimidation"],
+    "IPC 504": ["Criminal Law", "Intimidation"],
+    "IPC 505": ["Criminal Law", "Intimidation"],
+    "IPC 506": ["Criminal Law", "Intimidation"],
+    "IPC 507": ["Criminal Law", "Intimidation"],
+
+    # Assault & Violence
+    "IPC 319": ["Criminal Law", "Assault", "Violence"],
+    "IPC 320": ["Criminal Law", "Assault", "Violence"],
+    "IPC 321": ["Criminal Law", "Assault", "Violence"],
+    "IPC 322": ["Criminal Law", "Assault", "Violence"],
+    "IPC 323": ["Criminal Law", "Assault", "Violence", "IPC 323-326"],
+    "IPC 324": ["Criminal Law", "Assault", "Violence", "IPC 323-326"],
+    "IPC 325": ["Criminal Law", "Assault", "Violence", "IPC 323-326"],
+    "IPC 326": ["Criminal Law", "Assault", "Violence", "IPC 323-326"],
+    "IPC 326A": ["Criminal Law", "Assault", "Acid Attack", "Women Rights"],
+    "IPC 326B": ["Criminal Law", "Assault", "Acid Attack", "Women Rights"],
+
+    # Murder & Culpable Homicide
+    "IPC 299": ["Criminal Law", "Murder", "Serious Offenses"],
+    "IPC 300": ["Criminal Law", "Murder", "Serious Offenses"],
+    "IPC 302": ["Criminal Law", "Murder", "Serious Offenses"],
+    "IPC 304": ["Criminal Law", "Murder", "Serious Offenses"],
+    "IPC 304A": ["Criminal Law", "Murder", "Serious Offenses"],
+    "IPC 304B": ["Criminal Law", "Murder", "Dowry Death", "Women Rights"],
+    "IPC 305": ["Criminal Law", "Murder", "Serious Offenses"],
+    "IPC 306": ["Criminal Law", "Abetment of Suicide", "Serious Offenses"],
+    "IPC 307": ["Criminal Law", "Attempted Murder", "Serious Offenses"],
+    "IPC 308": ["Criminal Law", "Attempted Murder", "Serious Offenses"],
+
+    # Domestic Violence & Women
+    "IPC 498": ["Domestic Violence", "Family Law", "Criminal Law"],
+    "IPC 498A": ["Domestic Violence", "Family Law", "Women Rights", "Criminal Law"],
+    "IPC 113A": ["Domestic Violence", "Family Law", "Women Rights"],
+    "IPC 113B": ["Domestic Violence", "Family Law", "Women Rights"],
+
+    # Sexual Offenses
+    "IPC 354": ["Criminal Law", "Sexual Offenses", "Women Rights"],
+    "IPC 354A": ["Criminal Law", "Sexual Offenses", "Women Rights"],
+    "IPC 354B": ["Criminal Law", "Sexual Offenses", "Women Rights"],
+    "IPC 354C": ["Criminal Law", "Sexual Offenses", "Women Rights"],
+    "IPC 354D": ["Criminal Law", "Sexual Offenses", "Stalking", "Women Rights"],
+    "IPC 375": ["Criminal Law", "Sexual Offenses", "Rape", "Women Rights"],
+    "IPC 376": ["Criminal Law", "Sexual Offenses", "Rape", "Women Rights"],
+    "IPC 376A": ["Criminal Law", "Sexual Offenses", "Rape", "Women Rights"],
+    "IPC 376B": ["Criminal Law", "Sexual Offenses", "Rape", "Women Rights"],
+    "IPC 376C": ["Criminal Law", "Sexual Offenses", "Rape", "Women Rights"],
+    "IPC 376D": ["Criminal Law", "Sexual Offenses", "Rape", "Women Rights"],
+    "IPC 509": ["Criminal Law", "Sexual Offenses", "Women Rights"],
+
+    # Kidnapping & Abduction
+    "IPC 363": ["Criminal Law", "Kidnapping"],
+    "IPC 364": ["Criminal Law", "Kidnapping"],
+    "IPC 364A": ["Criminal Law", "Kidnapping", "Serious Offenses"],
+    "IPC 365": ["Criminal Law", "Kidnapping"],
+    "IPC 366": ["Criminal Law", "Kidnapping"],
+    "IPC 367": ["Criminal Law", "Kidnapping"],
+    "IPC 368": ["Criminal Law", "Kidnapping"],
+
+    # Defamation
+    "IPC 499": ["Criminal Law", "Defamation", "Civil Rights"],
+    "IPC 500": ["Criminal Law", "Defamation", "Civil Rights"],
+    "IPC 501": ["Criminal Law", "Defamation", "Civil Rights"],
+
+    # Hate Speech & Communal
+    "IPC 153A": ["Criminal Law", "Hate Speech", "Constitutional Law"],
+    "IPC 153B": ["Criminal Law", "Hate Speech", "Constitutional Law"],
+    "IPC 295": ["Criminal Law", "Religious Offenses", "Constitutional Law"],
+    "IPC 295A": ["Criminal Law", "Religious Offenses", "Constitutional Law"],
+    "IPC 296": ["Criminal Law", "Religious Offenses"],
+    "IPC 298": ["Criminal Law", "Religious Offenses"],
+
+    # Corruption & Bribery
+    "IPC 161": ["Criminal Law", "Corruption", "Public Law"],
+    "IPC 162": ["Criminal Law", "Corruption", "Public Law"],
+    "IPC 163": ["Criminal Law", "Corruption", "Public Law"],
+    "IPC 164": ["Criminal Law", "Corruption", "Public Law"],
+    "IPC 165": ["Criminal Law", "Corruption", "Public Law"],
+    "IPC 171": ["Criminal Law", "Election Offenses", "Public Law"],
+    "IPC 171A": ["Criminal Law", "Election Offenses", "Public Law"],
+    "IPC 171B": ["Criminal Law", "Election Offenses", "Public Law"],
+
+    # Forgery
+    "IPC 463": ["Criminal Law", "Forgery", "Fraud"],
+    "IPC 464": ["Criminal Law", "Forgery", "Fraud"],
+    "IPC 465": ["Criminal Law", "Forgery", "Fraud"],
+    "IPC 466": ["Criminal Law", "Forgery", "Fraud"],
+    "IPC 467": ["Criminal Law", "Forgery", "Fraud"],
+    "IPC 468": ["Criminal Law", "Forgery", "Fraud"],
+    "IPC 469": ["Criminal Law", "Forgery", "Fraud"],
+    "IPC 470": ["Criminal Law", "Forgery", "Fraud"],
+    "IPC 471": ["Criminal Law", "Forgery", "Fraud"],
+
+    # Counterfeiting
+    "IPC 489A": ["Criminal Law", "Counterfeiting", "Economic Offenses"],
+    "IPC 489B": ["Criminal Law", "Counterfeiting", "Economic Offenses"],
+    "IPC 489C": ["Criminal Law", "Counterfeiting", "Economic Offenses"],
+    "IPC 489D": ["Criminal Law", "Counterfeiting", "Economic Offenses"],
+}
+
+CASE_TYPE_MAPPING: Dict[str, List[str]] = {
+    "cyber": ["Cyber Crime", "IT Law", "Criminal Law"],
+    "theft": ["Criminal Law", "Property Law", "Theft"],
+    "fraud": ["Criminal Law", "Fraud", "Consumer Protection"],
+    "criminal": ["Criminal Law", "General Practice"],
+    "civil": ["Civil Law", "General Practice"],
+    "family": ["Family Law", "Divorce", "Matrimonial"],
+    "property": ["Property Law", "Real Estate", "Civil Law"],
+    "business": ["Corporate Law", "Business Law", "Commercial"],
+    "labor": ["Labor Law", "Employment Law"],
+    "consumer": ["Consumer Protection", "Consumer Law"],
+}
+
+# Classifier category fragment -> case type (first match wins)
+CATEGORY_CASE_TYPES: List[Tuple[str, str]] = [
+    ("cyber", "cyber"),
+    ("theft", "theft"),
+    ("fraud", "fraud"),
+    ("domestic", "family"),
+    ("consumer", "consumer"),
+    ("property dispute", "property"),
+    ("contract", "business"),
+    ("financial dispute", "civil"),
+]
@@ -0,0 +1,68 @@
+# app/routers/admin.py - Admin-only debugging endpoints
+
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import PlainTextResponse
+from typing import Optional
+import logging
+
+from app.core.admin import require_admin
+from app.core.profiling import get_profile
+from app.core.sampler import get_sampler, folded_text, flame_tree
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(dependencies=[Depends(require_admin)])
+
+# ============================================
+# ENDPOINTS
+# ============================================
+
+@router.get("/admin/profiles/{profile_id}")
+def get_request_profile(profile_id: str, format: str = "json"):
+    """
+    A per-request profile (X-Profile-Id from a profiled /api/analyze-case).
+    format=json: call tree + top functions; format=folded: flame-graph stacks.
+    """
+    call_profile = get_profile(profile_id)
+    if call_profile is None:
+        raise HTTPException(status_code=404, detail="Profile not found (profiles are kept per worker, in memory)")
+
+    if format == "folded":
+        return PlainTextResponse(call_profile.folded())
+    if format != "json":
+        raise HTTPException(status_code=422, detail="format must be 'json' or 'folded'")
+    return call_profile.to_dict()
+
+
+@router.get("/admin/flamegraph")
+def get_flamegraph(seconds: Optional[int] = None, format: str = "json", idle: bool = False):
+    """
+    Flame graph of this worker from the background stack sampler.
+    seconds: only the most recent samples (default: the whole window);
+    idle=true also counts threads parked in waits (pool, select, socket reads).
+    format=json: {name, value, children} tree; format=folded: flamegraph.pl input.
+    """
+    sampler = get_sampler()
+    counts = sampler.folded(seconds, include_idle=idle)
+
+    if format == "folded":
+        return PlainTextResponse(folded_text(counts))
+    if format != "json":
+        raise HTTPException(status_code=422, detail="format must be 'json' or 'folded'")
+    return {
+        "sampler": sampler.stats(),
+        "flamegraph": flame_tree(counts),
+    }
+
+
+@router.get("/admin/sampler")
+def get_sampler_stats():
+    """Sampler state and measured overhead"""
+    return get_sampler().stats()
+
+
+@router.delete("/admin/sampler")
+def reset_sampler():
+    """Drop collected samples (e.g. before a load test)"""
+    get_sampler().reset()
+    return {"status": "reset"}
@@ -0,0 +1,42 @@
+# app/routers/analyses.py - Stored analysis results
+
+from fastapi import APIRouter, HTTPException
+from typing import Optional
+import logging
+import re
+
+from app.core.fieldsets import FieldSet
+from app.routers.analyze import RESPONSE_FIELDS, stored_analysis_response
+from app.services.analysis_store import get_analysis_store
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+ANALYSIS_ID = re.compile(r"^[0-9a-f]{32}$")
+
+# ============================================
+# ENDPOINTS
+# ============================================
+
+@router.get("/analyses/{analysis_id}")
+def get_analysis(analysis_id: str, fields: Optional[str] = None):
+    """
+    A stored /api/analyze-case result, by the analysisId it returned.
+    Lets AnalyzeResults / CaseDetail reload without re-running the analysis.
+    """
+    store = get_analysis_store()
+    if store is None:
+        raise HTTPException(status_code=404, detail="Analysis store is disabled")
+
+    try:
+        field_set = FieldSet.parse(fields, RESPONSE_FIELDS)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+    record = store.get(analysis_id) if ANALYSIS_ID.match(analysis_id) else None
+    if record is None:
+        raise HTTPException(status_code=404, detail="Analysis not found")
+
+    logger.info(f"🗄️ Loaded stored analysis {analysis_id}")
+    return stored_analysis_response(record, field_set)
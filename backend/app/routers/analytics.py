@@ -0,0 +1,86 @@
+# app/routers/analytics.py - Case outcome analytics
+
+from fastapi import APIRouter
+from pydantic import BaseModel, validator
+from typing import List, Optional
+import logging
+import time
+
+from app.core.config import settings
+from app.routers.analyze import Section
+from app.routers.documents import to_legal_sections
+from app.services.outcome_simulator import OutcomeSimulator
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+outcome_simulator = OutcomeSimulator(trials=settings.SIMULATION_BATCH_TRIALS)
+
+# ============================================
+# REQUEST MODELS
+# ============================================
+
+class SimulationCase(BaseModel):
+    """One case, with sections as returned by /api/analyze"""
+    id: Optional[str] = None
+    description: str = ""
+    sections: List[Section]
+
+    @validator('sections')
+    def validate_sections(cls, v):
+        if not v:
+            raise ValueError('At least one section is required')
+        return v
+
+
+class SimulateRequest(BaseModel):
+    cases: List[SimulationCase]
+    trials: Optional[int] = None   # per case (default: SIMULATION_BATCH_TRIALS)
+
+    @validator('cases')
+    def validate_cases(cls, v):
+        if not v:
+            raise ValueError('At least one case is required')
+        if len(v) > settings.SIMULATION_MAX_BATCH_CASES:
+            raise ValueError(f'Too many cases (max {settings.SIMULATION_MAX_BATCH_CASES})')
+        return v
+
+    @validator('trials')
+    def validate_trials(cls, v):
+        if v is not None and not 1_000 <= v <= settings.SIMULATION_TRIALS:
+            raise ValueError(f'Trials must be between 1000 and {settings.SIMULATION_TRIALS}')
+        return v
+
+# ============================================
+# ENDPOINTS
+# ============================================
+
+@router.post("/analytics/simulate")
+def simulate_outcomes(request: SimulateRequest):
+    """
+    Monte Carlo outcome distributions (win probability, duration, cost)
+    for a batch of cases, simulated together.
+    """
+    start = time.perf_counter()
+
+    results = outcome_simulator.simulate_batch(
+        [(to_legal_sections(case.sections), case.description) for case in request.cases],
+        trials=request.trials
+    )
+
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    logger.info(f"🎲 Simulated {len(results)} cases in {elapsed_ms:.1f}ms ({outcome_simulator.engine})")
+
+    count = len(results)
+    return {
+        "cases": [{"id": case.id, **result} for case, result in zip(request.cases, results)],
+        "count": count,
+        "engine": outcome_simulator.engine,
+        "aggregate": {
+            "winProbability": round(sum(r["winProbability"]["mean"] for r in results) / count, 1),
+            "durationMonths": round(sum(r["durationMonths"]["mean"] for r in results) / count, 1),
+            "costInr": int(round(sum(r["costInr"]["mean"] for r in results) / count, -2))
+        },
+        "elapsedMs": round(elapsed_ms, 1)
+    }
@@ -1,18 +1,32 @@
 # app/routers/analyze.py - FIXED WITH COMPLETE SECTION MODEL
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Header, HTTPException, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel, validator
 from typing import List, Optional, Dict
-from datetime import datetime
 import logging
+import time
 
 # IMPORT YOUR SERVICES
 from app.services.classifier import CrimeClassifier
 from app.services.keyword_matcher import KeywordMatcher
-from app.services.hybrid_analyzer import MultiProviderAnalyzer
-from app.services.action_plan_generator import ActionPlanGenerator
-from app.services.document_generator import DocumentGenerator
+from app.services.hybrid_analyzer import MultiProviderAnalyzer, AI_METHODS, FALLBACK_METHODS
+from app.services.action_plan_generator import ActionPlanGenerator, ACTION_PLAN_FIELDS
+from app.services.document_generator import DocumentGenerator, FIR_LANGUAGES
 from app.models.section import LegalSection
+from app.services.streaming_matcher import StreamingMatcher, DocumentTooLarge, condense_document
+from app.core.config import settings
+from app.core.safety import SafetyFilter
+from app.core.fieldsets import FieldSet, ALL_FIELDS
+from app.core.render_context import RenderContext, ISO_DATE, default_context, deferred_context
+from app.core.rule_stats import rule_stats, SAFETY_BLOCK, LLM_CALLS_SAVED
+from app.core import metrics, tracing
+from app.core.admin import is_admin
+from app.core.profiling import profile_call, ProfilerBusy
+from app.core.admission import ai_queue, ai_upgrades
+from app.services.analysis_store import get_analysis_store, IdempotencyConflict
+from app.services.lawyer_matcher import get_lawyer_matcher, case_type_for
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -35,6 +49,12 @@ class AnalyzeCaseRequest(BaseModel):
     urgency: bool = False
     user_id: Optional[str] = None
     is_authenticated: bool = False
+    languages: Optional[List[str]] = None  # FIR languages to render (default: all)
+    latitude: Optional[float] = None       # Incident location, for nearest police stations
+    longitude: Optional[float] = None
+    recommendLawyers: bool = False         # Include recommendedLawyers in the response
+    userLocation: Optional[str] = None     # City or state, for lawyer matching
+    lawyerLimit: int = 5
     
     @validator('description')
     def validate_description(cls, v):
@@ -42,7 +62,36 @@ class AnalyzeCaseRequest(BaseModel):
             raise ValueError('Description cannot be empty')
         if len(v.strip()) < 3:
             raise ValueError('Description too short')
+        if len(v) > settings.MAX_DOCUMENT_BYTES:
+            raise ValueError(f'Description too long (max {settings.MAX_DOCUMENT_BYTES} characters)')
         return v.strip()
+    
+    @validator('languages')
+    def validate_languages(cls, v):
+        if v is None:
+            return v
+        unknown = [lang for lang in v if lang not in FIR_LANGUAGES]
+        if unknown:
+            raise ValueError(f'Unsupported languages: {unknown} (choose from {list(FIR_LANGUAGES)})')
+        return v
+    
+    @validator('latitude')
+    def validate_latitude(cls, v):
+        if v is not None and not -90 <= v <= 90:
+            raise ValueError('Latitude must be between -90 and 90')
+        return v
+    
+    @validator('longitude')
+    def validate_longitude(cls, v):
+        if v is not None and not -180 <= v <= 180:
+            raise ValueError('Longitude must be between -180 and 180')
+        return v
+    
+    @validator('lawyerLimit')
+    def validate_lawyer_limit(cls, v):
+        if not 1 <= v <= settings.MAX_RECOMMENDED_LAWYERS:
+            raise ValueError(f'Lawyer limit must be between 1 and {settings.MAX_RECOMMENDED_LAWYERS}')
+        return v
 
 class Section(BaseModel):
     """COMPLETE Section model with all fields from LegalSection"""
@@ -75,6 +124,9 @@ class AnalyzeCaseResponse(BaseModel):
     nextSteps: List[str]
     actionPlan: Optional[Dict] = None
     documents: Optional[Dict] = None
+    analysisId: Optional[str] = None   # GET /api/analyses/{analysisId}
+    recommendedLawyers: Optional[List[Dict]] = None
+    degraded: bool = False   # AI skipped under load; the AI answer appears at analysisId later
     
     @validator('bailProbability', 'overallConfidence')
     def validate_percentages(cls, v):
@@ -82,6 +134,44 @@ class AnalyzeCaseResponse(BaseModel):
             return int(v * 100)
         return max(0, min(100, int(v)))
 
+# Built once - blocked queries never reach classification or a provider
+SAFETY_REFUSAL_RESPONSE = AnalyzeCaseResponse(
+    sections=[
+        Section(
+            code="Refused",
+            name="Request Not Supported",
+            description="This query appears to request assistance with illegal activities",
+            punishment="Not applicable",
+            bailable=True,
+            cognizable=False,
+            confidence=0,
+            isPrimary=True,
+            reasoning="I cannot provide guidance on illegal activities. If you're facing a legal issue, please consult a lawyer.",
+            matchedKeywords=[]
+        )
+    ],
+    severity="Not Applicable",
+    maxPunishment="Not applicable",
+    punishmentNote="LegalAI only helps people understand and report offenses they are facing.",
+    bail="Not Applicable",
+    bailProbability=0,
+    overallConfidence=0,
+    summary="I cannot provide guidance on illegal activities. If you're facing a legal issue, please consult a lawyer.",
+    nextSteps=[
+        "If you are in danger, call 100 (Police) or 112 (Emergency)",
+        "Consult a qualified lawyer about your situation"
+    ]
+)
+SAFETY_REFUSAL_BODY = SAFETY_REFUSAL_RESPONSE.model_dump_json().encode("utf-8")
+
+# Valid ?fields= values: top-level response fields and their sub-fields
+DOCUMENT_FIELDS = ("firDraft", "writtenComplaint", "evidenceChecklist")
+RESPONSE_FIELDS = {
+    **{name: None for name in AnalyzeCaseResponse.model_fields},
+    "actionPlan": ACTION_PLAN_FIELDS,
+    "documents": DOCUMENT_FIELDS,
+}
+
 # ============================================
 # HELPER FUNCTIONS
 # ============================================
@@ -301,20 +391,269 @@ def generate_civil_dispute_response(validation_result: dict, description: str) -
 # ============================================
 
 @router.post("/analyze-case", response_model=AnalyzeCaseResponse)
-async def analyze_case(request: AnalyzeCaseRequest):
+async def analyze_case(
+    request: AnalyzeCaseRequest,
+    fields: Optional[str] = None,
+    profile: Optional[str] = None,
+    idempotency_key: Optional[str] = Header(None),
+    x_profile: Optional[str] = Header(None),
+    x_admin_token: Optional[str] = Header(None)
+):
+    """
+    Analyze legal case using integrated services pipeline.
+    `fields` (e.g. sections,severity,actionPlan.immediateSteps) limits the
+    response - and the work done - to what the client renders.
+    Repeated requests (same content or same Idempotency-Key) are served
+    from the analysis store.
+    Admins can add `profile=1` (or X-Profile: 1) to profile the request;
+    `profile=inline` also embeds the call tree in the response.
+    When the AI queue is saturated the answer comes from validated keyword
+    matches at once (degraded: true, X-Analysis-Degraded header); with the
+    analysis store on, the AI answer is stored under analysisId later.
+    The pipeline runs in the threadpool, off the event loop.
+    """
+    return await serve_analysis(request, fields, idempotency_key, profile or x_profile, x_admin_token)
+
+
+async def serve_analysis(
+    request: AnalyzeCaseRequest,
+    fields: Optional[str] = None,
+    idempotency_key: Optional[str] = None,
+    profile: Optional[str] = None,
+    admin_token: Optional[str] = None
+) -> Response:
+    """
+    Shared by the analyze endpoints. Plain defaults, so callers never
+    inherit an endpoint's Header(None) parameters.
+    """
+    field_set = parse_fields(fields)
+    
+    if profile:
+        if not is_admin(admin_token):
+            raise HTTPException(status_code=403, detail="Profiling requires a valid X-Admin-Token")
+        return await run_in_threadpool(profiled_analysis, request, field_set, profile == "inline")
+    
+    return await run_in_threadpool(respond_with_analysis, request, field_set, idempotency_key)
+
+
+def parse_fields(fields: Optional[str]) -> FieldSet:
+    """?fields= as a FieldSet (422 on unknown fields)"""
+    try:
+        return FieldSet.parse(fields, RESPONSE_FIELDS)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+
+def refusal_response(field_set: FieldSet) -> Response:
+    """The safety refusal, whole or filtered to the requested fields"""
+    if not field_set.is_all:
+        return JSONResponse(SAFETY_REFUSAL_RESPONSE.model_dump(mode="json", include=field_set.include()))
+    return Response(content=SAFETY_REFUSAL_BODY, media_type="application/json")
+
+
+def record_safety_block(keyword: str):
+    """Count a request refused by the safety filter"""
+    rule_stats.hit(SAFETY_BLOCK, keyword)
+    if hybrid_analyzer.providers:
+        rule_stats.hit(LLM_CALLS_SAVED, "safety_filter")
+    logger.info(f"🛑 Blocked by safety filter: '{keyword}'")
+
+
+def profiled_analysis(request: AnalyzeCaseRequest, field_set: FieldSet, inline: bool = False) -> Response:
+    """Run the pipeline fresh (no analysis store) under the profiler"""
+    try:
+        response, call_profile = profile_call(run_analysis, request, fields=field_set)
+    except ProfilerBusy as e:
+        raise HTTPException(status_code=429, detail=str(e))
+    
+    logger.info(f"🔬 Profiled analysis {call_profile.id}: {call_profile.wall_ms:.1f}ms")
+    body = response.model_dump(mode="json", include=None if field_set.is_all else field_set.include())
+    if inline:
+        body["profile"] = call_profile.to_dict()
+    return JSONResponse(body, headers={"X-Profile-Id": call_profile.id})
+
+
+def respond_with_analysis(
+    request: AnalyzeCaseRequest,
+    field_set: FieldSet,
+    idempotency_key: Optional[str] = None
+) -> Response:
+    """Stored result if there is one, otherwise run (and store) the pipeline"""
+    start = time.perf_counter()
+    store = get_analysis_store()
+    analysis_id = None
+    
+    if store is not None:
+        analysis_id = store.analysis_id(request.model_dump())
+        
+        try:
+            known_key = bool(idempotency_key) and store.check_key(idempotency_key, analysis_id, request.user_id)
+        except IdempotencyConflict as e:
+            raise HTTPException(status_code=409, detail=str(e))
+        
+        record = store.get(analysis_id)
+        if record is not None and (
+            known_key or time.time() - record["created_at"] <= settings.ANALYSIS_REUSE_SECONDS
+        ):
+            logger.info(f"🗄️ Serving stored analysis {analysis_id}")
+            metrics.observe_analysis(metrics.OUTCOME_STORED, time.perf_counter() - start)
+            return stored_analysis_response(record, field_set)
+    
+    shed = ai_queue.check() if hybrid_analyzer.providers else None
+    # A result that may be stored keeps its dates as placeholders, bound whenever it is served
+    storing = analysis_id is not None and field_set.is_all and not shed
+    outcome = {}
+    response = run_analysis(
+        request, fields=field_set, degraded=shed is not None,
+        context=deferred_context if storing else None, outcome=outcome
+    )
+    
+    if response is SAFETY_REFUSAL_RESPONSE:
+        return refusal_response(field_set)
+    
+    if shed:
+        return degraded_analysis_response(request, response, field_set, shed, analysis_id, idempotency_key)
+    
+    # Only complete results are stored (sparse ones skip generators), and
+    # only real answers - a provider outage must not be served for a day.
+    # The id headers are sent only when a record was written.
+    if storing:
+        headers = {}
+        if is_storable(outcome):
+            response.analysisId = analysis_id
+            body = response.model_dump_json()
+            store.put(analysis_id, body, idempotency_key, request.user_id)
+            headers = {"X-Analysis-Id": analysis_id, "X-Analysis-Store": "MISS"}
+        else:
+            body = response.model_dump_json()
+        return Response(content=default_context.bind(body), media_type="application/json", headers=headers)
+    
+    if not field_set.is_all:
+        return JSONResponse(response.model_dump(mode="json", include=field_set.include()))
+    return response
+
+
+def degraded_analysis_response(
+    request: AnalyzeCaseRequest,
+    response: AnalyzeCaseResponse,
+    field_set: FieldSet,
+    reason: str,
+    analysis_id: Optional[str],
+    idempotency_key: Optional[str]
+) -> Response:
+    """
+    Shed (keyword-validated) answer. It is not stored; the AI answer is
+    worked out in the background and stored under analysisId instead.
     """
-    Analyze legal case using integrated services pipeline
+    logger.info(f"🚧 AI queue saturated ({reason}) - keyword-validated answer")
+    response.degraded = True
+    headers = {"X-Analysis-Degraded": reason}
+    
+    if analysis_id is not None and settings.AI_UPGRADE_ENABLED:
+        if ai_upgrades.submit(analysis_id, upgrade_analysis, request, analysis_id, idempotency_key):
+            response.analysisId = analysis_id
+            headers["X-Analysis-Id"] = analysis_id
+    
+    return JSONResponse(
+        response.model_dump(mode="json", include=None if field_set.is_all else field_set.include()),
+        headers=headers
+    )
+
+
+def upgrade_analysis(request: AnalyzeCaseRequest, analysis_id: str, idempotency_key: Optional[str] = None):
+    """Background: run the full pipeline for a shed analysis and store the result"""
+    store = get_analysis_store()
+    outcome = {}
+    response = run_analysis(request, context=deferred_context, outcome=outcome)
+    if response is SAFETY_REFUSAL_RESPONSE:
+        return
+    # Only an AI answer is an upgrade - storing another keyword answer would
+    # serve the fallback for ANALYSIS_REUSE_SECONDS (raising counts it as failed)
+    if not is_storable(outcome) or outcome.get("method") not in AI_METHODS:
+        raise RuntimeError(f"no AI answer (method: {outcome.get('method', outcome.get('path'))})")
+    response.analysisId = analysis_id
+    store.put(analysis_id, response.model_dump_json(), idempotency_key, request.user_id)
+    logger.info(f"⬆️ Stored AI upgrade of analysis {analysis_id}")
+
+
+def is_storable(outcome: Dict) -> bool:
+    """A real answer - not the error response or a fallback used because the AI answer was missing"""
+    return outcome.get("path", metrics.OUTCOME_ERROR) != metrics.OUTCOME_ERROR and outcome.get("method") not in FALLBACK_METHODS
+
+
+def stored_analysis_response(record: Dict, field_set: FieldSet = ALL_FIELDS) -> Response:
+    """Stored JSON with today's dates bound, whole or filtered to the requested fields"""
+    headers = {"X-Analysis-Id": record["id"], "X-Analysis-Store": "HIT"}
+    body = default_context.bind(record["response"])
+    if field_set.is_all:
+        return Response(content=body, media_type="application/json", headers=headers)
+    
+    response = AnalyzeCaseResponse.model_validate_json(body)
+    return JSONResponse(response.model_dump(mode="json", include=field_set.include()), headers=headers)
+
+
+def run_analysis(
+    request: AnalyzeCaseRequest,
+    keyword_only: bool = False,
+    fields: FieldSet = ALL_FIELDS,
+    degraded: bool = False,
+    context: Optional[RenderContext] = None,
+    outcome: Optional[Dict] = None
+) -> AnalyzeCaseResponse:
+    """
+    Run the full pipeline synchronously (shared by the API and bulk_analyze.py).
+    keyword_only skips every provider call; fields skips generators for
+    response fields the caller did not ask for; degraded (load shedding)
+    answers from the validated keyword sections without a provider call.
+    context binds the dates in generated documents (default: today).
+    outcome, if given, receives "path" and the analyzer's "method".
     """
+    start = time.perf_counter()
+    outcome = outcome if outcome is not None else {}
+    outcome["path"] = metrics.OUTCOME_ERROR
+    with tracing.span("analysis", keyword_only=keyword_only, degraded=degraded,
+                      description_chars=len(request.description)) as span:
+        try:
+            return _run_pipeline(request, keyword_only, fields, outcome, degraded, context)
+        finally:
+            span.set_attribute("outcome", outcome["path"])
+            metrics.observe_analysis(outcome["path"], time.perf_counter() - start)
+
+
+def _run_pipeline(
+    request: AnalyzeCaseRequest,
+    keyword_only: bool,
+    fields: FieldSet,
+    outcome: Dict,
+    degraded: bool = False,
+    context: Optional[RenderContext] = None
+) -> AnalyzeCaseResponse:
+    """Body of run_analysis; sets outcome["path"] for the metrics"""
     try:
         description = request.description
         
+        # STEP 0: SAFETY CHECK (early exit - no classification, no LLM call)
+        safety = SafetyFilter.check_query(description)
+        if not safety["safe"]:
+            record_safety_block(safety["keyword"])
+            outcome["path"] = metrics.OUTCOME_SAFETY_BLOCKED
+            return SAFETY_REFUSAL_RESPONSE
+        
         logger.info(f"\n{'='*60}")
         logger.info(f"📝 NEW REQUEST: {description[:100]}")
         logger.info(f"{'='*60}")
         
+        # LONG-DOCUMENT MODE: analyze only the most relevant passages
+        if len(description) > settings.LONG_DOCUMENT_THRESHOLD:
+            digest = condense_document(description)
+            description = digest["text"]
+            logger.info(f"📄 Long document: {digest['chars_read']} chars -> "
+                        f"{len(description)} chars from {digest['passages_selected']}/{digest['passages_scanned']} passages")
+        
         # STEP 1: CLASSIFY
         logger.info(f"\n1️⃣ CLASSIFICATION")
-        classification = classifier.classify_case(description)
+        with tracing.stage("classify"):
+            classification = classifier.classify_case(description)
         logger.info(f"   Category: {classification.category}")
         logger.info(f"   Severity: {classification.severity}")
         logger.info(f"   Confidence: {classification.confidence:.2%}")
@@ -322,14 +661,17 @@ async def analyze_case(request: AnalyzeCaseRequest):
         
         # STEP 2: KEYWORD MATCHING
         logger.info(f"\n2️⃣ KEYWORD MATCHING")
-        keyword_sections = keyword_matcher.match_sections(description, classification)
+        with tracing.stage("match"):
+            keyword_sections = keyword_matcher.match_sections(description, classification)
         logger.info(f"   Matched sections: {len(keyword_sections)}")
         for s in keyword_sections:
             logger.info(f"   - {s.code}: {s.title} ({s.confidence:.2%})")
         
         # STEP 3: AI ANALYSIS & VALIDATION
         logger.info(f"\n3️⃣ AI ANALYSIS & VALIDATION")
-        result = hybrid_analyzer.analyze(description, classification, keyword_sections)
+        result = hybrid_analyzer.analyze(description, classification, keyword_sections,
+                                         keyword_only=keyword_only, degraded=degraded)
+        outcome["path"] = outcome["method"] = result.get("method", "unknown")
         
         final_sections = result.get("sections", [])
         validation_result = result.get("validation_result")
@@ -346,6 +688,7 @@ async def analyze_case(request: AnalyzeCaseRequest):
             case_nature = result.get("case_nature")
             if case_nature == "civil":
                 logger.info(f"   ✅ AI determined: CIVIL CASE")
+                outcome["path"] = metrics.OUTCOME_CIVIL_DISPUTE
                 if not validation_result:
                     validation_result = {
                         "warnings": result.get("warnings", []),
@@ -362,6 +705,7 @@ async def analyze_case(request: AnalyzeCaseRequest):
                 money_classification = validation_result.get("money_classification", {})
                 if money_classification.get("domain") == "civil" or money_classification.get("classification") == "civil_breach":
                     logger.info(f"   ✅ Validator confirmed: CIVIL DISPUTE")
+                    outcome["path"] = metrics.OUTCOME_CIVIL_DISPUTE
                     return generate_civil_dispute_response(validation_result, description)
         
         # STEP 5: BUILD CRIMINAL CASE RESPONSE
@@ -369,6 +713,7 @@ async def analyze_case(request: AnalyzeCaseRequest):
         
         if not final_sections:
             logger.warning("⚠️ No sections found - returning generic response")
+            outcome["path"] = metrics.OUTCOME_NO_SECTIONS
             return AnalyzeCaseResponse(
                 sections=[
                     Section(
@@ -442,53 +787,79 @@ async def analyze_case(request: AnalyzeCaseRequest):
             logger.info(f"\n5️⃣ GENERATING PREMIUM FEATURES (Authenticated User)")
             
             # Generate Action Plan
-            try:
-                action_plan = action_plan_generator.generate_action_plan(
-                    description=description,
-                    sections=final_sections,
-                    case_type=request.caseType or classification.category,
-                    is_urgent=request.urgency
-                )
-                logger.info(f"   ✅ Action plan generated")
-            except Exception as e:
-                logger.error(f"   ❌ Action plan generation failed: {e}")
+            if fields.wants("actionPlan"):
+                location = None
+                if request.latitude is not None and request.longitude is not None:
+                    location = (request.latitude, request.longitude)
+                try:
+                    with tracing.stage("action_plan"):
+                        action_plan = action_plan_generator.generate_action_plan(
+                            description=description,
+                            sections=final_sections,
+                            case_type=request.caseType or classification.category,
+                            is_urgent=request.urgency,
+                            context=context,
+                            include=fields.subfields("actionPlan"),
+                            location=location
+                        )
+                    logger.info(f"   ✅ Action plan generated")
+                except Exception as e:
+                    logger.error(f"   ❌ Action plan generation failed: {e}")
             
-            # Generate Documents
+            # Generate Documents (only the requested ones)
+            if fields.wants("documents"):
+                try:
+                    case_details = {
+                        "description": request.description,  # Full statement of facts
+                        "incident_date": ISO_DATE,
+                        "incident_time": "[Time of incident]",
+                        "incident_place": "[Location of incident]"
+                    }
+                    documents = {}
+                    
+                    with tracing.stage("documents"):
+                        if fields.wants("documents", "firDraft"):
+                            documents["firDraft"] = document_generator.generate_fir_draft(
+                                case_details=case_details,
+                                sections=final_sections,
+                                user_info=None,  # User will fill in the form
+                                languages=request.languages,
+                                context=context
+                            )
+                        
+                        if fields.wants("documents", "writtenComplaint"):
+                            documents["writtenComplaint"] = document_generator.generate_written_complaint(
+                                case_details=case_details,
+                                sections=final_sections,
+                                user_info=None,
+                                context=context
+                            )
+                        
+                        if fields.wants("documents", "evidenceChecklist"):
+                            documents["evidenceChecklist"] = document_generator.generate_evidence_checklist(
+                                sections=final_sections,
+                                case_type=request.caseType or classification.category
+                            )
+                    
+                    logger.info(f"   ✅ Documents generated: {', '.join(documents)}")
+                except Exception as e:
+                    logger.error(f"   ❌ Document generation failed: {e}")
+        else:
+            logger.info(f"\n⚠️ Premium features not available (Guest user)")
+        
+        # Lawyer recommendations (on request)
+        recommended_lawyers = None
+        if request.recommendLawyers and fields.wants("recommendedLawyers"):
             try:
-                case_details = {
-                    "description": description,
-                    "incident_date": datetime.now().strftime("%Y-%m-%d"),
-                    "incident_time": "[Time of incident]",
-                    "incident_place": "[Location of incident]"
-                }
-                
-                fir_draft = document_generator.generate_fir_draft(
-                    case_details=case_details,
-                    sections=final_sections,
-                    user_info=None  # User will fill in the form
+                recommended_lawyers = get_lawyer_matcher().match(
+                    [(section.code, i == 0) for i, section in enumerate(final_sections)],
+                    case_type=request.caseType or case_type_for(classification.category, classification.domain),
+                    user_location=request.userLocation,
+                    limit=request.lawyerLimit
                 )
-                
-                written_complaint = document_generator.generate_written_complaint(
-                    case_details=case_details,
-                    sections=final_sections,
-                    user_info=None
-                )
-                
-                evidence_checklist = document_generator.generate_evidence_checklist(
-                    sections=final_sections,
-                    case_type=request.caseType or classification.category
-                )
-                
-                documents = {
-                    "firDraft": fir_draft,
-                    "writtenComplaint": written_complaint,
-                    "evidenceChecklist": evidence_checklist
-                }
-                logger.info(f"   ✅ Documents generated")
+                logger.info(f"   ⚖️ Recommended lawyers: {len(recommended_lawyers)}")
             except Exception as e:
-                logger.error(f"   ❌ Document generation failed: {e}")
-        else:
-            logger.info(f"\n⚠️ Premium features not available (Guest user)")
+                logger.error(f"   ❌ Lawyer matching failed: {e}")
         
         response = AnalyzeCaseResponse(
             sections=response_sections,
@@ -498,10 +869,11 @@ async def analyze_case(request: AnalyzeCaseRequest):
             bail=bail_status,
             bailProbability=bail_probability,
             overallConfidence=overall_confidence_int,
-            summary=generate_summary(description, final_sections, classification),
-            nextSteps=generate_next_steps(final_sections, classification),
+            summary=generate_summary(description, final_sections, classification) if fields.wants("summary") else "",
+            nextSteps=generate_next_steps(final_sections, classification) if fields.wants("nextSteps") else [],
             actionPlan=action_plan,
-            documents=documents
+            documents=documents,
+            recommendedLawyers=recommended_lawyers
         )
         
         logger.info(f"✅ Response ready with {len(response.sections)} sections")
@@ -513,6 +885,7 @@ async def analyze_case(request: AnalyzeCaseRequest):
         
     except Exception as e:
         logger.error(f"❌ Error in analyze_case: {e}", exc_info=True)
+        outcome["path"] = metrics.OUTCOME_ERROR
         
         # Fallback response
         return AnalyzeCaseResponse(
@@ -540,4 +913,59 @@ async def analyze_case(request: AnalyzeCaseRequest):
             nextSteps=["Contact a lawyer", "Try again", "Gather evidence"],
             actionPlan=None,
             documents=None
-        )
\ No newline at end of file
+        )
+
+
+# ============================================
+# LONG-DOCUMENT ENDPOINT - STREAMED BODY
+# ============================================
+
+@router.post("/analyze-document", response_model=AnalyzeCaseResponse)
+async def analyze_document(
+    request: Request,
+    role: str = "victim",
+    caseType: Optional[str] = None,
+    urgency: bool = False,
+    user_id: Optional[str] = None,
+    is_authenticated: bool = False,
+    fields: Optional[str] = None,
+    idempotency_key: Optional[str] = Header(None)
+):
+    """
+    Analyze a multi-page complaint sent as a plain-text (UTF-8) body.
+    The body is streamed through the incremental matcher and never held in memory.
+    Every passage goes through the safety filter, not just those kept in the digest.
+    """
+    field_set = parse_fields(fields)
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > settings.MAX_DOCUMENT_BYTES:
+        raise HTTPException(status_code=413, detail=f"Document exceeds {settings.MAX_DOCUMENT_BYTES} bytes")
+    
+    start = time.perf_counter()
+    matcher = StreamingMatcher()
+    try:
+        async for chunk in request.stream():
+            matcher.feed_bytes(chunk)
+    except DocumentTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    
+    digest = matcher.finish()
+    logger.info(f"📄 Streamed document: {digest['bytes_read']} bytes -> "
+                f"{len(digest['text'])} chars from {digest['passages_selected']}/{digest['passages_scanned']} passages")
+    
+    if digest["illegal_intent"]:
+        record_safety_block(digest["illegal_intent"])
+        metrics.observe_analysis(metrics.OUTCOME_SAFETY_BLOCKED, time.perf_counter() - start)
+        return refusal_response(field_set)
+    
+    if len(digest["text"].strip()) < 3:
+        raise HTTPException(status_code=422, detail="Document is empty")
+    
+    return await serve_analysis(AnalyzeCaseRequest(
+        description=digest["text"],
+        role=role,
+        caseType=caseType,
+        urgency=urgency,
+        user_id=user_id,
+        is_authenticated=is_authenticated
+    ), fields=fields, idempotency_key=idempotency_key)
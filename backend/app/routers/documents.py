@@ -0,0 +1,190 @@
+# app/routers/documents.py - On-demand legal document rendering
+
+from fastapi import APIRouter, HTTPException, Request, Response
+from fastapi.responses import FileResponse
+from pydantic import BaseModel, validator
+from typing import List, Optional, Dict
+from datetime import datetime
+import logging
+
+from app.models.section import LegalSection
+from app.routers.analyze import Section, document_generator
+from app.services.document_generator import FIR_LANGUAGES
+from app.services.document_exporter import DocumentExporter, ExportUnavailable, EXPORT_FORMATS
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+document_exporter = DocumentExporter()
+
+EXPORT_DOCUMENTS = ("fir", "complaint", "affidavit", "legal_notice")
+
+# ============================================
+# REQUEST MODELS
+# ============================================
+
+class FIRDraftRequest(BaseModel):
+    """Render an FIR for sections already returned by /api/analyze"""
+    description: str
+    sections: List[Section]
+    languages: List[str] = ["english"]
+    incident_date: Optional[str] = None
+    incident_time: str = "[Time of incident]"
+    incident_place: str = "[Location of incident]"
+    user_info: Optional[Dict[str, str]] = None
+
+    @validator('languages')
+    def validate_languages(cls, v):
+        unknown = [lang for lang in v if lang not in FIR_LANGUAGES]
+        if unknown:
+            raise ValueError(f'Unsupported languages: {unknown} (choose from {list(FIR_LANGUAGES)})')
+        return v
+
+
+class ExportRequest(BaseModel):
+    """Render a generated document to PDF or DOCX"""
+    document: str                        # fir | complaint | affidavit | legal_notice
+    format: str = "pdf"                  # pdf | docx
+    language: str = "english"            # FIR only
+    description: str = ""
+    sections: List[Section] = []
+    incident_date: Optional[str] = None
+    incident_time: str = "[Time of incident]"
+    incident_place: str = "[Location of incident]"
+    user_info: Optional[Dict[str, str]] = None
+    recipient_info: Optional[Dict[str, str]] = None   # legal notice
+    demand: str = "[State your demand]"               # legal notice
+    statement: Optional[str] = None                   # affidavit (default: description)
+
+    @validator('document')
+    def validate_document(cls, v):
+        if v not in EXPORT_DOCUMENTS:
+            raise ValueError(f'Unsupported document: {v} (choose from {list(EXPORT_DOCUMENTS)})')
+        return v
+
+    @validator('format')
+    def validate_format(cls, v):
+        if v not in EXPORT_FORMATS:
+            raise ValueError(f'Unsupported format: {v} (choose from {list(EXPORT_FORMATS)})')
+        return v
+
+    @validator('language')
+    def validate_language(cls, v):
+        if v not in FIR_LANGUAGES:
+            raise ValueError(f'Unsupported language: {v} (choose from {list(FIR_LANGUAGES)})')
+        return v
+
+
+def to_legal_sections(sections: List[Section]) -> List[LegalSection]:
+    """Convert API sections back to the generator's model"""
+    return [
+        LegalSection(
+            code=s.code,
+            title=s.name,
+            description=s.description,
+            punishment=s.punishment,
+            bailable=s.bailable,
+            cognizable=s.cognizable,
+            confidence=s.confidence / 100,
+            reasoning=s.reasoning,
+            key_factors=s.matchedKeywords
+        )
+        for s in sections
+    ]
+
+
+def _case_details(request) -> Dict:
+    return {
+        "description": request.description,
+        "incident_date": request.incident_date or datetime.now().strftime("%Y-%m-%d"),
+        "incident_time": request.incident_time,
+        "incident_place": request.incident_place
+    }
+
+
+def _render_text(request: ExportRequest) -> tuple:
+    """(title, text) of the requested document"""
+    sections = to_legal_sections(request.sections)
+
+    if request.document == "fir":
+        draft = document_generator.generate_fir_draft(
+            case_details=_case_details(request),
+            sections=sections,
+            user_info=request.user_info,
+            languages=[request.language]
+        )
+        return "FIR Draft", draft[request.language]
+
+    if request.document == "complaint":
+        return "Written Complaint", document_generator.generate_written_complaint(
+            case_details=_case_details(request),
+            sections=sections,
+            user_info=request.user_info
+        )
+
+    if request.document == "affidavit":
+        return "Affidavit", document_generator.generate_affidavit(
+            user_info=request.user_info or {},
+            statement=request.statement or request.description or "[Statement of facts]"
+        )
+
+    return "Legal Notice", document_generator.generate_legal_notice(
+        user_info=request.user_info or {},
+        recipient_info=request.recipient_info or {},
+        demand=request.demand,
+        sections=sections
+    )
+
+# ============================================
+# ENDPOINTS
+# ============================================
+
+@router.post("/documents/fir")
+def render_fir(request: FIRDraftRequest):
+    """
+    Render the FIR draft in the requested languages only.
+    Used to fetch another language after /api/analyze.
+    """
+    logger.info(f"📄 Rendering FIR draft: {', '.join(request.languages)}")
+
+    return document_generator.generate_fir_draft(
+        case_details=_case_details(request),
+        sections=to_legal_sections(request.sections),
+        user_info=request.user_info,
+        languages=request.languages
+    )
+
+
+@router.post("/documents/export")
+def export_document(request: ExportRequest, http_request: Request):
+    """
+    Render a document to PDF/DOCX and stream it.
+    Identical documents are served from the export cache (ETag = content hash).
+    """
+    title, text = _render_text(request)
+
+    try:
+        exported = document_exporter.export(title, text, request.format)
+    except ExportUnavailable as e:
+        raise HTTPException(status_code=501, detail=str(e))
+
+    etag = f'"{exported["key"]}"'
+    headers = {
+        "ETag": etag,
+        "Cache-Control": "private, max-age=86400",
+        "X-Export-Cache": "HIT" if exported["cached"] else "MISS"
+    }
+
+    if http_request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+
+    logger.info(f"📄 Exported {request.document} ({request.format}, cache {headers['X-Export-Cache']})")
+
+    suffix = f"_{request.language}" if request.document == "fir" else ""
+    return FileResponse(
+        exported["path"],
+        media_type=exported["media_type"],
+        filename=f"{request.document}{suffix}{exported['extension']}",
+        headers=headers
+    )
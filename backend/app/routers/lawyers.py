@@ -0,0 +1,70 @@
+# app/routers/lawyers.py - Lawyer matching
+
+from fastapi import APIRouter
+from pydantic import BaseModel, validator
+from typing import List, Optional
+import logging
+import time
+
+from app.core.config import settings
+from app.services.lawyer_matcher import get_lawyer_matcher
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+# ============================================
+# REQUEST MODELS
+# ============================================
+
+class SectionRef(BaseModel):
+    code: str
+    isPrimary: bool = False
+
+
+class MatchLawyersRequest(BaseModel):
+    sections: List[SectionRef]
+    caseType: Optional[str] = None       # e.g. "cyber", "fraud", "family"
+    userLocation: Optional[str] = None   # City or state
+    language: Optional[str] = None       # Only lawyers who speak it
+    limit: int = 5
+    minScore: int = 20
+
+    @validator('sections')
+    def validate_sections(cls, v):
+        if not v:
+            raise ValueError('At least one section is required')
+        return v
+
+    @validator('limit')
+    def validate_limit(cls, v):
+        if not 1 <= v <= settings.MAX_RECOMMENDED_LAWYERS:
+            raise ValueError(f'Limit must be between 1 and {settings.MAX_RECOMMENDED_LAWYERS}')
+        return v
+
+# ============================================
+# ENDPOINTS
+# ============================================
+
+@router.post("/lawyers/match")
+def match_lawyers(request: MatchLawyersRequest):
+    """
+    Best-matching lawyers for a case's sections (as returned by /api/analyze),
+    scored like the frontend matcher.
+    """
+    start = time.perf_counter()
+    lawyers = get_lawyer_matcher().match(
+        [(s.code, s.isPrimary) for s in request.sections],
+        case_type=request.caseType,
+        user_location=request.userLocation,
+        limit=request.limit,
+        min_score=request.minScore,
+        language=request.language
+    )
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    logger.info(f"⚖️ Matched {len(lawyers)} lawyers in {elapsed_ms:.2f}ms")
+
+    return {
+        "lawyers": lawyers,
+        "count": len(lawyers)
+    }
@@ -0,0 +1,33 @@
+# app/routers/police_stations.py - Nearest police station lookup
+
+from fastapi import APIRouter, Query
+import logging
+
+from app.services.police_stations import get_station_locator
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+# ============================================
+# ENDPOINTS
+# ============================================
+
+@router.get("/police-stations/nearest")
+def nearest_police_stations(
+    lat: float = Query(..., ge=-90, le=90),
+    lon: float = Query(..., ge=-180, le=180),
+    k: int = Query(3, ge=1, le=20),
+    cyber: bool = False
+):
+    """
+    Nearest police stations (or cyber crime cells) to a location.
+    Distances are great-circle kilometres.
+    """
+    stations = get_station_locator().nearest(lat, lon, k=k, cyber_only=cyber)
+    logger.info(f"🚓 Nearest {'cyber cells' if cyber else 'stations'} for ({lat:.3f}, {lon:.3f}): {len(stations)}")
+
+    return {
+        "stations": stations,
+        "count": len(stations)
+    }
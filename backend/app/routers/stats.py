@@ -0,0 +1,82 @@
+# app/routers/stats.py - Operational statistics endpoints (admin only)
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+import time
+
+from app.core.admin import require_admin
+from app.core.admission import ai_queue, ai_upgrades
+from app.core.cache import get_disk_cache
+from app.core.rule_stats import rule_stats
+from app.core.rule_version import rule_version
+from app.routers.analyze import hybrid_analyzer
+from app.services.analysis_store import get_analysis_store
+from app.services.provider_ledger import get_provider_ledger
+
+# Provider spend, error text and capacity are operational data - never public
+router = APIRouter(dependencies=[Depends(require_admin)])
+
+
+@router.get("/stats/rules")
+def get_rule_stats():
+    """
+    Rule hit-rate counters for this worker process.
+    `deadRules` lists catalogue entries that have never fired.
+    """
+    return rule_stats.snapshot()
+
+
+@router.get("/stats/cache")
+def get_cache_stats():
+    """
+    Cache tiers: L1 counters are per worker, the L2 file and the
+    analysis store are shared by all workers and survive restarts.
+    """
+    disk = get_disk_cache()
+    store = get_analysis_store()
+    return {
+        "ruleVersion": rule_version(),
+        "providerResponses": hybrid_analyzer.response_cache.stats(),
+        "l2": disk.stats() if disk else None,
+        "analyses": store.stats() if store else None,
+    }
+
+
+@router.get("/stats/providers")
+def get_provider_stats(
+    hours: float = Query(24, gt=0, le=24 * 365),
+    recent: int = Query(0, ge=0, le=500)
+):
+    """
+    Provider calls from the ledger (all workers): calls, errors, tokens,
+    estimated cost, latency, JSON parse paths and truncations per
+    provider/model over the last `hours`, plus the `recent` latest calls.
+    """
+    ledger = get_provider_ledger()
+    if ledger is None:
+        raise HTTPException(status_code=404, detail="Provider ledger is disabled")
+
+    ledger.flush()
+    summary = ledger.aggregate(since=time.time() - hours * 3600)
+    summary["hours"] = hours
+    if recent:
+        summary["recent"] = ledger.entries(recent)
+    return summary
+
+
+@router.get("/stats/provider-limits")
+def get_provider_limits():
+    """
+    Quota buckets and adaptive concurrency limit per AI provider (this
+    worker process): current limit, calls in flight, requests deferred
+    by reason and back-offs by cause
+    """
+    return {name: gate.stats() for name, gate in hybrid_analyzer.gates.items()}
+
+
+@router.get("/stats/ai-queue")
+def get_ai_queue():
+    """
+    Load shedding state for this worker: analyses in the AI queue, recent
+    wait for a provider slot, analyses shed by reason and pending upgrades
+    """
+    return {**ai_queue.stats(), "upgrades": ai_upgrades.stats()}
@@ -1,114 +1,220 @@
 # app/services/action_plan_generator.py - Personalized Action Plan Generator
 
-from typing import List, Dict, Optional
-from datetime import datetime, timedelta
+from types import MappingProxyType
+from typing import List, Dict, Optional, Set, Tuple
 from app.models.section import LegalSection
+from app.core.cache import LRUCache
+from app.core.config import settings
+from app.core.render_context import RenderContext, default_context
+from app.data.ipc_sections import IPC_SECTIONS
+from app.services.keyword_matcher import KeywordMatcher
+from app.services.outcome_simulator import OutcomeSimulator
+from app.services.police_stations import PoliceStationLocator, get_station_locator
+
+# Description flags that select a precomputed component variant
+COMPLEXITY_KEYWORDS = ("multiple", "several", "many", "various", "complex")
+CONSUMER_KEYWORDS = ("bought", "product", "service")
+
+# Keys of a generated plan (for sparse fieldsets)
+ACTION_PLAN_FIELDS = (
+    "immediateSteps", "documentationNeeded", "legalStrategy", "estimatedTimeline",
+    "costEstimate", "riskAssessment", "victoryPrediction", "durationEstimate",
+    "detailedCosts", "alternativeOptions", "criticalDeadlines", "policeStationInfo",
+    "urgencyLevel", "nextStepDeadline"
+)
+
+
+def _catalog_sections() -> List[LegalSection]:
+    """Every section the rule tables can produce"""
+    catalog = {}
+    entries = list(IPC_SECTIONS.values())
+    for mappings in KeywordMatcher.SECTION_MAPPINGS.values():
+        entries.extend(mappings)
+    for entry in entries:
+        catalog.setdefault((entry["code"], entry["bailable"]), LegalSection(
+            code=entry["code"],
+            title=entry["title"],
+            description=entry["description"],
+            punishment=entry["punishment"],
+            bailable=entry["bailable"],
+            cognizable=entry["cognizable"],
+            confidence=1.0,
+            reasoning="",
+            key_factors=[]
+        ))
+    return list(catalog.values())
+
 
 class ActionPlanGenerator:
     """
-    Generates personalized action plans based on case analysis
+    Generates personalized action plans based on case analysis.
+    
+    Components that only depend on the primary section (code + bailable)
+    are precomputed for every catalog section at startup; only the
+    description-dependent parts are built per request. Dated deadlines
+    come from the RenderContext clock.
     """
     
-    def __init__(self):
-        self.police_station_db = self._init_police_stations()
+    def __init__(
+        self,
+        context: Optional[RenderContext] = None,
+        memo_size: int = 256,
+        station_locator: Optional[PoliceStationLocator] = None,
+        outcome_simulator: Optional[OutcomeSimulator] = None
+    ):
+        self.station_locator = station_locator or get_station_locator()
+        # Fewer trials than analytics: this runs inside the request (~3 ms cold vs ~12 ms at 100k)
+        self.outcome_simulator = outcome_simulator or OutcomeSimulator(trials=settings.SIMULATION_REQUEST_TRIALS)
+        self.context = context or default_context
+        
+        self._police_station_info = self._get_police_station_info()
+        self._section_components = MappingProxyType({
+            (section.code, section.bailable): self._build_section_components(section)
+            for section in _catalog_sections()
+        })
+        # Sections outside the catalog (e.g. from an AI provider)
+        self._extra_components = LRUCache(memo_size)
         
-    def _init_police_stations(self) -> Dict:
-        """Initialize police station database (expand this with real data)"""
-        return {
-            "Mumbai": [
-                {"name": "Andheri Police Station", "area": "Andheri", "phone": "022-26700844"},
-                {"name": "Bandra Police Station", "area": "Bandra", "phone": "022-26420111"},
-            ],
-            "Delhi": [
-                {"name": "Connaught Place PS", "area": "CP", "phone": "011-23731555"},
-            ],
-            "Bangalore": [
-                {"name": "Koramangala PS", "area": "Koramangala", "phone": "080-25533711"},
-            ]
-        }
-    
     def generate_action_plan(
         self,
         description: str,
         sections: List[LegalSection],
         case_type: str,
-        is_urgent: bool
+        is_urgent: bool,
+        context: Optional[RenderContext] = None,
+        include: Optional[Set[str]] = None,
+        location: Optional[Tuple[float, float]] = None
     ) -> Dict:
         """
-        Generate comprehensive action plan
+        Generate comprehensive action plan.
+        `include` limits the plan to those keys; nothing else is computed.
+        `location` (lat, lon) of the incident adds the nearest police stations.
+        Nested components are shared between requests - treat them as read-only.
         """
         
         if not sections:
-            return self._generate_generic_plan()
-        
-        primary_section = sections[0]
-        is_cyber = "IT Act" in primary_section.code
-        is_violent = any(code in primary_section.code for code in ["323", "325", "326", "354"])
-        is_theft = "379" in primary_section.code
-        is_non_bailable = not primary_section.bailable
-        
-        # Generate all components
-        immediate_steps = self._generate_immediate_steps(
-            primary_section, is_cyber, is_violent, is_urgent
-        )
-        
-        documentation_needed = self._generate_documentation_list(
-            primary_section, is_cyber, is_theft
-        )
-        
-        legal_strategy = self._generate_legal_strategy(
-            primary_section, sections, description
-        )
-        
-        timeline = self._generate_timeline(
-            primary_section, is_non_bailable
-        )
-        
-        cost_estimate = self._generate_cost_estimate(
-            primary_section, is_non_bailable
-        )
-        
-        risk_assessment = self._generate_risk_assessment(
-            sections, description
-        )
+            plan = self._generate_generic_plan()
+        else:
+            plan = self._build_action_plan(description, sections, case_type, is_urgent, include)
+            if include is None or "criticalDeadlines" in include:
+                plan["criticalDeadlines"] = self._generate_deadlines(is_urgent, context)
         
-        # ✨ NEW: Victory/Loss Prediction
-        victory_prediction = self._generate_victory_prediction(
-            sections, description, risk_assessment
-        )
+        if location is not None and (include is None or "policeStationInfo" in include):
+            is_cyber = bool(sections) and "IT Act" in sections[0].code
+            plan["policeStationInfo"] = self._get_nearby_station_info(location, is_cyber)
         
-        # ✨ NEW: Enhanced Case Duration Estimation
-        duration_estimate = self._generate_duration_estimate(
-            primary_section, is_non_bailable, description
-        )
+        if include is not None:
+            plan = {key: value for key, value in plan.items() if key in include}
+        return plan
+    
+    # =========================
+    # PRECOMPUTED COMPONENTS
+    # =========================
+    def _build_section_components(self, section: LegalSection) -> MappingProxyType:
+        """
+        Everything that depends only on the section, with one variant per
+        description flag. Shared between requests - never mutate.
+        """
+        is_cyber = "IT Act" in section.code
+        is_violent = any(code in section.code for code in ["323", "325", "326", "354"])
+        is_theft = "379" in section.code
+        is_non_bailable = not section.bailable
         
-        # ✨ NEW: Detailed Cost Breakdown
-        detailed_costs = self._generate_detailed_costs(
-            primary_section, is_non_bailable, duration_estimate
-        )
+        duration = {
+            is_complex: self._generate_duration_estimate(section, is_non_bailable, is_complex)
+            for is_complex in (False, True)
+        }
         
-        alternative_options = self._generate_alternatives(
-            primary_section, description
-        )
+        return MappingProxyType({
+            "isViolent": is_violent,
+            "immediateSteps": MappingProxyType({
+                is_urgent: self._generate_immediate_steps(section, is_cyber, is_violent, is_urgent)
+                for is_urgent in (False, True)
+            }),
+            "documentationNeeded": self._generate_documentation_list(section, is_cyber, is_theft),
+            "estimatedTimeline": self._generate_timeline(section, is_non_bailable),
+            "costEstimate": self._generate_cost_estimate(section, is_non_bailable),
+            "durationEstimate": MappingProxyType(duration),
+            "detailedCosts": MappingProxyType({
+                is_complex: self._generate_detailed_costs(section, is_non_bailable, duration[is_complex])
+                for is_complex in (False, True)
+            }),
+            "alternativeOptions": MappingProxyType({
+                (is_minor, is_consumer): self._generate_alternatives(section, is_minor, is_consumer)
+                for is_minor in (False, True)
+                for is_consumer in (False, True)
+            }),
+        })
+    
+    def _components_for(self, section: LegalSection) -> MappingProxyType:
+        key = (section.code, section.bailable)
+        components = self._section_components.get(key)
+        if components is None:
+            components = self._extra_components.get(key)
+            if components is None:
+                components = self._build_section_components(section)
+                self._extra_components.put(key, components)
+        return components
+    
+    def _build_action_plan(
+        self,
+        description: str,
+        sections: List[LegalSection],
+        case_type: str,
+        is_urgent: bool,
+        include: Optional[Set[str]] = None
+    ) -> Dict:
+        """Everything in the plan except the dated deadlines"""
         
-        critical_deadlines = self._generate_deadlines(is_urgent)
+        def wanted(key: str) -> bool:
+            return include is None or key in include
         
-        police_station_info = self._get_police_station_info()
+        primary_section = sections[0]
+        components = self._components_for(primary_section)
+        is_violent = components["isViolent"]
+        
+        desc_lower = description.lower()
+        is_complex = any(kw in desc_lower for kw in COMPLEXITY_KEYWORDS)
+        is_minor = "minor" in desc_lower
+        is_consumer = any(kw in desc_lower for kw in CONSUMER_KEYWORDS)
+        
+        # Description-dependent parts (only when requested)
+        legal_strategy = risk_assessment = victory_prediction = None
+        
+        if wanted("legalStrategy"):
+            legal_strategy = self._generate_legal_strategy(
+                primary_section, sections, description
+            )
+        
+        if wanted("riskAssessment") or wanted("victoryPrediction"):
+            # Monte Carlo outcome distribution (memoized per case signature)
+            simulation = self.outcome_simulator.simulate(sections, description)
+            
+            if wanted("riskAssessment"):
+                risk_assessment = self._generate_risk_assessment(
+                    sections, description, simulation
+                )
+            
+            # ✨ NEW: Victory/Loss Prediction
+            if wanted("victoryPrediction"):
+                victory_prediction = self._generate_victory_prediction(
+                    sections, description, simulation
+                )
         
         return {
-            "immediateSteps": immediate_steps,
-            "documentationNeeded": documentation_needed,
+            "immediateSteps": components["immediateSteps"][is_urgent],
+            "documentationNeeded": components["documentationNeeded"],
             "legalStrategy": legal_strategy,
-            "estimatedTimeline": timeline,
-            "costEstimate": cost_estimate,
+            "estimatedTimeline": components["estimatedTimeline"],
+            "costEstimate": components["costEstimate"],
             "riskAssessment": risk_assessment,
             # ✨ NEW PREMIUM FEATURES
             "victoryPrediction": victory_prediction,
-            "durationEstimate": duration_estimate,
-            "detailedCosts": detailed_costs,
-            "alternativeOptions": alternative_options,
-            "criticalDeadlines": critical_deadlines,
-            "policeStationInfo": police_station_info,
+            "durationEstimate": components["durationEstimate"][is_complex],
+            "detailedCosts": components["detailedCosts"][is_complex],
+            "alternativeOptions": components["alternativeOptions"][(is_minor, is_consumer)],
+            "criticalDeadlines": None,  # Bound per call
+            "policeStationInfo": self._police_station_info,
             "urgencyLevel": "HIGH" if is_urgent or is_violent else "MEDIUM",
             "nextStepDeadline": self._calculate_next_deadline(is_urgent, is_violent)
         }
@@ -265,8 +371,9 @@ class ActionPlanGenerator:
         description: str
     ) -> Dict:
         """Generate recommended legal strategy"""
+        desc_lower = description.lower()
         
-        is_strong_evidence = any(word in description.lower() for word in [
+        is_strong_evidence = any(word in desc_lower for word in [
             "screenshot", "cctv", "recording", "witness", "photo", "video"
         ])
         
@@ -444,29 +551,21 @@ class ActionPlanGenerator:
     def _generate_risk_assessment(
         self,
         sections: List[LegalSection],
-        description: str
+        description: str,
+        simulation: Dict
     ) -> Dict:
         """Assess case risks and success probability"""
+        desc_lower = description.lower()
         
         primary = sections[0]
         
-        # Calculate success probability
-        base_probability = 0.60  # Base for cognizable offenses
-        
-        # Adjust based on evidence
+        # Evidence mentioned in the description
         evidence_keywords = ["screenshot", "cctv", "recording", "witness", "photo", "video", "proof"]
-        evidence_count = sum(1 for kw in evidence_keywords if kw in description.lower())
-        evidence_boost = min(0.15, evidence_count * 0.05)
-        
-        # Adjust based on section strength
-        if len(sections) >= 3:
-            section_boost = 0.10
-        elif len(sections) >= 2:
-            section_boost = 0.05
-        else:
-            section_boost = 0.0
+        evidence_count = sum(1 for kw in evidence_keywords if kw in desc_lower)
         
-        success_probability = min(0.90, base_probability + evidence_boost + section_boost)
+        # Success = conviction or settlement in the simulated outcomes
+        outcomes = simulation["outcomes"]
+        success_probability = (outcomes["conviction"] + outcomes["settlement"]) / 100
         
         # Identify risks
         risks = []
@@ -485,16 +584,16 @@ class ActionPlanGenerator:
         # Risks
         if evidence_count == 0:
             risks.append("Limited evidence mentioned - may weaken case")
-        if "delayed" in description.lower() or "days ago" in description.lower():
+        if "delayed" in desc_lower or "days ago" in desc_lower:
             risks.append("Delayed reporting may raise questions")
         if primary.bailable:
             risks.append("Bailable offense - accused can get bail easily")
-        if "no witness" in description.lower():
+        if "no witness" in desc_lower:
             risks.append("Lack of witnesses may make conviction harder")
         
         return {
             "successProbability": round(success_probability * 100),
-            "convictionChance": round(success_probability * 0.85 * 100),  # 85% of success = conviction
+            "convictionChance": round(outcomes["conviction"]),
             "strengths": strengths if strengths else ["Case registered under valid legal provision"],
             "risks": risks if risks else ["Standard legal proceedings apply"],
             "criticalFactors": [
@@ -503,13 +602,14 @@ class ActionPlanGenerator:
                 "Timely action and FIR filing",
                 "Lawyer expertise and strategy"
             ],
-            "recommendation": "PROCEED" if success_probability >= 0.65 else "PROCEED WITH CAUTION"
+            "recommendation": "PROCEED" if success_probability >= 0.45 else "PROCEED WITH CAUTION"
         }
     
     def _generate_alternatives(
         self,
         section: LegalSection,
-        description: str
+        is_minor: bool,
+        is_consumer: bool
     ) -> List[Dict]:
         """Generate alternative resolution options"""
         
@@ -522,7 +622,7 @@ class ActionPlanGenerator:
                 "description": "Negotiate compensation/apology with accused through mediation",
                 "pros": ["Faster resolution (weeks vs years)", "Lower costs", "Less stress", "Guaranteed outcome"],
                 "cons": ["No punishment for accused", "May seem weak", "Requires accused cooperation"],
-                "suitability": "HIGH" if "minor" in description.lower() else "MEDIUM",
+                "suitability": "HIGH" if is_minor else "MEDIUM",
                 "estimatedTime": "2-8 weeks",
                 "estimatedCost": "₹5,000 - ₹25,000"
             })
@@ -551,7 +651,7 @@ class ActionPlanGenerator:
         })
         
         # Consumer Court (if applicable)
-        if "bought" in description.lower() or "product" in description.lower() or "service" in description.lower():
+        if is_consumer:
             alternatives.append({
                 "option": "Consumer Court Complaint",
                 "description": "File complaint for defective product/service",
@@ -564,33 +664,34 @@ class ActionPlanGenerator:
         
         return alternatives
     
-    def _generate_deadlines(self, is_urgent: bool) -> List[Dict]:
+    def _generate_deadlines(self, is_urgent: bool, context: Optional[RenderContext] = None) -> List[Dict]:
         """Generate critical deadlines"""
         
-        now = datetime.now()
+        context = context or self.context
+        now = context.now()
         
         deadlines = [
             {
                 "task": "File FIR",
-                "deadline": (now + timedelta(days=1 if is_urgent else 7)).strftime("%Y-%m-%d"),
+                "deadline": context.days_from_now(1 if is_urgent else 7, now),
                 "priority": "CRITICAL",
                 "consequence": "Delayed FIR raises questions about genuineness of complaint"
             },
             {
                 "task": "Preserve all evidence",
-                "deadline": (now + timedelta(hours=24)).strftime("%Y-%m-%d"),
+                "deadline": context.days_from_now(1, now),
                 "priority": "CRITICAL",
                 "consequence": "Evidence may be lost or destroyed"
             },
             {
                 "task": "Consult lawyer",
-                "deadline": (now + timedelta(days=5)).strftime("%Y-%m-%d"),
+                "deadline": context.days_from_now(5, now),
                 "priority": "HIGH",
                 "consequence": "May miss important legal steps or deadlines"
             },
             {
                 "task": "Gather witness statements",
-                "deadline": (now + timedelta(days=7)).strftime("%Y-%m-%d"),
+                "deadline": context.days_from_now(7, now),
                 "priority": "MEDIUM",
                 "consequence": "Witnesses may forget details or become unavailable"
             }
@@ -619,6 +720,31 @@ class ActionPlanGenerator:
             "emergencyNumber": "100"
         }
     
+    def _get_nearby_station_info(self, location: Tuple[float, float], is_cyber: bool) -> Dict:
+        """Police station info for the incident location"""
+        
+        lat, lon = location
+        info = dict(self._police_station_info)
+        nearby = self.station_locator.nearest(lat, lon, k=3)
+        
+        if nearby:
+            nearest = nearby[0]
+            info["nearest"] = {
+                "name": nearest["name"],
+                "address": ", ".join(part for part in (nearest.get("area"), nearest.get("city")) if part),
+                "phone": nearest.get("phone") or "100 (Emergency)",
+                "distance": f"{nearest['distanceKm']} km",
+                "jurisdiction": nearest.get("jurisdiction") or "Verify jurisdiction before filing FIR"
+            }
+            info["nearbyStations"] = nearby
+        
+        if is_cyber:
+            cyber_cells = self.station_locator.nearest(lat, lon, k=1, cyber_only=True)
+            if cyber_cells:
+                info["nearestCyberCell"] = cyber_cells[0]
+        
+        return info
+    
     def _calculate_next_deadline(self, is_urgent: bool, is_violent: bool) -> str:
         """Calculate the most immediate deadline"""
         
@@ -633,32 +759,31 @@ class ActionPlanGenerator:
         self,
         sections: List[LegalSection],
         description: str,
-        risk_assessment: Dict
+        simulation: Dict
     ) -> Dict:
         """
         Generate detailed victory/loss prediction with probabilities
+        from the simulated outcome distribution
         """
+        desc_lower = description.lower()
         primary = sections[0] if sections else None
+        outcomes = simulation["outcomes"]
         
-        # Base probability from risk assessment
-        success_prob = risk_assessment.get("successProbability", 60) / 100
+        # Victory = FIR registered + chargesheet + conviction
+        victory_chance = outcomes["conviction"] / 100
         
-        # Calculate different outcome probabilities
-        # Victory = FIR registered + investigation + conviction
-        victory_chance = success_prob * 0.85  # 85% of success cases lead to victory
+        # Partial victory = settlement/compromise after FIR
+        partial_victory_chance = outcomes["settlement"] / 100
         
-        # Partial victory = FIR + investigation but settlement/compromise
-        partial_victory_chance = success_prob * 0.10
-        
-        # Loss = No conviction or case dismissed
+        # Loss = FIR not registered, closure report or acquittal
         loss_chance = 1.0 - victory_chance - partial_victory_chance
         
-        # Determine verdict
-        if victory_chance >= 0.70:
+        # Determine verdict (thresholds on the simulated conviction rate)
+        if victory_chance >= 0.50:
             verdict = "STRONG CASE"
             confidence = "HIGH"
             color = "green"
-        elif victory_chance >= 0.50:
+        elif victory_chance >= 0.35:
             verdict = "MODERATE CASE"
             confidence = "MEDIUM"
             color = "yellow"
@@ -673,7 +798,7 @@ class ActionPlanGenerator:
         
         # Analyze evidence quality
         evidence_keywords = ["screenshot", "cctv", "recording", "witness", "photo", "video", "proof", "document"]
-        evidence_count = sum(1 for kw in evidence_keywords if kw in description.lower())
+        evidence_count = sum(1 for kw in evidence_keywords if kw in desc_lower)
         
         if evidence_count >= 3:
             success_factors.append("Strong evidence base (multiple proof types)")
@@ -697,13 +822,13 @@ class ActionPlanGenerator:
             success_factors.append("Cognizable offense - police must investigate")
         
         # Timing factors
-        if "immediately" in description.lower() or "right away" in description.lower():
+        if "immediately" in desc_lower or "right away" in desc_lower:
             success_factors.append("Immediate reporting shows genuineness")
-        elif "days ago" in description.lower() or "weeks ago" in description.lower():
+        elif "days ago" in desc_lower or "weeks ago" in desc_lower:
             risk_factors.append("Delayed reporting may weaken case")
         
         # Witness availability
-        if "witness" in description.lower():
+        if "witness" in desc_lower:
             success_factors.append("Witnesses available to support case")
         else:
             risk_factors.append("No witnesses mentioned - consider finding them")
@@ -719,21 +844,23 @@ class ActionPlanGenerator:
             "riskFactors": risk_factors if risk_factors else ["Standard legal risks apply"],
             "recommendation": self._get_victory_recommendation(victory_chance),
             "detailedAnalysis": {
-                "convictionProbability": round(victory_chance * 100, 1),
-                "settlementProbability": round(partial_victory_chance * 100, 1),
-                "dismissalProbability": round(loss_chance * 0.6 * 100, 1),
-                "acquittalProbability": round(loss_chance * 0.4 * 100, 1)
+                "convictionProbability": outcomes["conviction"],
+                "settlementProbability": outcomes["settlement"],
+                "dismissalProbability": round(outcomes["closureReport"] + outcomes["firNotRegistered"], 1),
+                "acquittalProbability": outcomes["acquittal"]
             },
+            "confidenceInterval": simulation["winProbability"],
+            "simulation": simulation,
             "improvementTips": self._get_improvement_tips(risk_factors, evidence_count)
         }
     
     def _get_victory_recommendation(self, victory_chance: float) -> str:
         """Get recommendation based on victory probability"""
-        if victory_chance >= 0.70:
+        if victory_chance >= 0.50:
             return "STRONGLY RECOMMENDED - High likelihood of favorable outcome"
-        elif victory_chance >= 0.50:
+        elif victory_chance >= 0.35:
             return "RECOMMENDED - Reasonable chance of success with proper evidence"
-        elif victory_chance >= 0.30:
+        elif victory_chance >= 0.20:
             return "PROCEED WITH CAUTION - Strengthen evidence before filing"
         else:
             return "CONSULT LAWYER - Case needs significant strengthening"
@@ -763,7 +890,7 @@ class ActionPlanGenerator:
         self,
         section: LegalSection,
         is_non_bailable: bool,
-        description: str
+        is_complex: bool
     ) -> Dict:
         """
         Generate detailed case duration estimation
@@ -788,9 +915,6 @@ class ActionPlanGenerator:
         }
         
         # Adjust based on complexity
-        complexity_keywords = ["multiple", "several", "many", "various", "complex"]
-        is_complex = any(kw in description.lower() for kw in complexity_keywords)
-        
         if is_complex:
             trial_duration["max_months"] = 48
             trial_duration["average_months"] = 24
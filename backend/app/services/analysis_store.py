@@ -0,0 +1,279 @@
+# app/services/analysis_store.py - Persistent analysis results
+
+"""
+Completed analyses are kept in a local SQLite database (WAL mode, so
+readers never wait for the writer). Each analysis id is derived from the
+request content, so a retry or page reload finds the stored result
+instead of running the pipeline - and paying for an LLM call - again.
+Clients may also send an Idempotency-Key, mapped to the analysis it
+produced. Keys are scoped to the request's user_id, so one user's keys
+are invisible to (and never conflict with) another's.
+
+Writes never block a request: results are queued and a background thread
+commits them in batches. Until then they are served from memory.
+
+Ids include the rule version, so results computed under older rules are
+not reused. Recent records are also kept in an in-process L1 (bounded by
+count and by ANALYSIS_L1_MAX_BYTES), and the oldest rows are deleted once
+the database passes ANALYSIS_DB_MAX_BYTES.
+"""
+
+import atexit
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+from typing import Dict, Optional
+
+from app.core.batch_writer import BatchWriter
+from app.core.cache import LRUCache
+from app.core.config import settings
+from app.core.rule_version import rule_version
+
+# Bump when the response format changes so old results are not reused
+STORE_VERSION = "1"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS analyses (
+    id TEXT PRIMARY KEY,
+    response TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS analyses_created ON analyses (created_at);
+CREATE TABLE IF NOT EXISTS idempotency_keys (
+    key TEXT PRIMARY KEY,
+    analysis_id TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+"""
+
+EVICT_EVERY = 256   # Rows written between size checks
+
+
+class IdempotencyConflict(ValueError):
+    """Raised when an Idempotency-Key is reused for a different request"""
+
+
+class AnalysisStore:
+    """SQLite-backed analysis results with a batched background writer"""
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        batch_size: Optional[int] = None,
+        flush_interval: Optional[float] = None,
+        max_bytes: Optional[int] = None
+    ):
+        self.path = path or settings.ANALYSIS_DB_PATH
+        self.batch_size = batch_size or settings.ANALYSIS_WRITE_BATCH
+        self.flush_interval = flush_interval if flush_interval is not None else settings.ANALYSIS_FLUSH_INTERVAL
+        self.max_bytes = max_bytes or settings.ANALYSIS_DB_MAX_BYTES
+        self._l1 = LRUCache(
+            settings.ANALYSIS_L1_SIZE, max_bytes=settings.ANALYSIS_L1_MAX_BYTES,
+            sizeof=lambda record: sys.getsizeof(record["response"])
+        )
+        self._rows_since_evict = 0
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._local = threading.local()
+        self._connection().executescript(SCHEMA)
+
+        # Queued but not yet committed (served to readers meanwhile)
+        self._pending: Dict[str, Dict] = {}
+        self._pending_keys: Dict[str, str] = {}
+        self._pending_lock = threading.Lock()
+
+        self._writer = BatchWriter(
+            self._write_batch, self.batch_size, self.flush_interval, name="analysis-store-writer"
+        )
+
+    @staticmethod
+    def analysis_id(payload: Dict) -> str:
+        """Content-derived id: same request payload, same id"""
+        canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+        seed = f"{STORE_VERSION}\0{rule_version()}\0{canonical}"
+        return hashlib.sha256(seed.encode("utf-8")).hexdigest()[:32]
+
+    def _connection(self) -> sqlite3.Connection:
+        """One connection per thread"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    # =========================
+    # READS
+    # =========================
+    def get(self, analysis_id: str) -> Optional[Dict]:
+        """{"id", "response" (JSON text), "created_at"} or None"""
+        with self._pending_lock:
+            record = self._pending.get(analysis_id)
+        if record is not None:
+            return record
+
+        record = self._l1.get(analysis_id)
+        if record is not None:
+            return record
+
+        row = self._connection().execute(
+            "SELECT response, created_at FROM analyses WHERE id = ?", (analysis_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        record = {"id": analysis_id, "response": row[0], "created_at": row[1]}
+        self._l1.put(analysis_id, record)
+        return record
+
+    @staticmethod
+    def _scoped_key(key: str, user_id: Optional[str]) -> str:
+        """Stored form of an Idempotency-Key: a digest of the key within its user's namespace"""
+        return hashlib.sha256(f"{user_id or ''}\0{key}".encode("utf-8")).hexdigest()
+
+    def find_key(self, key: str, user_id: Optional[str] = None) -> Optional[str]:
+        """Analysis id recorded for a user's Idempotency-Key"""
+        key = self._scoped_key(key, user_id)
+        with self._pending_lock:
+            analysis_id = self._pending_keys.get(key)
+        if analysis_id is not None:
+            return analysis_id
+
+        row = self._connection().execute(
+            "SELECT analysis_id FROM idempotency_keys WHERE key = ?", (key,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def check_key(self, key: str, analysis_id: str, user_id: Optional[str] = None) -> bool:
+        """
+        True if the user's key already belongs to this analysis, False if unused.
+        Raises IdempotencyConflict if it belongs to a different one.
+        """
+        existing = self.find_key(key, user_id)
+        if existing is None:
+            return False
+        if existing != analysis_id:
+            raise IdempotencyConflict("Idempotency-Key was already used for a different request")
+        return True
+
+    # =========================
+    # WRITES
+    # =========================
+    def put(
+        self,
+        analysis_id: str,
+        response_json: str,
+        idempotency_key: Optional[str] = None,
+        user_id: Optional[str] = None
+    ):
+        """Queue a result for writing; readable immediately"""
+        record = {"id": analysis_id, "response": response_json, "created_at": time.time()}
+        if idempotency_key:
+            idempotency_key = self._scoped_key(idempotency_key, user_id)
+        self._l1.put(analysis_id, record)
+        with self._pending_lock:
+            self._pending[analysis_id] = record
+            if idempotency_key:
+                self._pending_keys[idempotency_key] = analysis_id
+        self._writer.put((record, idempotency_key))
+
+    def flush(self):
+        """Block until every queued write is committed"""
+        self._writer.flush()
+
+    def close(self):
+        self._writer.close()
+
+    def _write_batch(self, records):
+        conn = self._connection()
+        try:
+            with conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO analyses (id, response, created_at) VALUES (?, ?, ?)",
+                    [(r["id"], r["response"], r["created_at"]) for r, _ in records]
+                )
+                conn.executemany(
+                    "INSERT OR IGNORE INTO idempotency_keys (key, analysis_id, created_at) VALUES (?, ?, ?)",
+                    [(key, r["id"], r["created_at"]) for r, key in records if key]
+                )
+        except sqlite3.Error as e:
+            print(f"❌ Analysis store write failed ({len(records)} rows): {e}")
+        
+        self._rows_since_evict += len(records)
+        if self._rows_since_evict >= EVICT_EVERY:
+            self._rows_since_evict = 0
+            self._evict(conn)
+
+        # Committed (or dropped) - stop serving from memory
+        with self._pending_lock:
+            for record, key in records:
+                if self._pending.get(record["id"]) is record:
+                    del self._pending[record["id"]]
+                if key and self._pending_keys.get(key) == record["id"]:
+                    del self._pending_keys[key]
+
+    def stats(self) -> Dict:
+        try:
+            rows, size = self._connection().execute(
+                "SELECT COUNT(*), COALESCE(SUM(LENGTH(response)), 0) FROM analyses"
+            ).fetchone()
+        except sqlite3.Error:
+            rows = size = None
+        return {
+            "path": self.path,
+            "analyses": rows,
+            "bytes": size,
+            "maxBytes": self.max_bytes,
+            "pending": self._writer.pending,
+            "l1": self._l1.stats(),
+        }
+
+    def _evict(self, conn: sqlite3.Connection):
+        """Delete the oldest analyses (and their keys) until under max_bytes"""
+        try:
+            total = conn.execute("SELECT COALESCE(SUM(LENGTH(response)), 0) FROM analyses").fetchone()[0]
+            if total <= self.max_bytes:
+                return
+
+            target = total - int(self.max_bytes * 0.9)
+            victims = []
+            freed = 0
+            for analysis_id, size in conn.execute(
+                "SELECT id, LENGTH(response) FROM analyses ORDER BY created_at"
+            ):
+                victims.append((analysis_id,))
+                freed += size
+                if freed >= target:
+                    break
+
+            with conn:
+                conn.executemany("DELETE FROM analyses WHERE id = ?", victims)
+                conn.executemany("DELETE FROM idempotency_keys WHERE analysis_id = ?", victims)
+            print(f"🗄️ Analysis store evicted {len(victims)} old analyses")
+        except sqlite3.Error as e:
+            print(f"❌ Analysis store eviction failed: {e}")
+
+
+_store: Optional[AnalysisStore] = None
+_store_lock = threading.Lock()
+
+
+def get_analysis_store() -> Optional[AnalysisStore]:
+    """Process-wide store (None when ANALYSIS_STORE_ENABLED is off)"""
+    global _store
+    if not settings.ANALYSIS_STORE_ENABLED:
+        return None
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = AnalysisStore()
+                atexit.register(_store.close)
+                print(f"🗄️ Analysis store: {_store.path}")
+    return _store
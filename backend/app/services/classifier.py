@@ -1,5 +1,6 @@
 import re
 from app.models.shared import Classification, Severity
+from app.core.rule_stats import rule_stats, PATTERN_KEYWORD, WINNING_PATTERN
 
 class CrimeClassifier:
     """Pre-classifies cases with cyber-first priority"""
@@ -219,6 +220,7 @@ class CrimeClassifier:
             matched_keywords = [kw for kw in pattern_data["keywords"] if kw in desc_lower]
             
             if matched_keywords:
+                rule_stats.hits(PATTERN_KEYWORD, pattern_name, matched_keywords)
                 match_strength = len(matched_keywords) / len(pattern_data["keywords"])
                 matches.append({
                     "pattern": pattern_name,
@@ -241,6 +243,7 @@ class CrimeClassifier:
         # 🆕 Sort by priority first, then strength
         matches.sort(key=lambda x: (x["priority"], -x["strength"]))
         best_match = matches[0]
+        rule_stats.hit(WINNING_PATTERN, best_match["pattern"])
         
         return Classification(
             category=best_match["data"]["category"],
@@ -248,4 +251,14 @@ class CrimeClassifier:
             domain=best_match["data"]["domain"],
             keywords_found=list(set(all_keywords_found)),
             confidence=min(0.95, best_match["strength"] + 0.5)
-        )
\ No newline at end of file
+        )
+
+
+rule_stats.register(
+    PATTERN_KEYWORD,
+    {name: data["keywords"] for name, data in CrimeClassifier.CRIME_PATTERNS.items()}
+)
+rule_stats.register(
+    WINNING_PATTERN,
+    {name: [] for name in CrimeClassifier.CRIME_PATTERNS}
+)
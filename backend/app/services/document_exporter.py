@@ -0,0 +1,292 @@
+# app/services/document_exporter.py - Server-side PDF/DOCX export
+
+"""
+Renders DocumentGenerator output to PDF or DOCX.
+
+Files are stored in a content-addressed disk cache: the key is a hash of
+the format and the rendered text (which already reflects every input,
+including the date), so a repeated download is served straight from disk.
+The cache directory may be shared by all workers - writes are atomic.
+"""
+
+import copy
+import hashlib
+import io
+import os
+import re
+import tempfile
+import threading
+import time
+from typing import Dict, Optional
+
+from app.core.config import settings
+
+# =========================
+# OPTIONAL RENDERERS
+# =========================
+try:
+    from fpdf import FPDF
+    from fontTools import ttLib
+    PDF_AVAILABLE = True
+except ImportError:
+    PDF_AVAILABLE = False
+
+try:
+    from docx import Document
+    from docx.oxml.ns import qn
+    from docx.shared import Pt
+    DOCX_AVAILABLE = True
+except ImportError:
+    DOCX_AVAILABLE = False
+
+# Complex-script shaping (conjuncts, matras) for Devanagari in PDFs
+try:
+    import uharfbuzz  # noqa: F401
+    TEXT_SHAPING_AVAILABLE = True
+except ImportError:
+    TEXT_SHAPING_AVAILABLE = False
+
+EXPORT_FORMATS = {
+    "pdf": ("application/pdf", ".pdf"),
+    "docx": ("application/vnd.openxmlformats-officedocument.wordprocessingml.document", ".docx"),
+}
+
+# Bump when the layout changes so cached files are re-rendered
+RENDERER_VERSION = "1"
+EVICT_TO_FRACTION = 0.9   # Eviction frees down to this share of EXPORT_CACHE_MAX_BYTES
+
+DEVANAGARI = re.compile(r"[ऀ-ॿ]")
+
+# Bundled Noto fonts (SIL OFL 1.1, see app/data/fonts/OFL.txt) so Hindi/Marathi
+# PDFs work out of the box; Noto Sans covers the Latin text in those documents
+FONTS_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "fonts")
+DEFAULT_DEVANAGARI_FONT_PATH = os.path.join(FONTS_DIR, "NotoSansDevanagari-Regular.ttf")
+DEFAULT_BODY_FONT_PATH = os.path.join(FONTS_DIR, "NotoSans-Regular.ttf")
+
+
+class ExportUnavailable(RuntimeError):
+    """Raised when a format (or script) cannot be rendered on this server"""
+
+
+# =========================
+# CONTENT-ADDRESSED CACHE
+# =========================
+class ExportCache:
+    """
+    Rendered files on disk, keyed by content hash, evicted oldest-first.
+    The directory size is tracked as files are written; it is only
+    re-measured (os.walk) on first use, every EXPORT_CACHE_RESCAN_SECONDS
+    to pick up other workers' files, and when the limit is passed.
+    """
+
+    def __init__(self, root: Optional[str] = None, max_bytes: Optional[int] = None):
+        self.root = root or settings.EXPORT_CACHE_DIR
+        self.max_bytes = max_bytes or settings.EXPORT_CACHE_MAX_BYTES
+        self._total: Optional[int] = None   # Bytes on disk as of the last scan, plus writes since
+        self._scanned_at = 0.0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(fmt: str, title: str, text: str) -> str:
+        digest = hashlib.sha256()
+        for part in (RENDERER_VERSION, fmt, title, text):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def path(self, key: str, fmt: str) -> str:
+        return os.path.join(self.root, key[:2], key + EXPORT_FORMATS[fmt][1])
+
+    def get(self, key: str, fmt: str) -> Optional[str]:
+        path = self.path(key, fmt)
+        try:
+            os.utime(path)  # Recently used files survive eviction
+        except OSError:
+            return None
+        return path
+
+    def put(self, key: str, fmt: str, data: bytes) -> str:
+        path = self.path(key, fmt)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        try:
+            replaced = os.path.getsize(path)
+        except OSError:
+            replaced = 0
+
+        # Write-then-rename so other workers never see a partial file
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        with self._lock:
+            if self._total is None or time.monotonic() - self._scanned_at >= settings.EXPORT_CACHE_RESCAN_SECONDS:
+                self._scan()
+            else:
+                self._total += len(data) - replaced
+            if self._total > self.max_bytes:
+                self._evict(keep=path)
+        return path
+
+    def _scan(self):
+        """Re-measure the directory; returns [(mtime, size, path)]"""
+        files = []
+        for dirpath, _, filenames in os.walk(self.root):
+            for name in filenames:
+                file_path = os.path.join(dirpath, name)
+                try:
+                    stat = os.stat(file_path)
+                except OSError:
+                    continue
+                files.append((stat.st_mtime, stat.st_size, file_path))
+        self._total = sum(size for _, size, _ in files)
+        self._scanned_at = time.monotonic()
+        return files
+
+    def _evict(self, keep: str):
+        # Down to a low-water mark, so a full cache does not re-scan on every write
+        target = self.max_bytes * EVICT_TO_FRACTION
+        files = self._scan()
+        for _, size, file_path in sorted(files):
+            if self._total <= target:
+                break
+            if file_path == keep:
+                continue
+            try:
+                os.remove(file_path)
+                self._total -= size
+            except OSError:
+                pass
+
+
+# =========================
+# EXPORTER
+# =========================
+class DocumentExporter:
+    """
+    PDF/DOCX renderer. Font files are read and measured once into a
+    template PDF that every render copies - one for Latin-only text and
+    one for text with Devanagari, so English PDFs embed no Devanagari font.
+    """
+
+    def __init__(self, cache: Optional[ExportCache] = None):
+        self.cache = cache or ExportCache()
+        self.devanagari_font = settings.PDF_DEVANAGARI_FONT_PATH or DEFAULT_DEVANAGARI_FONT_PATH
+        self._pdf_templates: Dict[bool, "FPDF"] = {}   # keyed by "has Devanagari"
+        self._font_data: Dict[str, bytes] = {}
+        self._template_lock = threading.Lock()
+
+    def export(self, title: str, text: str, fmt: str) -> Dict:
+        """Render (or fetch from cache) and return the file location"""
+        if fmt not in EXPORT_FORMATS:
+            raise ValueError(f"Unsupported format: {fmt}")
+
+        key = self.cache.key(fmt, title, text)
+        path = self.cache.get(key, fmt)
+        cached = path is not None
+
+        if not cached:
+            data = self._render_pdf(title, text) if fmt == "pdf" else self._render_docx(title, text)
+            path = self.cache.put(key, fmt, data)
+
+        return {
+            "path": path,
+            "key": key,
+            "cached": cached,
+            "media_type": EXPORT_FORMATS[fmt][0],
+            "extension": EXPORT_FORMATS[fmt][1],
+        }
+
+    # =========================
+    # PDF
+    # =========================
+    def _font_paths(self, devanagari: bool):
+        """(family, TTF path) for a template; none = core Helvetica"""
+        if not devanagari:
+            return [("Body", settings.PDF_FONT_PATH)] if settings.PDF_FONT_PATH else []
+        return [("Body", settings.PDF_FONT_PATH or DEFAULT_BODY_FONT_PATH), ("Devanagari", self.devanagari_font)]
+
+    def _pdf_base(self, devanagari: bool):
+        """Template document with fonts loaded (built on first use)"""
+        template = self._pdf_templates.get(devanagari)
+        if template is None:
+            with self._template_lock:
+                template = self._pdf_templates.get(devanagari)
+                if template is None:
+                    pdf = FPDF(format="A4")
+                    pdf.set_auto_page_break(auto=True, margin=15)
+                    pdf.set_margins(20, 20, 20)
+                    for family, path in self._font_paths(devanagari):
+                        pdf.add_font(family, "", path)
+                        if family.lower() not in self._font_data:
+                            with open(path, "rb") as f:
+                                self._font_data[family.lower()] = f.read()
+                    if devanagari:
+                        pdf.set_fallback_fonts(["Devanagari"])
+                    template = self._pdf_templates[devanagari] = pdf
+        return template
+
+    def _new_pdf(self, devanagari: bool = False):
+        """Copy of the template, safe to render into"""
+        template = self._pdf_base(devanagari)
+        # output() subsets the parsed font in place, so each copy gets its own,
+        # opened lazily from the in-memory file - the template's is not copied
+        memo = {id(font.ttfont): None for font in template.fonts.values() if getattr(font, "ttfont", None) is not None}
+        pdf = copy.deepcopy(template, memo)
+        for fontkey, font in pdf.fonts.items():
+            data = self._font_data.get(fontkey)
+            if data is not None:
+                font.ttfont = ttLib.TTFont(io.BytesIO(data), recalcTimestamp=False, lazy=True)
+        return pdf
+
+    def _render_pdf(self, title: str, text: str) -> bytes:
+        if not PDF_AVAILABLE:
+            raise ExportUnavailable("PDF export requires fpdf2 (pip install fpdf2)")
+
+        has_devanagari = DEVANAGARI.search(text) is not None
+        pdf = self._new_pdf(has_devanagari)
+        pdf.set_title(title)
+        pdf.add_page()
+
+        if has_devanagari or settings.PDF_FONT_PATH:
+            # Devanagari runs fall back to the Devanagari font
+            pdf.set_font("Body", size=11)
+        else:
+            # Core fonts only cover Latin-1
+            pdf.set_font("Helvetica", size=11)
+            text = text.encode("latin-1", "replace").decode("latin-1")
+
+        if has_devanagari and TEXT_SHAPING_AVAILABLE:
+            pdf.set_text_shaping(True)
+
+        pdf.multi_cell(0, 6, text)
+        return bytes(pdf.output())
+
+    # =========================
+    # DOCX
+    # =========================
+    def _render_docx(self, title: str, text: str) -> bytes:
+        if not DOCX_AVAILABLE:
+            raise ExportUnavailable("DOCX export requires python-docx (pip install python-docx)")
+
+        document = Document()
+        document.core_properties.title = title
+
+        style = document.styles["Normal"]
+        style.font.size = Pt(11)
+        style.paragraph_format.space_after = Pt(0)
+        if DEVANAGARI.search(text):
+            # Complex-script font used by Word for Devanagari runs
+            style.element.get_or_add_rPr().get_or_add_rFonts().set(qn("w:cs"), "Mangal")
+
+        for line in text.split("\n"):
+            document.add_paragraph(line)
+
+        buffer = io.BytesIO()
+        document.save(buffer)
+        return buffer.getvalue()
@@ -1,92 +1,22 @@
 # app/services/document_generator.py - Legal Document Generator
 
+import hashlib
 from typing import List, Dict, Optional
-from datetime import datetime
 from app.models.section import LegalSection
+from app.core.cache import LRUCache, freeze
+from app.core.config import settings
+from app.core.render_context import RenderContext, default_context, DATE, ISO_DATE
 
-class DocumentGenerator:
-    """
-    Generates legal documents: FIR, Written Complaint, Affidavit, etc.
-    """
-    
-    def generate_fir_draft(
-        self,
-        case_details: Dict,
-        sections: List[LegalSection],
-        user_info: Optional[Dict] = None
-    ) -> Dict:
-        """
-        Generate FIR draft in both English and Hindi
-        """
-        
-        primary_section = sections[0] if sections else None
-        
-        # Default user info
-        if not user_info:
-            user_info = {
-                "name": "[Your Full Name]",
-                "father_name": "[Father's/Husband's Name]",
-                "age": "[Age]",
-                "address": "[Complete Address with Pin Code]",
-                "phone": "[Mobile Number]",
-                "email": "[Email Address]"
-            }
-        
-        description = case_details.get("description", "")
-        incident_date = case_details.get("incident_date", datetime.now().strftime("%Y-%m-%d"))
-        incident_time = case_details.get("incident_time", "[Time of incident]")
-        incident_place = case_details.get("incident_place", "[Location of incident]")
-        
-        # Generate English FIR
-        english_fir = self._generate_english_fir(
-            user_info, description, sections, 
-            incident_date, incident_time, incident_place
-        )
-        
-        # Generate Hindi FIR
-        hindi_fir = self._generate_hindi_fir(
-            user_info, description, sections,
-            incident_date, incident_time, incident_place
-        )
-        
-        # ✨ NEW: Generate Marathi FIR
-        marathi_fir = self._generate_marathi_fir(
-            user_info, description, sections,
-            incident_date, incident_time, incident_place
-        )
-        
-        return {
-            "english": english_fir,
-            "hindi": hindi_fir,
-            "marathi": marathi_fir,  # ✨ NEW
-            "sections_applied": [s.code for s in sections],
-            "document_type": "FIR Draft",
-            "generated_date": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            "instructions": [
-                "Fill in all [bracketed] information with your actual details",
-                "Print on plain paper (no letterhead needed)",
-                "Sign at the bottom",
-                "Submit two copies - one for police, one for your records",
-                "Police MUST give you a copy with FIR number and date/time",
-                "If police refuse to file FIR, submit written complaint via registered post to SP/Commissioner"
-            ]
-        }
-    
-    def _generate_english_fir(
-        self,
-        user_info: Dict,
-        description: str,
-        sections: List[LegalSection],
-        incident_date: str,
-        incident_time: str,
-        incident_place: str
-    ) -> str:
-        """Generate FIR in English"""
-        
-        sections_text = ", ".join([s.code for s in sections]) if sections else "[Applicable sections]"
-        primary_offense = sections[0].title if sections else "[Nature of offense]"
-        
-        fir = f"""
+FIR_LANGUAGES = ("english", "hindi", "marathi")
+
+# ============================================
+# FIR TEMPLATES - prepared once at import
+# ============================================
+# Rendering is a single format_map() per language. Values are never
+# re-parsed, so braces in user text are safe.
+
+_FIR_TEMPLATES = {
+    "english": """
 FIRST INFORMATION REPORT (FIR)
 Under Section 154 CrPC
 
@@ -95,19 +25,19 @@ The Station House Officer (SHO)
 [Name of Police Station]
 [Address]
 
-Date: {datetime.now().strftime("%d/%m/%Y")}
+Date: {date}
 
 Subject: Complaint regarding {primary_offense} - Request for FIR registration
 
 Respected Sir/Madam,
 
 DETAILS OF COMPLAINANT:
-Name: {user_info['name']}
-Father's/Husband's Name: {user_info['father_name']}
-Age: {user_info['age']}
-Address: {user_info['address']}
-Mobile: {user_info['phone']}
-Email: {user_info['email']}
+Name: {name}
+Father's/Husband's Name: {father_name}
+Age: {age}
+Address: {address}
+Mobile: {phone}
+Email: {email}
 
 DETAILS OF INCIDENT:
 Date of Incident: {incident_date}
@@ -120,7 +50,7 @@ STATEMENT OF FACTS:
 
 LEGAL PROVISIONS APPLICABLE:
 Based on the above facts, the following offenses have been committed:
-{self._format_sections_for_fir(sections)}
+{sections_formatted}
 
 PRAYER:
 In view of the above facts, I request you to kindly:
@@ -135,9 +65,9 @@ Yours faithfully,
 
 _______________________
 [Signature]
-{user_info['name']}
-Date: {datetime.now().strftime("%d/%m/%Y")}
-Mobile: {user_info['phone']}
+{name}
+Date: {date}
+Mobile: {phone}
 
 ENCLOSURES:
 1. Copy of identity proof (Aadhar/PAN)
@@ -150,24 +80,9 @@ If FIR is not registered, you can:
 - File complaint to SP/Commissioner
 - Send complaint via Registered Post AD
 - File private complaint before Magistrate under Section 156(3) CrPC
-"""
-        return fir.strip()
-    
-    def _generate_hindi_fir(
-        self,
-        user_info: Dict,
-        description: str,
-        sections: List[LegalSection],
-        incident_date: str,
-        incident_time: str,
-        incident_place: str
-    ) -> str:
-        """Generate FIR in Hindi - UTF-8 encoded"""
-        
-        sections_text = ", ".join([s.code for s in sections]) if sections else "[लागू धाराएं]"
-        
-        # Use raw string to preserve Devanagari characters
-        hindi_fir = """प्रथम सूचना रिपोर्ट (FIR)
+""",
+
+    "hindi": """प्रथम सूचना रिपोर्ट (FIR)
 (धारा 154 सी.आर.पी.सी. के अंतर्गत)
 
 सेवा में,
@@ -214,37 +129,9 @@ _______________________
 शिकायतकर्ता का नाम
 
 दिनांक: {date}
-""".format(
-            date=datetime.now().strftime("%d/%m/%Y"),
-            name=user_info['name'],
-            father_name=user_info['father_name'],
-            age=user_info['age'],
-            address=user_info['address'],
-            phone=user_info['phone'],
-            email=user_info['email'],
-            incident_date=incident_date,
-            incident_time=incident_time,
-            incident_place=incident_place,
-            description=description,
-            sections=sections_text
-        )
-        
-        return hindi_fir.strip()
-    
-    def _generate_marathi_fir(
-        self,
-        user_info: Dict,
-        description: str,
-        sections: List[LegalSection],
-        incident_date: str,
-        incident_time: str,
-        incident_place: str
-    ) -> str:
-        """Generate FIR in Marathi - UTF-8 encoded"""
-        
-        sections_text = ", ".join([s.code for s in sections]) if sections else "[लागू कलम]"
-        
-        marathi_fir = f"""
+""",
+
+    "marathi": """
 प्रथम माहिती अहवाल (FIR)
 कलम 154 CrPC अंतर्गत
 
@@ -253,19 +140,19 @@ _______________________
 [पोलीस ठाण्याचे नाव]
 [पत्ता]
 
-दिनांक: {datetime.now().strftime("%d/%m/%Y")}
+दिनांक: {date}
 
 विषय: तक्रार नोंदणीसाठी विनंती
 
 महोदय/महोदया,
 
 तक्रारदाराचा तपशील:
-नाव: {user_info['name']}
-वडिलांचे/पतीचे नाव: {user_info['father_name']}
-वय: {user_info['age']}
-पत्ता: {user_info['address']}
-मोबाइल: {user_info['phone']}
-ईमेल: {user_info['email']}
+नाव: {name}
+वडिलांचे/पतीचे नाव: {father_name}
+वय: {age}
+पत्ता: {address}
+मोबाइल: {phone}
+ईमेल: {email}
 
 घटनेचा तपशील:
 घटनेची तारीख: {incident_date}
@@ -277,7 +164,7 @@ _______________________
 {description}
 
 लागू कायदेशीर कलम:
-{sections_text}
+{sections}
 
 विनंती:
 वरील वस्तुस्थितीच्या आधारे, मी आपल्याकडे विनंती करतो/करते की:
@@ -292,8 +179,8 @@ _______________________
 
 _______________________
 [स्वाक्षरी]
-{user_info['name']}
-दिनांक: {datetime.now().strftime("%d/%m/%Y")}
+{name}
+दिनांक: {date}
 
 संलग्नक:
 1. ओळखपत्राची प्रत
@@ -302,8 +189,145 @@ _______________________
 
 ---
 टीप: सर्वोच्च न्यायालयाच्या मार्गदर्शक तत्त्वांनुसार, संज्ञेय गुन्ह्यांसाठी पोलिसांनी FIR नोंदवणे आवश्यक आहे.
-"""
-        return marathi_fir.strip()
+""",
+}
+
+# Strip once here instead of on every render
+_FIR_TEMPLATES = {lang: template.strip() for lang, template in _FIR_TEMPLATES.items()}
+
+# Placeholder when no sections were identified
+_FIR_NO_SECTIONS = {
+    "english": "[Applicable sections]",
+    "hindi": "[लागू धाराएं]",
+    "marathi": "[लागू कलम]",
+}
+
+_DEFAULT_FIR_USER_INFO = {
+    "name": "[Your Full Name]",
+    "father_name": "[Father's/Husband's Name]",
+    "age": "[Age]",
+    "address": "[Complete Address with Pin Code]",
+    "phone": "[Mobile Number]",
+    "email": "[Email Address]"
+}
+
+_FIR_INSTRUCTIONS = [
+    "Fill in all [bracketed] information with your actual details",
+    "Print on plain paper (no letterhead needed)",
+    "Sign at the bottom",
+    "Submit two copies - one for police, one for your records",
+    "Police MUST give you a copy with FIR number and date/time",
+    "If police refuse to file FIR, submit written complaint via registered post to SP/Commissioner"
+]
+
+
+MEMO_KEY_TEXT_CHARS = 256   # Longer case-detail strings (the description) are keyed by digest
+
+
+def _digest_long_text(value):
+    """Case details with long text replaced by its SHA-256, so memo keys stay small"""
+    if not isinstance(value, dict):
+        return value
+    return {
+        k: ("sha256", hashlib.sha256(v.encode("utf-8", "surrogatepass")).hexdigest())
+        if isinstance(v, str) and len(v) > MEMO_KEY_TEXT_CHARS else v
+        for k, v in value.items()
+    }
+
+
+class DocumentGenerator:
+    """
+    Generates legal documents: FIR, Written Complaint, Affidavit, etc.
+    
+    Rendered text is memoized with dates left as placeholders; the
+    RenderContext (clock + locale) fills them in on every call.
+    A description can be up to MAX_DOCUMENT_BYTES, so the memo is bounded
+    in bytes (DOCUMENT_MEMO_MAX_BYTES) and keys hold a digest of long text.
+    """
+    
+    def __init__(self, context: Optional[RenderContext] = None, memo_size: int = 256,
+                 memo_bytes: Optional[int] = None):
+        self.context = context or default_context
+        self._memo = LRUCache(memo_size, max_bytes=settings.DOCUMENT_MEMO_MAX_BYTES if memo_bytes is None else memo_bytes)
+    
+    def _memo_key(self, kind: str, sections: List[LegalSection], *inputs) -> tuple:
+        """(kind, section codes, section content and case details) - hashed by the memo dict"""
+        section_content = tuple(
+            (s.title, s.punishment, s.description[:150]) for s in sections
+        )
+        inputs = tuple(_digest_long_text(value) for value in inputs)
+        return (kind, tuple(s.code for s in sections), section_content, freeze(inputs))
+    
+    def generate_fir_draft(
+        self,
+        case_details: Dict,
+        sections: List[LegalSection],
+        user_info: Optional[Dict] = None,
+        languages: Optional[List[str]] = None,
+        context: Optional[RenderContext] = None
+    ) -> Dict:
+        """
+        Generate FIR draft in the requested languages (default: English, Hindi and Marathi)
+        """
+        context = context or self.context
+        languages = [lang for lang in (languages or FIR_LANGUAGES) if lang in _FIR_TEMPLATES]
+        
+        key = self._memo_key("fir", sections, case_details, user_info)
+        values = context.values()
+        fields = None
+        
+        draft = {}
+        for lang in languages:
+            text = self._memo.get((key, lang))
+            if text is None:
+                # Work shared by every language is done once
+                if fields is None:
+                    fields = self._fir_fields(case_details, sections, user_info)
+                text = self._render_fir(lang, fields)
+                self._memo.put((key, lang), text)
+            draft[lang] = context.bind(text, values)
+        
+        draft.update({
+            "languages": languages,
+            "sections_applied": [s.code for s in sections],
+            "document_type": "FIR Draft",
+            "generated_date": values["timestamp"],
+            "instructions": _FIR_INSTRUCTIONS
+        })
+        return draft
+    
+    def _fir_fields(
+        self,
+        case_details: Dict,
+        sections: List[LegalSection],
+        user_info: Optional[Dict]
+    ) -> Dict:
+        """Template values shared by all FIR languages"""
+        user_info = {**_DEFAULT_FIR_USER_INFO, **(user_info or {})}
+        
+        return {
+            "date": DATE,
+            "name": user_info["name"],
+            "father_name": user_info["father_name"],
+            "age": user_info["age"],
+            "address": user_info["address"],
+            "phone": user_info["phone"],
+            "email": user_info["email"],
+            "description": case_details.get("description", ""),
+            "incident_date": case_details.get("incident_date", ISO_DATE),
+            "incident_time": case_details.get("incident_time", "[Time of incident]"),
+            "incident_place": case_details.get("incident_place", "[Location of incident]"),
+            "primary_offense": sections[0].title if sections else "[Nature of offense]",
+            "section_codes": ", ".join(s.code for s in sections),
+            "sections_formatted": self._format_sections_for_fir(sections)
+        }
+    
+    def _render_fir(self, language: str, fields: Dict) -> str:
+        """Render one language from its template"""
+        return _FIR_TEMPLATES[language].format_map({
+            **fields,
+            "sections": fields["section_codes"] or _FIR_NO_SECTIONS[language]
+        })
     
     def _format_sections_for_fir(self, sections: List[LegalSection]) -> str:
         """Format sections for FIR document"""
@@ -325,16 +349,29 @@ _______________________
         self,
         case_details: Dict,
         sections: List[LegalSection],
-        user_info: Optional[Dict] = None
+        user_info: Optional[Dict] = None,
+        context: Optional[RenderContext] = None
     ) -> str:
         """Generate formal written complaint"""
-        
-        if not user_info:
-            user_info = {
-                "name": "[Your Name]",
-                "address": "[Your Address]",
-                "phone": "[Mobile]"
-            }
+        key = self._memo_key("complaint", sections, case_details, user_info)
+        text = self._memo.get(key)
+        if text is None:
+            text = self._render_written_complaint(case_details, sections, user_info)
+            self._memo.put(key, text)
+        return (context or self.context).bind(text)
+    
+    def _render_written_complaint(
+        self,
+        case_details: Dict,
+        sections: List[LegalSection],
+        user_info: Optional[Dict]
+    ) -> str:
+        user_info = {
+            "name": "[Your Name]",
+            "address": "[Your Address]",
+            "phone": "[Mobile]",
+            **(user_info or {})
+        }
         
         primary_section = sections[0] if sections else None
         offense_name = primary_section.title if primary_section else "Criminal Offense"
@@ -347,7 +384,7 @@ The Station House Officer (SHO)
 [Police Station Name]
 [Address]
 
-Date: {datetime.now().strftime("%d/%m/%Y")}
+Date: {DATE}
 
 Subject: Complaint regarding commission of offense under {', '.join([s.code for s in sections])}
 
@@ -385,7 +422,7 @@ Yours faithfully,
 _______________________
 {user_info['name']}
 Contact: {user_info['phone']}
-Date: {datetime.now().strftime("%d/%m/%Y")}
+Date: {DATE}
 """
         return complaint.strip()
     
@@ -511,10 +548,24 @@ Seal & Signature
         user_info: Dict,
         recipient_info: Dict,
         demand: str,
-        sections: List[LegalSection]
+        sections: List[LegalSection],
+        context: Optional[RenderContext] = None
     ) -> str:
         """Generate legal notice template"""
-        
+        key = self._memo_key("legal_notice", sections, user_info, recipient_info, demand)
+        text = self._memo.get(key)
+        if text is None:
+            text = self._render_legal_notice(user_info, recipient_info, demand, sections)
+            self._memo.put(key, text)
+        return (context or self.context).bind(text)
+    
+    def _render_legal_notice(
+        self,
+        user_info: Dict,
+        recipient_info: Dict,
+        demand: str,
+        sections: List[LegalSection]
+    ) -> str:
         notice = f"""
 LEGAL NOTICE
 Under Section 80 of Code of Civil Procedure, 1908
@@ -523,7 +574,7 @@ To,
 {recipient_info.get('name', '[Name of Person]')}
 {recipient_info.get('address', '[Address]')}
 
-Date: {datetime.now().strftime("%d/%m/%Y")}
+Date: {DATE}
 
 Dear Sir/Madam,
 
@@ -1,5 +1,6 @@
 from app.models.section import LegalSection
 from app.models.case import Classification
+from app.core.rule_stats import rule_stats, SECTION_KEYWORD, EXCLUSION
 
 class KeywordMatcher:
     """Enhanced keyword matcher with digital asset detection"""
@@ -224,7 +225,9 @@ class KeywordMatcher:
                 # Check exclusion keywords FIRST
                 exclusion_keywords = section_data.get("exclusion_keywords", [])
                 if any(ex_kw in desc_lower for ex_kw in exclusion_keywords):
-                    print(f"❌ Excluding {section_data['code']} due to: {[kw for kw in exclusion_keywords if kw in desc_lower]}")
+                    excluded_by = [kw for kw in exclusion_keywords if kw in desc_lower]
+                    rule_stats.hits(EXCLUSION, section_data["code"], excluded_by)
+                    print(f"❌ Excluding {section_data['code']} due to: {excluded_by}")
                     continue
                 
                 # Check if keywords match
@@ -243,6 +246,7 @@ class KeywordMatcher:
                     print(f"✅ {section_data['code']} - Asset type match bonus: {confidence:.2f}")
                 
                 matched_kws = [kw for kw in section_data["keywords"] if kw in desc_lower]
+                rule_stats.hits(SECTION_KEYWORD, section_data["code"], matched_kws)
                 
                 sections.append(LegalSection(
                     code=section_data["code"],
@@ -263,4 +267,17 @@ class KeywordMatcher:
         
         print(f"\n📊 Total sections matched: {len(sections)}")
         
-        return sections[:5]
\ No newline at end of file
+        return sections[:5]
+
+
+def _register_rules():
+    keywords, exclusions = {}, {}
+    for mappings in KeywordMatcher.SECTION_MAPPINGS.values():
+        for section_data in mappings:
+            keywords.setdefault(section_data["code"], []).extend(section_data["keywords"])
+            exclusions.setdefault(section_data["code"], []).extend(section_data.get("exclusion_keywords", []))
+    rule_stats.register(SECTION_KEYWORD, keywords)
+    rule_stats.register(EXCLUSION, {code: kws for code, kws in exclusions.items() if kws})
+
+
+_register_rules()
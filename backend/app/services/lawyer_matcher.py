@@ -0,0 +1,391 @@
+# app/services/lawyer_matcher.py - Rank lawyers for an analysed case
+
+"""
+Server-side port of src/lib/lawyerMatcher.ts - same scores, same reasons,
+same ordering - built to stay fast as the lawyer directory grows.
+
+A lawyer's score has a static part (verified, experience, rating, success
+rate, case volume) and a case-dependent part (practice areas and location).
+Lawyers with the same practice areas form a profile, and inverted indexes
+map each practice area to its profiles and each city, state and language to
+its lawyers. Every list is pre-sorted by static score, so a query scores the
+matching profiles once and reads the best few lawyers off the front of each
+list; only local lawyers who could still reach the top k are looked at
+individually.
+"""
+
+import json
+import os
+import threading
+from collections import defaultdict
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+from app.core.cache import LRUCache
+from app.core.config import settings
+from app.data.practice_areas import CASE_TYPE_MAPPING, CATEGORY_CASE_TYPES, PRACTICE_AREA_MAPPING
+
+DEFAULT_LAWYERS_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "lawyers.json")
+
+MAX_SCORE = 150   # Primary section + case type + all bonuses (for matchPercentage)
+
+SectionRef = Tuple[str, bool]   # (code, isPrimary)
+
+
+def case_type_for(category: Optional[str], domain: Optional[str] = None) -> Optional[str]:
+    """Classifier category (e.g. "Cyber Crime/Blackmail") -> CASE_TYPE_MAPPING key"""
+    if not category:
+        return None
+    lowered = category.lower()
+    if lowered in CASE_TYPE_MAPPING:
+        return lowered
+    for fragment, case_type in CATEGORY_CASE_TYPES:
+        if fragment in lowered:
+            return case_type
+    return "civil" if domain == "civil" else "criminal"
+
+
+def match_percentage(score: int) -> int:
+    return max(min(round(score / MAX_SCORE * 100), 100), 0)
+
+
+# =========================
+# SCORING (reference implementation)
+# =========================
+def _static_score(lawyer: Dict) -> Tuple[int, List[str]]:
+    """Case-independent part of the score, with its reasons"""
+    score = 0
+    reasons = []
+
+    if lawyer.get("verified"):
+        score += 12
+
+    years = lawyer.get("yearsOfPractice") or 0
+    if years >= 20:
+        score += 20
+        reasons.append(f"{years}+ years experience")
+    elif years >= 15:
+        score += 17
+        reasons.append(f"{years}+ years experience")
+    elif years >= 10:
+        score += 15
+        reasons.append(f"{years}+ years experience")
+    elif years >= 5:
+        score += 10
+
+    rating = lawyer.get("rating") or 0
+    if rating >= 4.8:
+        score += 15
+    elif rating >= 4.5:
+        score += 12
+    elif rating >= 4.0:
+        score += 7
+
+    success_rate = lawyer.get("successRate") or 0
+    if success_rate >= 90:
+        score += 15
+    elif success_rate >= 85:
+        score += 12
+    elif success_rate >= 80:
+        score += 10
+
+    total_cases = lawyer.get("totalCases") or 0
+    if total_cases >= 500:
+        score += 10
+    elif total_cases >= 300:
+        score += 5
+
+    return score, reasons
+
+
+def _location_bonus(lawyer: Dict, user_location: Optional[str]) -> Tuple[int, Optional[str]]:
+    if not user_location:
+        return 0, None
+    location = user_location.lower()
+    city = (lawyer.get("city") or "").lower()
+    state = (lawyer.get("state") or "").lower()
+    if location in city or city in location:
+        return 25, "Local lawyer"
+    if location in state or state in location:
+        return 10, "In your state"
+    return 0, None
+
+
+def score_lawyer(
+    lawyer: Dict,
+    sections: List[SectionRef],
+    case_type: Optional[str] = None,
+    user_location: Optional[str] = None
+) -> Tuple[int, str, List[str]]:
+    """(score, reason, relevantAreas) for one lawyer - mirrors calculateMatchScore"""
+    score = 0
+    matched_areas: Dict[str, None] = {}   # Insertion-ordered set
+    reasons = []
+    specialty_count = 0
+    practice_areas = [pa.lower() for pa in lawyer.get("practiceAreas", [])]
+
+    for code, is_primary in sections:
+        for area in PRACTICE_AREA_MAPPING.get(code, []):
+            if any(area.lower() in pa for pa in practice_areas):
+                matched_areas[area] = None
+                specialty_count += 1
+                score += 60 if is_primary else 35
+
+    if specialty_count >= 3:
+        score += 20
+        reasons.append("Deep expertise in this area")
+    elif specialty_count >= 2:
+        score += 10
+
+    if case_type:
+        for area in CASE_TYPE_MAPPING.get(case_type.lower(), []):
+            if any(area.lower() in pa for pa in practice_areas):
+                matched_areas[area] = None
+                score += 15
+
+    bonus, reason = _location_bonus(lawyer, user_location)
+    score += bonus
+    if reason:
+        reasons.append(reason)
+
+    static, static_reasons = _static_score(lawyer)
+    score += static
+    reasons.extend(static_reasons)
+
+    relevant_areas = list(matched_areas)
+    if relevant_areas:
+        reasons.insert(0, f"Specializes in {', '.join(relevant_areas[:3])}")
+    if lawyer.get("verified"):
+        reasons.append("Verified")
+
+    return score, " • ".join(reasons) if reasons else "General practice lawyer", relevant_areas
+
+
+def _tiebreak(lawyer: Dict) -> Tuple:
+    return (
+        -(lawyer.get("successRate") or 0),
+        -(lawyer.get("yearsOfPractice") or 0),
+        -(lawyer.get("rating") or 0),
+        -(lawyer.get("totalCases") or 0),
+    )
+
+
+# =========================
+# MATCHER
+# =========================
+class LawyerMatcher:
+    """Top-k lawyer matching over inverted indexes"""
+
+    def __init__(self, lawyers: List[Dict]):
+        self.lawyers = lawyers
+        active = [i for i, lawyer in enumerate(lawyers) if lawyer.get("active")]
+        self._static = {i: _static_score(lawyers[i])[0] for i in active}
+        self._tiebreaks = {i: _tiebreak(lawyers[i]) for i in active}
+
+        # Static-score order - the ranking when nothing case-specific matches.
+        # Every list below keeps this order, so the best of any group come first.
+        self._ranked = sorted(active, key=lambda i: (-self._static[i], self._tiebreaks[i], i))
+
+        # Lawyers with the same practice areas score the same on them:
+        # profile -> members, practice area -> profiles
+        self._profile_of: Dict[int, int] = {}
+        self._profile_members: List[List[int]] = []
+        profile_ids: Dict[Tuple[str, ...], int] = {}
+        self._by_practice_area: Dict[str, Set[int]] = defaultdict(set)
+
+        # City / state / language -> profile -> lawyers
+        self._city_of: Dict[int, str] = {}
+        self._state_of: Dict[int, str] = {}
+        self._by_city: Dict[str, Dict[int, List[int]]] = defaultdict(lambda: defaultdict(list))
+        self._by_state: Dict[str, Dict[int, List[int]]] = defaultdict(lambda: defaultdict(list))
+        self._by_language: Dict[str, List[int]] = defaultdict(list)
+        self._by_language_profile: Dict[str, Dict[int, List[int]]] = defaultdict(lambda: defaultdict(list))
+
+        for i in self._ranked:
+            lawyer = lawyers[i]
+            areas = tuple(sorted({pa.lower() for pa in lawyer.get("practiceAreas", [])}))
+            profile = profile_ids.get(areas)
+            if profile is None:
+                profile = profile_ids[areas] = len(self._profile_members)
+                self._profile_members.append([])
+                for area in areas:
+                    self._by_practice_area[area].add(profile)
+            self._profile_of[i] = profile
+            self._profile_members[profile].append(i)
+
+            self._city_of[i] = (lawyer.get("city") or "").lower()
+            self._state_of[i] = (lawyer.get("state") or "").lower()
+            self._by_city[self._city_of[i]][profile].append(i)
+            self._by_state[self._state_of[i]][profile].append(i)
+            for language in lawyer.get("languages", []):
+                self._by_language[language.lower()].append(i)
+                self._by_language_profile[language.lower()][profile].append(i)
+        self._language_sets = {language: set(ids) for language, ids in self._by_language.items()}
+
+        # Mapping area -> profiles / location -> matching cities and states
+        self._area_cache = LRUCache(4096)
+        self._location_cache = LRUCache(1024)
+
+    @classmethod
+    def from_file(cls, path: Optional[str] = None) -> "LawyerMatcher":
+        path = path or settings.LAWYERS_PATH or DEFAULT_LAWYERS_PATH
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        lawyers = data["lawyers"] if isinstance(data, dict) else data
+        print(f"⚖️ Loaded {len(lawyers)} lawyers from {os.path.basename(path)}")
+        return cls(lawyers)
+
+    def _profiles_with_area(self, area: str) -> FrozenSet[int]:
+        """Profiles with a practice area containing `area` (case-insensitive)"""
+        key = area.lower()
+        profiles = self._area_cache.get(key)
+        if profiles is None:
+            profiles = frozenset(
+                profile
+                for practice_area, members in self._by_practice_area.items() if key in practice_area
+                for profile in members
+            )
+            self._area_cache.put(key, profiles)
+        return profiles
+
+    def _locations(self, user_location: str) -> Tuple[FrozenSet[str], FrozenSet[str]]:
+        """(cities, states) that count as local / in-state for a user location"""
+        location = user_location.lower()
+        matched = self._location_cache.get(location)
+        if matched is None:
+            matched = (
+                frozenset(c for c in self._by_city if location in c or c in location),
+                frozenset(s for s in self._by_state if location in s or s in location),
+            )
+            self._location_cache.put(location, matched)
+        return matched
+
+    def _profile_scores(self, sections: List[SectionRef], case_type: Optional[str]) -> Dict[int, int]:
+        """Practice-area score of every profile that has one"""
+        scores: Dict[int, int] = defaultdict(int)
+        specialty: Dict[int, int] = defaultdict(int)
+
+        for code, is_primary in sections:
+            points = 60 if is_primary else 35
+            for area in PRACTICE_AREA_MAPPING.get(code, []):
+                for profile in self._profiles_with_area(area):
+                    scores[profile] += points
+                    specialty[profile] += 1
+
+        for profile, count in specialty.items():
+            if count >= 3:
+                scores[profile] += 20
+            elif count >= 2:
+                scores[profile] += 10
+
+        if case_type:
+            for area in CASE_TYPE_MAPPING.get(case_type.lower(), []):
+                for profile in self._profiles_with_area(area):
+                    scores[profile] += 15
+
+        return scores
+
+    def match(
+        self,
+        sections: Iterable,
+        case_type: Optional[str] = None,
+        user_location: Optional[str] = None,
+        limit: int = 5,
+        min_score: int = 20,
+        language: Optional[str] = None
+    ) -> List[Dict]:
+        """
+        Best `limit` active lawyers scoring at least `min_score`, as lawyer
+        dicts with matchScore, matchPercentage, matchReason and relevantAreas.
+        `sections` are (code, isPrimary) pairs or dicts/objects with those fields.
+        """
+        refs = [_section_ref(section) for section in sections]
+        allowed = None
+        members_of = self._profile_members
+        everyone = self._ranked
+        if language:
+            language = language.lower()
+            allowed = self._language_sets.get(language, set())
+            members_of = self._by_language_profile.get(language, {})
+            everyone = self._by_language.get(language, [])
+        profile_scores = self._profile_scores(refs, case_type)
+        cities, states = self._locations(user_location) if user_location else (frozenset(), frozenset())
+        static = self._static
+
+        def location_bonus(i: int) -> int:
+            if self._city_of[i] in cities:
+                return 25
+            return 10 if self._state_of[i] in states else 0
+
+        def best(ordered: Iterable[int], skip) -> List[Tuple[int, int]]:
+            """First `limit` lawyers of a static-ordered list, minus skipped ones"""
+            found = []
+            for i in ordered:
+                if len(found) >= limit:
+                    break
+                if (allowed is None or i in allowed) and not skip(i):
+                    found.append((static[i] + profile_scores.get(self._profile_of[i], 0), i))
+            return found
+
+        # Without a location bonus, a lawyer's rank within its profile is its static rank
+        candidates = []
+        for profile in profile_scores:
+            if language is None or profile in members_of:
+                candidates += best(members_of[profile], location_bonus)
+        candidates += best(everyone, lambda i: self._profile_of[i] in profile_scores or location_bonus(i))
+
+        # Lawyers with a location bonus, while they can still beat the k-th best so far
+        if cities or states:
+            ranked = sorted(candidates, key=lambda c: -c[0])
+            threshold = max(ranked[limit - 1][0] if len(ranked) >= limit else min_score, min_score)
+            seen = set()
+            for bonus, places, index in ((25, cities, self._by_city), (10, states, self._by_state)):
+                for place in places:
+                    for profile, members in index[place].items():
+                        base = profile_scores.get(profile, 0)
+                        for i in members:
+                            if static[i] + base + bonus < threshold:
+                                break
+                            if i not in seen and (allowed is None or i in allowed):
+                                seen.add(i)
+                                candidates.append((static[i] + base + location_bonus(i), i))
+
+        candidates = [c for c in candidates if c[0] >= min_score]
+        candidates.sort(key=lambda c: (-c[0], self._tiebreaks[c[1]], c[1]))
+
+        results = []
+        for score, i in candidates[:limit]:
+            lawyer = self.lawyers[i]
+            _, reason, relevant_areas = score_lawyer(lawyer, refs, case_type, user_location)
+            results.append({
+                **lawyer,
+                "matchScore": score,
+                "matchPercentage": match_percentage(score),
+                "matchReason": reason,
+                "relevantAreas": relevant_areas,
+            })
+        return results
+
+    def __len__(self) -> int:
+        return len(self.lawyers)
+
+
+def _section_ref(section) -> SectionRef:
+    if isinstance(section, tuple):
+        return section
+    if isinstance(section, dict):
+        return section["code"], bool(section.get("isPrimary"))
+    return section.code, bool(getattr(section, "isPrimary", False))
+
+
+_matcher: Optional[LawyerMatcher] = None
+_matcher_lock = threading.Lock()
+
+
+def get_lawyer_matcher() -> LawyerMatcher:
+    """Process-wide matcher, built on first use"""
+    global _matcher
+    if _matcher is None:
+        with _matcher_lock:
+            if _matcher is None:
+                _matcher = LawyerMatcher.from_file()
+    return _matcher
@@ -0,0 +1,190 @@
+# app/services/local_provider.py - Offline fake AI provider
+
+"""
+The "local" provider type answers like a real LLM without any network:
+canned section JSON after a simulated latency, with configurable rates of
+errors, empty replies, truncated JSON and malformed (repairable) JSON.
+It exercises the full hybrid path - fallback, parsing, validation, the
+response cache, metrics and the provider ledger - for load tests on a box
+without API keys.
+
+With LOCAL_PROVIDER_SEED set, latency and faults are a function of the
+prompt, so a load test replays the same way every run.
+"""
+
+import hashlib
+import json
+import math
+import random
+import re
+import threading
+import time
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+from app.core.config import settings
+from app.data.ipc_sections import get_section
+
+LATENCY_DISTRIBUTIONS = ("constant", "uniform", "exponential", "lognormal")
+
+SITUATION = re.compile(r'SITUATION: "(.*?)"\n', re.DOTALL)
+CATEGORY = re.compile(r"- Category: (.+)")
+KEYWORD_SECTION = re.compile(r"^- (.+?): .*$", re.MULTILINE)
+
+
+class LocalProviderError(RuntimeError):
+    """Simulated provider failure, with the HTTP status a real SDK error would carry"""
+
+    def __init__(self, message: str, status_code: int):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class LocalProviderClient:
+    """Stands in for an SDK client; complete() returns (text, usage) like _request_provider"""
+
+    def __init__(
+        self,
+        latency: str = "lognormal",
+        latency_ms: float = 800.0,
+        spread: float = 0.5,
+        error_rate: float = 0.0,
+        empty_rate: float = 0.0,
+        truncate_rate: float = 0.0,
+        malformed_rate: float = 0.0,
+        default_sections: Optional[List[str]] = None,
+        responses: Optional[Dict[str, Dict]] = None,
+        seed: Optional[int] = None,
+        rpm: Optional[int] = None
+    ):
+        if latency not in LATENCY_DISTRIBUTIONS:
+            raise ValueError(f"latency must be one of {', '.join(LATENCY_DISTRIBUTIONS)}")
+        self.latency = latency
+        self.latency_ms = latency_ms
+        self.spread = spread
+        self.error_rate = error_rate
+        self.empty_rate = empty_rate
+        self.truncate_rate = truncate_rate
+        self.malformed_rate = malformed_rate
+        self.default_sections = default_sections or ["IPC 503"]
+        self.responses = responses or {}
+        self.seed = seed
+        self.rpm = rpm
+        self._calls = deque()   # Call times in the last minute, for the simulated quota
+        self._calls_lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls) -> "LocalProviderClient":
+        responses = None
+        if settings.LOCAL_PROVIDER_RESPONSES_PATH:
+            with open(settings.LOCAL_PROVIDER_RESPONSES_PATH, encoding="utf-8") as f:
+                responses = json.load(f)
+        return cls(
+            latency=settings.LOCAL_PROVIDER_LATENCY,
+            latency_ms=settings.LOCAL_PROVIDER_LATENCY_MS,
+            spread=settings.LOCAL_PROVIDER_LATENCY_SPREAD,
+            error_rate=settings.LOCAL_PROVIDER_ERROR_RATE,
+            empty_rate=settings.LOCAL_PROVIDER_EMPTY_RATE,
+            truncate_rate=settings.LOCAL_PROVIDER_TRUNCATE_RATE,
+            malformed_rate=settings.LOCAL_PROVIDER_MALFORMED_RATE,
+            default_sections=settings.LOCAL_PROVIDER_SECTIONS,
+            responses=responses,
+            seed=settings.LOCAL_PROVIDER_SEED,
+            rpm=settings.LOCAL_PROVIDER_RPM
+        )
+
+    # =========================
+    # SIMULATION
+    # =========================
+    def _rng(self, system_prompt: str, prompt: str) -> random.Random:
+        if self.seed is None:
+            return random.Random()
+        digest = hashlib.sha256(f"{self.seed}\0{system_prompt}\0{prompt}".encode("utf-8")).digest()
+        return random.Random(int.from_bytes(digest[:8], "big"))
+
+    def sample_latency(self, rng: random.Random) -> float:
+        """Seconds to wait before answering"""
+        base = self.latency_ms / 1000
+        if self.latency == "uniform":
+            return max(0.0, rng.uniform(base * (1 - self.spread), base * (1 + self.spread)))
+        if self.latency == "exponential":
+            return rng.expovariate(1 / base) if base > 0 else 0.0
+        if self.latency == "lognormal":
+            return rng.lognormvariate(math.log(base), self.spread) if base > 0 else 0.0
+        return base
+
+    def _over_quota(self) -> bool:
+        """Sliding one-minute window, like a provider's requests-per-minute limit"""
+        if not self.rpm:
+            return False
+        now = time.monotonic()
+        with self._calls_lock:
+            while self._calls and now - self._calls[0] >= 60:
+                self._calls.popleft()
+            if len(self._calls) >= self.rpm:
+                return True
+            self._calls.append(now)
+            return False
+
+    def complete(self, system_prompt: str, prompt: str) -> Tuple[Optional[str], Dict]:
+        if self._over_quota():
+            raise LocalProviderError("Simulated quota exceeded (429 Too Many Requests)", 429)
+        rng = self._rng(system_prompt, prompt)
+        time.sleep(self.sample_latency(rng))
+
+        roll = rng.random()
+        if roll < self.error_rate:
+            raise LocalProviderError("Simulated provider error (503 Service Unavailable)", 503)
+        roll -= self.error_rate
+        if roll < self.empty_rate:
+            return None, {}
+        roll -= self.empty_rate
+
+        text = json.dumps(self._answer(prompt), indent=2)
+        if roll < self.truncate_rate:
+            # Cut off mid-reply, as at the token limit (often beyond repair)
+            return text[:int(len(text) * rng.uniform(0.3, 0.9))], {"truncated": True}
+        roll -= self.truncate_rate
+        if roll < self.malformed_rate:
+            # Markdown fence, chatter and a trailing comma - what _repair_json exists for
+            text = text.replace("\n}", ",\n}", 1) if rng.random() < 0.5 else text
+            return f"Here is the analysis:\n```json\n{text}\n```\nLet me know if you need anything else.", {"truncated": False}
+        return text, {"truncated": False}
+
+    # =========================
+    # CANNED ANSWERS
+    # =========================
+    def _answer(self, prompt: str) -> Dict:
+        category = CATEGORY.search(prompt)
+        canned = self.responses.get(category.group(1).strip() if category else "") or self.responses.get("*")
+        if canned is not None:
+            return canned
+
+        # Hybrid validation lists the keyword sections - confirm them; AI-only gets the defaults
+        situation = SITUATION.search(prompt)
+        listed = KEYWORD_SECTION.findall(prompt.split("KEYWORD SECTIONS:", 1)[1]) if "KEYWORD SECTIONS:" in prompt else []
+        codes = listed or self.default_sections
+        sections = [
+            _section(code, 0.85 - 0.05 * i, situation.group(1) if situation else "")
+            for i, code in enumerate(codes)
+        ]
+        return {
+            "case_nature": "criminal",
+            "case_nature_reasoning": "Simulated analysis (local provider)",
+            "primary_sections": [s for s in sections if s is not None],
+            "conditional_sections": [],
+            "rejected_sections": [],
+            "overall_confidence": 0.8,
+        }
+
+
+def _section(code: str, confidence: float, situation: str) -> Optional[Dict]:
+    details = get_section(code)
+    if details is None:
+        return None
+    return {
+        **details,
+        "confidence": round(max(confidence, 0.5), 2),
+        "reasoning": "Simulated: the described facts match this section",
+        "key_factors": situation.lower().split()[:3],
+    }
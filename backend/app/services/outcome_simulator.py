@@ -0,0 +1,383 @@
+# app/services/outcome_simulator.py - Monte Carlo case outcome simulation
+
+"""
+Samples the path of a criminal complaint - FIR registration, settlement,
+chargesheet, bail, trial and verdict - from the probability tables in
+app/data/outcome_tables.py, and summarizes win probability, duration and
+cost.
+
+Stage probabilities are themselves uncertain: trials are split across
+PARAMETER_DRAWS "worlds", each drawing its probabilities from a Beta
+distribution around the table value. The spread of the per-world win rate
+gives the confidence interval.
+
+With NumPy every case in a batch is simulated as one (cases, worlds,
+trials) array. Without it a pure-Python loop runs far fewer trials.
+Results are deterministic per case signature and memoized.
+"""
+
+import math
+import random
+import zlib
+from typing import Dict, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+from app.core.cache import LRUCache
+from app.core.config import settings
+from app.data.outcome_tables import (
+    CATEGORY_PROFILES,
+    COMPLEX_TRIAL_FACTOR,
+    DEFAULT_PROFILE,
+    EVIDENCE_KEYWORDS,
+    EVIDENCE_SHIFT,
+    MAX_EVIDENCE_ITEMS,
+    MULTI_SECTION_SHIFT,
+    NON_BAILABLE_PROFILE,
+    SECTION_PROFILES,
+    SIGNAL_SHIFTS,
+)
+from app.models.section import LegalSection
+
+STAGES = ("fir", "settlement", "chargesheet", "bail", "conviction")
+COMPLEXITY_KEYWORDS = ("multiple", "several", "many", "various", "complex")
+
+PARAMETER_DRAWS = 200       # Worlds per case (for the confidence interval)
+CONCENTRATION = 60          # Beta concentration around each stage probability
+PYTHON_MAX_TRIALS = 4_000   # Trial cap without NumPy
+CHUNK_ELEMENTS = 2_000_000  # Trials simulated at once (bounds memory in batches)
+QUANTILE_SAMPLE = 25_000    # Trials per case used for duration/cost percentiles
+
+FIR_REFUSED_MONTHS = 1.0    # Time spent before the complaint is dropped
+FIR_REFUSED_COST_SHARE = 0.2
+
+# Signature of a case: everything the simulation depends on
+CaseKey = Tuple[str, bool, int, int, Tuple[str, ...], bool]
+
+
+def _logit(p: float) -> float:
+    p = min(max(p, 1e-6), 1 - 1e-6)
+    return math.log(p / (1 - p))
+
+
+def _sigmoid(x: float) -> float:
+    return 1 / (1 + math.exp(-x))
+
+
+def case_key(sections: Sequence[LegalSection], description: str) -> CaseKey:
+    """Reduce a case to the inputs the simulation uses"""
+    desc_lower = description.lower()
+    primary = sections[0]
+    evidence = min(MAX_EVIDENCE_ITEMS, sum(1 for kw in EVIDENCE_KEYWORDS if kw in desc_lower))
+    signals = tuple(
+        name for name, keywords, _ in SIGNAL_SHIFTS
+        if any(kw in desc_lower for kw in keywords)
+    )
+    is_complex = any(kw in desc_lower for kw in COMPLEXITY_KEYWORDS)
+    return (primary.code, primary.bailable, min(len(sections) - 1, 2), evidence, signals, is_complex)
+
+
+def resolve_profile(key: CaseKey) -> Dict[str, float]:
+    """Table lookups and description shifts for one case signature"""
+    code, bailable, extra_sections, evidence, signals, is_complex = key
+
+    profile = dict(DEFAULT_PROFILE)
+    if not bailable:
+        profile.update(NON_BAILABLE_PROFILE)
+    for fragments, overrides in CATEGORY_PROFILES.values():
+        if any(fragment in code for fragment in fragments):
+            profile.update(overrides)
+    profile.update(SECTION_PROFILES.get(code, {}))
+
+    shifts = {stage: 0.0 for stage in STAGES}
+    for stage, shift in EVIDENCE_SHIFT.items():
+        shifts[stage] += shift * evidence
+    for stage, shift in MULTI_SECTION_SHIFT.items():
+        shifts[stage] += shift * extra_sections
+    for name, _, stage_shifts in SIGNAL_SHIFTS:
+        if name in signals:
+            for stage, shift in stage_shifts.items():
+                shifts[stage] += shift
+
+    for stage, shift in shifts.items():
+        if shift and 0 < profile[stage] < 1:
+            profile[stage] = _sigmoid(_logit(profile[stage]) + shift)
+
+    if is_complex:
+        profile["trial_median"] *= COMPLEX_TRIAL_FACTOR
+    return profile
+
+
+def _seed(key: CaseKey, trials: int) -> int:
+    return zlib.crc32(repr((key, trials)).encode("utf-8"))
+
+
+def _beta_params(p: float) -> Tuple[float, float]:
+    p = min(max(p, 1e-3), 1 - 1e-3)
+    return p * CONCENTRATION, (1 - p) * CONCENTRATION
+
+
+def _percentiles(values: List[float], qs=(10, 50, 90)) -> List[float]:
+    ordered = sorted(values)
+    last = len(ordered) - 1
+    return [ordered[min(last, round(q / 100 * last))] for q in qs]
+
+
+def _summary(
+    engine: str,
+    trials: int,
+    win_mean: float,
+    win_low: float,
+    win_high: float,
+    shares: Dict[str, float],
+    bail_rate: float,
+    duration: Tuple[float, float, float, float],
+    cost: Tuple[float, float, float, float]
+) -> Dict:
+    return {
+        "engine": engine,
+        "trials": trials,
+        "winProbability": {
+            "mean": round(win_mean * 100, 1),
+            "low": round(win_low * 100, 1),
+            "high": round(win_high * 100, 1),
+            "interval": 95
+        },
+        "outcomes": {name: round(share * 100, 1) for name, share in shares.items()},
+        "bailGranted": round(bail_rate * 100, 1),
+        "durationMonths": {
+            "mean": round(duration[0], 1),
+            "p10": round(duration[1], 1),
+            "median": round(duration[2], 1),
+            "p90": round(duration[3], 1)
+        },
+        "costInr": {
+            "mean": int(round(cost[0], -2)),
+            "p10": int(round(cost[1], -2)),
+            "median": int(round(cost[2], -2)),
+            "p90": int(round(cost[3], -2))
+        }
+    }
+
+
+# =========================
+# SIMULATOR
+# =========================
+class OutcomeSimulator:
+    """Monte Carlo outcome simulation, single case or batched"""
+
+    def __init__(self, trials: Optional[int] = None, draws: int = PARAMETER_DRAWS, memo_size: int = 1024):
+        self.trials = trials or settings.SIMULATION_TRIALS
+        self.draws = draws
+        self.engine = "numpy" if NUMPY_AVAILABLE else "python"
+        self._memo = LRUCache(memo_size)
+
+    def simulate(
+        self,
+        sections: Sequence[LegalSection],
+        description: str,
+        trials: Optional[int] = None
+    ) -> Dict:
+        """
+        Outcome distribution for one case.
+        The result is shared between callers - treat it as read-only.
+        """
+        return self.simulate_batch([(sections, description)], trials)[0]
+
+    def simulate_batch(
+        self,
+        cases: Sequence[Tuple[Sequence[LegalSection], str]],
+        trials: Optional[int] = None
+    ) -> List[Dict]:
+        """Outcome distributions for (sections, description) pairs, in order"""
+        trials = trials or self.trials
+        if self.engine == "python":
+            trials = min(trials, PYTHON_MAX_TRIALS)
+
+        keys = [case_key(sections, description) for sections, description in cases]
+        results: Dict[CaseKey, Dict] = {}
+        pending = []
+        for key in keys:
+            if key in results:
+                continue
+            cached = self._memo.get((key, trials))
+            if cached is not None:
+                results[key] = cached
+            else:
+                results[key] = None
+                pending.append(key)
+
+        if pending:
+            if self.engine == "numpy":
+                draws = min(self.draws, trials)
+                per_chunk = max(1, CHUNK_ELEMENTS // trials)
+                simulated = []
+                for start in range(0, len(pending), per_chunk):
+                    simulated.extend(self._run_numpy(pending[start:start + per_chunk], trials, draws))
+            else:
+                draws = min(self.draws, max(1, trials // 100))
+                simulated = [self._run_python(key, trials, draws) for key in pending]
+
+            for key, result in zip(pending, simulated):
+                self._memo.put((key, trials), result)
+                results[key] = result
+
+        return [results[key] for key in keys]
+
+    # =========================
+    # NUMPY ENGINE
+    # =========================
+    def _run_numpy(self, keys: List[CaseKey], trials: int, draws: int) -> List[Dict]:
+        """One vectorized pass over (cases, worlds, trials per world)"""
+        per_world = max(1, trials // draws)
+        trials = per_world * draws
+        n = len(keys)
+        profiles = [resolve_profile(key) for key in keys]
+
+        def column(name: str):
+            return np.array([p[name] for p in profiles], dtype=np.float32)[:, None, None]
+
+        # Per-case generators keep results independent of batch composition
+        stage_p = {stage: np.empty((n, draws, 1), dtype=np.float32) for stage in STAGES}
+        u = np.empty((n, 7, draws, per_world), dtype=np.float32)
+        z = np.empty((n, draws, per_world), dtype=np.float32)
+        for i, (key, profile) in enumerate(zip(keys, profiles)):
+            rng = np.random.default_rng(_seed(key, trials))
+            for stage in STAGES:
+                a, b = _beta_params(profile[stage])
+                stage_p[stage][i, :, 0] = rng.beta(a, b, size=draws)
+            rng.random(out=u[i], dtype=np.float32)
+            rng.standard_normal(out=z[i], dtype=np.float32)
+
+        # Outcome path
+        fir = u[:, 0] < stage_p["fir"]
+        settled = fir & (u[:, 1] < stage_p["settlement"])
+        prosecuted = fir & ~settled & (u[:, 2] < stage_p["chargesheet"])
+        bail = prosecuted & (u[:, 3] < stage_p["bail"])
+        convicted = prosecuted & (u[:, 4] < stage_p["conviction"])
+
+        # Duration (months)
+        fee = u[:, 6]
+        investigation = column("investigation_min") + (column("investigation_max") - column("investigation_min")) * u[:, 5]
+        chargesheet = column("chargesheet_min") + (column("chargesheet_max") - column("chargesheet_min")) * fee
+        trial = column("trial_median") * np.exp(column("trial_sigma") * z)
+        duration = np.where(
+            prosecuted, investigation + chargesheet + trial,
+            np.where(settled, investigation * (0.25 + 0.75 * fee),
+                     np.where(fir, investigation + chargesheet, FIR_REFUSED_MONTHS))
+        )
+
+        # Cost (rupees) - one fee level per trial, so cheap lawyers are cheap throughout
+        def spread(name: str):
+            low = column(f"{name}_min")
+            return low + (column(f"{name}_max") - low) * fee
+
+        cost = spread("fixed_cost") * np.where(fir, 1.0, FIR_REFUSED_COST_SHARE) + np.where(
+            prosecuted,
+            trial * column("hearings_per_month") * spread("hearing_cost") + spread("expert_cost") + spread("bail_cost"),
+            0.0
+        )
+
+        # Summaries
+        win_by_world = convicted.mean(axis=2)
+        win_ci = np.percentile(win_by_world, [2.5, 97.5], axis=1)
+        flat_duration = duration.reshape(n, -1)
+        flat_cost = cost.reshape(n, -1)
+        # Percentiles need a partial sort - an evenly strided sample is plenty
+        stride = max(1, trials // QUANTILE_SAMPLE)
+        duration_q = np.percentile(flat_duration[:, ::stride], [10, 50, 90], axis=1)
+        cost_q = np.percentile(flat_cost[:, ::stride], [10, 50, 90], axis=1)
+
+        shares = {
+            "conviction": convicted.mean(axis=(1, 2)),
+            "settlement": settled.mean(axis=(1, 2)),
+            "acquittal": (prosecuted & ~convicted).mean(axis=(1, 2)),
+            "closureReport": (fir & ~settled & ~prosecuted).mean(axis=(1, 2)),
+            "firNotRegistered": (~fir).mean(axis=(1, 2)),
+        }
+        prosecuted_count = prosecuted.sum(axis=(1, 2))
+        bail_rate = bail.sum(axis=(1, 2)) / np.maximum(prosecuted_count, 1)
+
+        return [
+            _summary(
+                "numpy", trials,
+                float(win_by_world[i].mean()), float(win_ci[0, i]), float(win_ci[1, i]),
+                {name: float(values[i]) for name, values in shares.items()},
+                float(bail_rate[i]),
+                (float(flat_duration[i].mean()),) + tuple(float(q) for q in duration_q[:, i]),
+                (float(flat_cost[i].mean()),) + tuple(float(q) for q in cost_q[:, i]),
+            )
+            for i in range(n)
+        ]
+
+    # =========================
+    # PURE-PYTHON ENGINE
+    # =========================
+    def _run_python(self, key: CaseKey, trials: int, draws: int) -> Dict:
+        """Same model as _run_numpy, one trial at a time"""
+        per_world = max(1, trials // draws)
+        trials = per_world * draws
+        profile = resolve_profile(key)
+        rng = random.Random(_seed(key, trials))
+
+        def spread(name: str, fee: float) -> float:
+            low = profile[f"{name}_min"]
+            return low + (profile[f"{name}_max"] - low) * fee
+
+        counts = dict.fromkeys(("conviction", "settlement", "acquittal", "closureReport", "firNotRegistered"), 0)
+        bail_count = prosecuted_count = 0
+        win_by_world = []
+        durations = []
+        costs = []
+
+        for _ in range(draws):
+            p = {stage: rng.betavariate(*_beta_params(profile[stage])) for stage in STAGES}
+            wins = 0
+            for _ in range(per_world):
+                fee = rng.random()
+                investigation = spread("investigation", rng.random())
+                chargesheet = spread("chargesheet", fee)
+                cost = spread("fixed_cost", fee)
+
+                if rng.random() >= p["fir"]:
+                    counts["firNotRegistered"] += 1
+                    duration = FIR_REFUSED_MONTHS
+                    cost *= FIR_REFUSED_COST_SHARE
+                elif rng.random() < p["settlement"]:
+                    counts["settlement"] += 1
+                    duration = investigation * (0.25 + 0.75 * fee)
+                elif rng.random() >= p["chargesheet"]:
+                    counts["closureReport"] += 1
+                    duration = investigation + chargesheet
+                else:
+                    prosecuted_count += 1
+                    bail_count += rng.random() < p["bail"]
+                    trial = profile["trial_median"] * math.exp(profile["trial_sigma"] * rng.gauss(0, 1))
+                    duration = investigation + chargesheet + trial
+                    cost += (
+                        trial * profile["hearings_per_month"] * spread("hearing_cost", fee)
+                        + spread("expert_cost", fee) + spread("bail_cost", fee)
+                    )
+                    if rng.random() < p["conviction"]:
+                        counts["conviction"] += 1
+                        wins += 1
+                    else:
+                        counts["acquittal"] += 1
+
+                durations.append(duration)
+                costs.append(cost)
+            win_by_world.append(wins / per_world)
+
+        win_low, win_high = _percentiles(win_by_world, (2.5, 97.5))
+        return _summary(
+            "python", trials,
+            sum(win_by_world) / draws, win_low, win_high,
+            {name: count / trials for name, count in counts.items()},
+            bail_count / max(prosecuted_count, 1),
+            (sum(durations) / trials,) + tuple(_percentiles(durations)),
+            (sum(costs) / trials,) + tuple(_percentiles(costs)),
+        )
@@ -0,0 +1,147 @@
+# app/services/police_stations.py - Nearest police station / cyber cell lookup
+
+"""
+Stations are loaded once from a JSON file into a KD-tree over 3-D unit
+vectors (lat/lon projected onto the sphere), so straight-line distance in
+the tree orders stations exactly like great-circle distance. A k-nearest
+query touches O(log n) leaves and stays well under a millisecond with
+tens of thousands of stations.
+"""
+
+import heapq
+import json
+import math
+import os
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from app.core.config import settings
+
+EARTH_RADIUS_KM = 6371.0088
+LEAF_SIZE = 8
+
+DEFAULT_STATIONS_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "police_stations.json")
+
+Point = Tuple[float, float, float]
+
+
+def _to_unit_vector(lat: float, lon: float) -> Point:
+    lat_r = math.radians(lat)
+    lon_r = math.radians(lon)
+    cos_lat = math.cos(lat_r)
+    return (cos_lat * math.cos(lon_r), cos_lat * math.sin(lon_r), math.sin(lat_r))
+
+
+def _chord_to_km(chord_sq: float) -> float:
+    """Squared chord length on the unit sphere -> great-circle distance"""
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(chord_sq) / 2))
+
+
+# =========================
+# KD-TREE
+# =========================
+class KDTree:
+    """Static 3-D KD-tree with bucketed leaves"""
+
+    def __init__(self, points: List[Point]):
+        self._points = points
+        self._root = self._build(list(range(len(points)))) if points else None
+
+    def _build(self, indices: List[int]):
+        if len(indices) <= LEAF_SIZE:
+            return indices  # Leaf: list of point indices
+
+        # Split on the axis with the widest spread
+        points = self._points
+        spreads = [
+            max(points[i][a] for i in indices) - min(points[i][a] for i in indices)
+            for a in range(3)
+        ]
+        axis = spreads.index(max(spreads))
+
+        indices.sort(key=lambda i: points[i][axis])
+        mid = len(indices) // 2
+        split = points[indices[mid]][axis]
+        return (axis, split, self._build(indices[:mid]), self._build(indices[mid:]))
+
+    def query(self, target: Point, k: int = 1) -> List[Tuple[float, int]]:
+        """k nearest points as (squared distance, index), closest first"""
+        if self._root is None or k <= 0:
+            return []
+
+        points = self._points
+        tx, ty, tz = target
+        heap: List[Tuple[float, int]] = []  # max-heap via negated distances
+
+        def search(node):
+            if isinstance(node, list):
+                for i in node:
+                    px, py, pz = points[i]
+                    d2 = (px - tx) ** 2 + (py - ty) ** 2 + (pz - tz) ** 2
+                    if len(heap) < k:
+                        heapq.heappush(heap, (-d2, i))
+                    elif d2 < -heap[0][0]:
+                        heapq.heapreplace(heap, (-d2, i))
+                return
+
+            axis, split, left, right = node
+            diff = target[axis] - split
+            near, far = (left, right) if diff < 0 else (right, left)
+            search(near)
+            if len(heap) < k or diff * diff < -heap[0][0]:
+                search(far)
+
+        search(self._root)
+        return sorted((-d2, i) for d2, i in heap)
+
+    def __len__(self) -> int:
+        return len(self._points)
+
+
+# =========================
+# LOCATOR
+# =========================
+class PoliceStationLocator:
+    """Nearest-station queries over the station dataset"""
+
+    def __init__(self, stations: List[Dict]):
+        self.stations = stations
+        self.cyber_cells = [s for s in stations if s.get("cyberCell")]
+        self._all = KDTree([_to_unit_vector(s["lat"], s["lon"]) for s in stations])
+        self._cyber = KDTree([_to_unit_vector(s["lat"], s["lon"]) for s in self.cyber_cells])
+
+    @classmethod
+    def from_file(cls, path: Optional[str] = None) -> "PoliceStationLocator":
+        path = path or settings.POLICE_STATIONS_PATH or DEFAULT_STATIONS_PATH
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        stations = data["stations"] if isinstance(data, dict) else data
+        print(f"🚓 Loaded {len(stations)} police stations from {os.path.basename(path)}")
+        return cls(stations)
+
+    def nearest(self, lat: float, lon: float, k: int = 3, cyber_only: bool = False) -> List[Dict]:
+        """k nearest stations (or cyber cells), closest first, with distanceKm"""
+        stations = self.cyber_cells if cyber_only else self.stations
+        tree = self._cyber if cyber_only else self._all
+
+        return [
+            {**stations[i], "distanceKm": round(_chord_to_km(d2), 2)}
+            for d2, i in tree.query(_to_unit_vector(lat, lon), k)
+        ]
+
+    def __len__(self) -> int:
+        return len(self.stations)
+
+
+_locator: Optional[PoliceStationLocator] = None
+_locator_lock = threading.Lock()
+
+
+def get_station_locator() -> PoliceStationLocator:
+    """Process-wide locator, built on first use"""
+    global _locator
+    if _locator is None:
+        with _locator_lock:
+            if _locator is None:
+                _locator = PoliceStationLocator.from_file()
+    return _locator
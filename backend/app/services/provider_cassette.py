@@ -0,0 +1,178 @@
+# app/services/provider_cassette.py - Record/replay of provider responses
+
+"""
+A cassette maps (provider, model, prompt hash) to the raw reply a provider
+gave: text exactly as received (malformed JSON included), usage, the error
+if the call failed, and the latency. PROVIDER_CASSETTE_MODE selects:
+
+  record - call providers as usual and store every reply
+  replay - never touch the network; the providers recorded in the cassette
+           answer from it, and a prompt that was never recorded fails like
+           a provider error (so the pipeline falls back as it would live)
+
+The cassette is one SQLite file with zlib-compressed reply text, so it can
+be copied from production to a benchmark or regression box.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Dict, List, Optional, Tuple
+
+from app.core.config import settings
+
+MODE_OFF = "off"
+MODE_RECORD = "record"
+MODE_REPLAY = "replay"
+MODES = (MODE_OFF, MODE_RECORD, MODE_REPLAY)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    provider TEXT NOT NULL,
+    model TEXT NOT NULL,
+    prompt_hash TEXT NOT NULL,
+    text BLOB,
+    usage TEXT NOT NULL,
+    error TEXT,
+    latency_ms REAL NOT NULL,
+    recorded_at REAL NOT NULL,
+    PRIMARY KEY (provider, model, prompt_hash)
+) WITHOUT ROWID;
+"""
+
+
+class CassetteMiss(LookupError):
+    """Replay mode: the prompt was never recorded for this provider"""
+
+
+class RecordedProviderError(RuntimeError):
+    """Replay of a call that failed when it was recorded"""
+
+
+def prompt_hash(system_prompt: str, prompt: str) -> str:
+    return hashlib.sha256(f"{system_prompt}\0{prompt}".encode("utf-8")).hexdigest()[:32]
+
+
+class ProviderCassette:
+    """SQLite store of raw provider replies"""
+
+    def __init__(self, path: Optional[str] = None, mode: str = MODE_RECORD):
+        if mode not in MODES:
+            raise ValueError(f"cassette mode must be one of {', '.join(MODES)}")
+        self.path = path or settings.PROVIDER_CASSETTE_PATH
+        self.mode = mode
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._local = threading.local()
+        self._connection().executescript(SCHEMA)
+
+    @property
+    def recording(self) -> bool:
+        return self.mode == MODE_RECORD
+
+    def _connection(self) -> sqlite3.Connection:
+        """One connection per thread"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def record(
+        self,
+        provider: str,
+        model: str,
+        key: str,
+        text: Optional[str],
+        usage: Dict,
+        error: Optional[str],
+        latency_ms: float
+    ):
+        """Store one reply (the latest recording of a prompt wins)"""
+        # Written inline: a provider call takes seconds, the insert well under a millisecond
+        conn = self._connection()
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    provider, model, key,
+                    zlib.compress(text.encode("utf-8")) if text is not None else None,
+                    json.dumps(usage or {}), error, latency_ms, time.time()
+                )
+            )
+
+    def lookup(self, provider: str, model: str, key: str) -> Optional[Dict]:
+        row = self._connection().execute(
+            "SELECT text, usage, error, latency_ms FROM responses WHERE provider = ? AND model = ? AND prompt_hash = ?",
+            (provider, model, key)
+        ).fetchone()
+        if row is None:
+            return None
+        return {
+            "text": zlib.decompress(row[0]).decode("utf-8") if row[0] is not None else None,
+            "usage": json.loads(row[1]),
+            "error": row[2],
+            "latency_ms": row[3],
+        }
+
+    def providers(self) -> List[Tuple[str, str]]:
+        """(provider, model) pairs with recordings"""
+        return [tuple(row) for row in self._connection().execute(
+            "SELECT DISTINCT provider, model FROM responses ORDER BY provider, model"
+        )]
+
+    def stats(self) -> Dict:
+        count, errors = self._connection().execute(
+            "SELECT COUNT(*), COUNT(error) FROM responses"
+        ).fetchone()
+        return {
+            "mode": self.mode,
+            "path": self.path,
+            "responses": count,
+            "errors": errors,
+            "bytes": os.path.getsize(self.path) if os.path.exists(self.path) else 0,
+        }
+
+
+class CassetteClient:
+    """Provider client for replay mode; complete() returns (text, usage) like _request_provider"""
+
+    def __init__(self, cassette: ProviderCassette, provider: str, model: str, replay_latency: bool = False):
+        self.cassette = cassette
+        self.provider = provider
+        self.model = model
+        self.replay_latency = replay_latency
+
+    def complete(self, system_prompt: str, prompt: str) -> Tuple[Optional[str], Dict]:
+        recorded = self.cassette.lookup(self.provider, self.model, prompt_hash(system_prompt, prompt))
+        if recorded is None:
+            raise CassetteMiss(f"No {self.provider} recording for this prompt")
+        if self.replay_latency:
+            time.sleep(recorded["latency_ms"] / 1000)
+        if recorded["error"]:
+            raise RecordedProviderError(recorded["error"])
+        return recorded["text"], recorded["usage"]
+
+
+_cassette: Optional[ProviderCassette] = None
+_cassette_lock = threading.Lock()
+
+
+def get_cassette() -> Optional[ProviderCassette]:
+    """Process-wide cassette (None when PROVIDER_CASSETTE_MODE is off)"""
+    global _cassette
+    if settings.PROVIDER_CASSETTE_MODE == MODE_OFF:
+        return None
+    if _cassette is None:
+        with _cassette_lock:
+            if _cassette is None:
+                _cassette = ProviderCassette(mode=settings.PROVIDER_CASSETTE_MODE)
+                print(f"📼 Provider cassette ({_cassette.mode}): {_cassette.path}")
+    return _cassette
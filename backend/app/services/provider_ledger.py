@@ -0,0 +1,269 @@
+# app/services/provider_ledger.py - Per-call provider telemetry
+
+"""
+Append-only ledger of AI provider calls: which provider and model answered,
+tokens used, estimated cost, latency, how the JSON reply was parsed
+(direct, repaired, salvaged or failed) and whether the reply was cut off
+at the token limit.
+
+Entries are queued and committed in batches by a background thread, so
+recording a call costs a queue put. The ledger is a SQLite file shared by
+all workers; aggregate() summarises it for /api/stats/providers.
+"""
+
+import atexit
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from app.core.batch_writer import BatchWriter
+from app.core.config import settings
+
+# Parse paths (see MultiProviderAnalyzer._parse_json)
+PARSE_DIRECT = "direct"
+PARSE_REPAIRED = "repaired"
+PARSE_SALVAGED = "salvaged"
+PARSE_FAILED = "failed"
+PARSE_PATHS = (PARSE_DIRECT, PARSE_REPAIRED, PARSE_SALVAGED, PARSE_FAILED)
+
+# USD per 1M (prompt, completion) tokens - list prices, check before budgeting.
+# Matched by model-name prefix, then by provider.
+MODEL_PRICING: List[Tuple[str, Tuple[float, float]]] = [
+    ("deepseek-chat", (0.27, 1.10)),
+    ("deepseek-reasoner", (0.55, 2.19)),
+    ("gpt-4o-mini", (0.15, 0.60)),
+    ("gpt-4o", (2.50, 10.00)),
+    ("models/gemini-2.0-flash", (0.10, 0.40)),
+    ("gemini-2.0-flash", (0.10, 0.40)),
+    ("claude-sonnet", (3.00, 15.00)),
+    ("claude-3-5-haiku", (0.80, 4.00)),
+]
+PROVIDER_PRICING: Dict[str, Tuple[float, float]] = {
+    "deepseek": (0.27, 1.10),
+    "openai": (0.15, 0.60),
+    "gemini": (0.10, 0.40),
+    "anthropic": (3.00, 15.00),
+}
+
+CHARS_PER_TOKEN = 4   # Token estimate when a provider reports no usage
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS provider_calls (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    created_at REAL NOT NULL,
+    provider TEXT NOT NULL,
+    model TEXT NOT NULL,
+    prompt_tokens INTEGER NOT NULL,
+    completion_tokens INTEGER NOT NULL,
+    tokens_estimated INTEGER NOT NULL,
+    cost_usd REAL NOT NULL,
+    latency_ms REAL NOT NULL,
+    parse_path TEXT NOT NULL,
+    truncated INTEGER NOT NULL,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS provider_calls_created ON provider_calls (created_at);
+"""
+
+COLUMNS = (
+    "created_at", "provider", "model", "prompt_tokens", "completion_tokens", "tokens_estimated",
+    "cost_usd", "latency_ms", "parse_path", "truncated", "error"
+)
+
+
+def estimate_tokens(text: Optional[str]) -> int:
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN if text else 0
+
+
+def estimate_cost(provider: str, model: str, prompt_tokens: int, completion_tokens: int) -> float:
+    """Estimated USD cost of one call"""
+    prices = next((p for prefix, p in MODEL_PRICING if model.startswith(prefix)), None)
+    if prices is None:
+        prices = PROVIDER_PRICING.get(provider, (0.0, 0.0))
+    return (prompt_tokens * prices[0] + completion_tokens * prices[1]) / 1_000_000
+
+
+def _percentile(sorted_values: List[float], q: float) -> Optional[float]:
+    if not sorted_values:
+        return None
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+class ProviderLedger:
+    """SQLite ledger of provider calls with a batched background writer"""
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        batch_size: Optional[int] = None,
+        flush_interval: Optional[float] = None
+    ):
+        self.path = path or settings.PROVIDER_LEDGER_PATH
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._local = threading.local()
+        self._connection().executescript(SCHEMA)
+        self._writer = BatchWriter(
+            self._write_batch,
+            batch_size or settings.PROVIDER_LEDGER_BATCH,
+            flush_interval if flush_interval is not None else settings.PROVIDER_LEDGER_FLUSH_INTERVAL,
+            name="provider-ledger-writer"
+        )
+
+    def _connection(self) -> sqlite3.Connection:
+        """One connection per thread"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    # =========================
+    # WRITES
+    # =========================
+    def record(
+        self,
+        provider: str,
+        model: str,
+        prompt_tokens: int,
+        completion_tokens: int,
+        latency_ms: float,
+        parse_path: str,
+        truncated: bool = False,
+        tokens_estimated: bool = False,
+        error: Optional[str] = None
+    ) -> Dict:
+        """Queue one call for the ledger; returns the entry"""
+        entry = {
+            "created_at": time.time(),
+            "provider": provider,
+            "model": model,
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "tokens_estimated": int(tokens_estimated),
+            "cost_usd": estimate_cost(provider, model, prompt_tokens, completion_tokens),
+            "latency_ms": round(latency_ms, 1),
+            "parse_path": parse_path,
+            "truncated": int(truncated),
+            "error": error,
+        }
+        self._writer.put(entry)
+        return entry
+
+    def flush(self):
+        """Block until every queued entry is committed"""
+        self._writer.flush()
+
+    def close(self):
+        self._writer.close()
+
+    def _write_batch(self, entries: List[Dict]):
+        conn = self._connection()
+        try:
+            with conn:
+                conn.executemany(
+                    f"INSERT INTO provider_calls ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))})",
+                    [tuple(entry[column] for column in COLUMNS) for entry in entries]
+                )
+        except sqlite3.Error as e:
+            print(f"❌ Provider ledger write failed ({len(entries)} entries): {e}")
+
+    # =========================
+    # READS
+    # =========================
+    def aggregate(self, since: Optional[float] = None) -> Dict:
+        """Per provider/model totals for calls made after `since` (epoch seconds)"""
+        since = since or 0.0
+        conn = self._connection()
+        rows = conn.execute(
+            """
+            SELECT provider, model, COUNT(*), SUM(error IS NOT NULL),
+                   SUM(prompt_tokens), SUM(completion_tokens), SUM(tokens_estimated),
+                   SUM(cost_usd), AVG(latency_ms), SUM(truncated)
+            FROM provider_calls WHERE created_at >= ?
+            GROUP BY provider, model ORDER BY COUNT(*) DESC
+            """,
+            (since,)
+        ).fetchall()
+
+        parse_counts: Dict[Tuple[str, str], Dict[str, int]] = {}
+        for provider, model, path, count in conn.execute(
+            """
+            SELECT provider, model, parse_path, COUNT(*) FROM provider_calls
+            WHERE created_at >= ? GROUP BY provider, model, parse_path
+            """,
+            (since,)
+        ):
+            parse_counts.setdefault((provider, model), {})[path] = count
+
+        latencies: Dict[Tuple[str, str], List[float]] = {}
+        for provider, model, latency in conn.execute(
+            """
+            SELECT provider, model, latency_ms FROM provider_calls
+            WHERE created_at >= ? AND error IS NULL ORDER BY latency_ms
+            """,
+            (since,)
+        ):
+            latencies.setdefault((provider, model), []).append(latency)
+
+        providers = []
+        for provider, model, calls, errors, prompt, completion, estimated, cost, avg_latency, truncated in rows:
+            key = (provider, model)
+            ordered = latencies.get(key, [])
+            providers.append({
+                "provider": provider,
+                "model": model,
+                "calls": calls,
+                "errors": errors,
+                "promptTokens": prompt,
+                "completionTokens": completion,
+                "estimatedTokenCalls": estimated,
+                "costUsd": round(cost, 6),
+                "latencyMs": {
+                    "mean": round(avg_latency, 1),
+                    "p50": _percentile(ordered, 0.50),
+                    "p95": _percentile(ordered, 0.95),
+                },
+                "parse": {path: parse_counts.get(key, {}).get(path, 0) for path in PARSE_PATHS},
+                "truncated": truncated,
+            })
+
+        return {
+            "since": since,
+            "calls": sum(p["calls"] for p in providers),
+            "costUsd": round(sum(p["costUsd"] for p in providers), 6),
+            "providers": providers,
+            "pending": self._writer.pending,
+        }
+
+    def entries(self, limit: int = 50) -> List[Dict]:
+        """Most recent calls, newest first"""
+        cursor = self._connection().execute(
+            f"SELECT id, {', '.join(COLUMNS)} FROM provider_calls ORDER BY id DESC LIMIT ?", (limit,)
+        )
+        names = ("id",) + COLUMNS
+        return [dict(zip(names, row)) for row in cursor]
+
+
+_ledger: Optional[ProviderLedger] = None
+_ledger_lock = threading.Lock()
+
+
+def get_provider_ledger() -> Optional[ProviderLedger]:
+    """Process-wide ledger (None when PROVIDER_LEDGER_ENABLED is off)"""
+    global _ledger
+    if not settings.PROVIDER_LEDGER_ENABLED:
+        return None
+    if _ledger is None:
+        with _ledger_lock:
+            if _ledger is None:
+                _ledger = ProviderLedger()
+                atexit.register(_ledger.close)
+                print(f"📒 Provider ledger: {_ledger.path}")
+    return _ledger
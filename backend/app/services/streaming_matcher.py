@@ -0,0 +1,215 @@
+# app/services/streaming_matcher.py - Long-document mode for multi-page complaints
+
+"""
+Incremental keyword matcher for long complaint drafts.
+
+Text is fed in chunks of any size. Completed passages (sentences or
+paragraphs) are scored against every keyword the pipeline cares about and
+only the best few are kept, so memory stays bounded and each character is
+scanned once. The selected passages become the description that the
+classifier, matcher, validator and LLM prompt see.
+
+Safety phrases are not relevance keywords, so every passage is also checked
+for illegal intent as it completes; the first hit is returned in the digest
+(a passage that is dropped from the digest is still refused).
+"""
+
+import codecs
+import heapq
+import re
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+from app.core.config import settings
+from app.core.keyword_engine import compile_keywords
+from app.core.safety import ILLEGAL_INTENT
+from app.data.legal_rules import IPC_420_RULES
+from app.services.classifier import CrimeClassifier
+from app.services.keyword_matcher import KeywordMatcher
+from app.services.validator import SectionValidator
+
+# Sentence/paragraph boundaries (including the Devanagari danda)
+PASSAGE_BOUNDARY = re.compile(r"[.!?।\n]+")
+
+
+class DocumentTooLarge(ValueError):
+    """Raised when a document exceeds MAX_DOCUMENT_BYTES"""
+
+
+def _relevance_keywords() -> List[str]:
+    """Every keyword any pipeline stage reacts to"""
+    keywords = []
+    for pattern in CrimeClassifier.CRIME_PATTERNS.values():
+        keywords.extend(pattern["keywords"])
+    for mappings in KeywordMatcher.SECTION_MAPPINGS.values():
+        for section_data in mappings:
+            keywords.extend(section_data["keywords"])
+            keywords.extend(section_data.get("exclusion_keywords", []))
+    for rules in SectionValidator.SECTION_REQUIREMENTS.values():
+        keywords.extend(rules["required"])
+        keywords.extend(rules["blocking"])
+    keywords.extend(SectionValidator.DIGITAL_CONTEXT)
+    keywords.extend(SectionValidator.PHYSICAL_CONTEXT)
+    for element in IPC_420_RULES["essential_elements"].values():
+        keywords.extend(element["keywords"])
+        keywords.extend(element["anti_keywords"])
+    for disqualifier in IPC_420_RULES["disqualifiers"]:
+        keywords.extend(disqualifier["indicators"])
+    return keywords
+
+
+RELEVANCE_KEYWORDS = compile_keywords("document.relevance", _relevance_keywords())
+
+
+class StreamingMatcher:
+    """
+    Scores passages as they complete and keeps the top candidates.
+    State carried between chunks is only the unfinished passage.
+    """
+
+    def __init__(
+        self,
+        digest_chars: Optional[int] = None,
+        max_passage_chars: int = 500,
+        max_candidates: int = 32,
+        max_bytes: Optional[int] = None
+    ):
+        self.digest_chars = digest_chars or settings.DOCUMENT_DIGEST_CHARS
+        self.max_passage_chars = max_passage_chars
+        self.max_candidates = max_candidates
+        self.max_bytes = max_bytes or settings.MAX_DOCUMENT_BYTES
+
+        # A keyword (or safety phrase) straddling a forced split is still seen by the left passage
+        self._overlap = max(RELEVANCE_KEYWORDS.max_length - 1, ILLEGAL_INTENT.max_length - 1, 0)
+
+        self._decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        self._pending = ""
+        self._lead: Optional[Tuple[int, str]] = None
+        self._candidates: List[Tuple[int, int, str]] = []  # min-heap of (score, -index, text)
+        self._keyword_counts: Counter = Counter()
+        self._passages = 0
+        self.illegal_intent: Optional[str] = None   # First safety phrase seen anywhere in the document
+        self.bytes_read = 0
+        self.chars_read = 0
+
+    # =========================
+    # FEEDING
+    # =========================
+    def feed_bytes(self, chunk: bytes):
+        """Feed raw UTF-8 bytes (e.g. from a request body stream)"""
+        self.bytes_read += len(chunk)
+        if self.bytes_read > self.max_bytes:
+            raise DocumentTooLarge(f"Document exceeds {self.max_bytes} bytes")
+        self.feed(self._decoder.decode(chunk))
+
+    def feed(self, text: str):
+        """Feed decoded text"""
+        if not text:
+            return
+        self.chars_read += len(text)
+        self._pending += text
+
+        # Flush every completed passage
+        last_boundary = None
+        for last_boundary in PASSAGE_BOUNDARY.finditer(self._pending):
+            pass
+        if last_boundary is not None:
+            completed = self._pending[:last_boundary.end()]
+            self._pending = self._pending[last_boundary.end():]
+            start = 0
+            for boundary in PASSAGE_BOUNDARY.finditer(completed):
+                self._score_passage(completed[start:boundary.end()])
+                start = boundary.end()
+
+        # Run-on text with no punctuation: split it, keeping an overlap window.
+        # Walk an offset and drop the consumed text once, not per passage.
+        offset = 0
+        split = self.max_passage_chars
+        while len(self._pending) - offset >= split + self._overlap:
+            self._score_passage(
+                self._pending[offset:offset + split],
+                scan_text=self._pending[offset:offset + split + self._overlap]
+            )
+            offset += split
+        if offset:
+            self._pending = self._pending[offset:]
+
+    def _score_passage(self, passage: str, scan_text: Optional[str] = None):
+        passage = passage.strip()
+        if not passage:
+            return
+
+        index = self._passages
+        self._passages += 1
+
+        scan_lower = (passage if scan_text is None else scan_text).lower()
+        if self.illegal_intent is None:
+            self.illegal_intent = ILLEGAL_INTENT.first(scan_lower)
+
+        if scan_text is None:
+            hits = list(RELEVANCE_KEYWORDS.occurrences(scan_lower))
+        else:
+            # Only count keywords that start inside this passage
+            leading = len(scan_text) - len(scan_text.lstrip())
+            hits = list(RELEVANCE_KEYWORDS.occurrences(scan_lower, limit=leading + len(passage)))
+        self._keyword_counts.update(hits)
+
+        if len(passage) > self.max_passage_chars:
+            passage = passage[:self.max_passage_chars]
+
+        # The opening passage usually states what happened - always keep it
+        if self._lead is None:
+            self._lead = (len(set(hits)), passage)
+            return
+
+        entry = (len(set(hits)), -index, passage)
+        if len(self._candidates) < self.max_candidates:
+            heapq.heappush(self._candidates, entry)
+        elif entry > self._candidates[0]:
+            heapq.heapreplace(self._candidates, entry)
+
+    # =========================
+    # RESULT
+    # =========================
+    def finish(self) -> Dict:
+        """Flush remaining text and build the digest"""
+        tail = self._decoder.decode(b"", final=True)
+        if tail:
+            self.feed(tail)
+        if self._pending:
+            self._score_passage(self._pending)
+            self._pending = ""
+
+        selected: List[Tuple[int, str]] = []
+        budget = self.digest_chars
+        if self._lead is not None:
+            selected.append((0, self._lead[1][:budget]))
+            budget -= len(selected[0][1])
+
+        # Best passages first; passages with no keywords are left out
+        for score, neg_index, passage in sorted(self._candidates, reverse=True):
+            if budget <= 0 or score == 0:
+                break
+            if len(passage) + 1 > budget:
+                continue
+            selected.append((-neg_index, passage))
+            budget -= len(passage) + 1
+
+        selected.sort()
+        return {
+            "text": "\n".join(passage for _, passage in selected),
+            "chars_read": self.chars_read,
+            "bytes_read": self.bytes_read,
+            "passages_scanned": self._passages,
+            "passages_selected": len(selected),
+            "illegal_intent": self.illegal_intent,
+            "keyword_counts": dict(self._keyword_counts.most_common(25))
+        }
+
+
+def condense_document(text: str, chunk_size: int = 8192) -> Dict:
+    """Run an in-memory long description through the streaming matcher"""
+    matcher = StreamingMatcher()
+    for start in range(0, len(text), chunk_size):
+        matcher.feed(text[start:start + chunk_size])
+    return matcher.finish()
@@ -9,6 +9,7 @@ from app.data.legal_rules import (
     IPC_420_RULES,
     LegalDomain
 )
+from app.core.rule_stats import rule_stats, REQUIREMENT_KEYWORD, BLOCKER
 
 class SectionValidator:
     """
@@ -214,14 +215,18 @@ class SectionValidator:
                 # Check blocking keywords (these override everything)
                 has_blocker = any(kw in desc_lower for kw in rules["blocking"])
                 if has_blocker:
-                    blocker_found = [kw for kw in rules["blocking"] if kw in desc_lower][0]
+                    blockers_found = [kw for kw in rules["blocking"] if kw in desc_lower]
+                    rule_stats.hits(BLOCKER, section_code, blockers_found)
+                    blocker_found = blockers_found[0]
                     warnings.append(f"{section_code} removed: {rules['description']}. Found '{blocker_found}' which doesn't match this section")
                     removed_sections.append(f"{section_code} (blocker: {blocker_found})")
                     print(f"   ❌ {section_code} - Blocked by keyword '{blocker_found}'")
                     continue
                 
                 # Check required keywords
-                has_required = any(kw in desc_lower for kw in rules["required"])
+                required_found = [kw for kw in rules["required"] if kw in desc_lower]
+                rule_stats.hits(REQUIREMENT_KEYWORD, section_code, required_found)
+                has_required = bool(required_found)
                 
                 # 🆕 For IPC 420, check if ALL required keywords needed
                 if rules.get("required_all") and section_code == "IPC 420":
@@ -265,4 +270,14 @@ class SectionValidator:
             "asset_context": asset_context,
             "removed_count": len(removed_sections),
             "money_classification": money_classification  # 🆕 Include money dispute type
-        }
\ No newline at end of file
+        }
+
+
+rule_stats.register(
+    REQUIREMENT_KEYWORD,
+    {code: rules["required"] for code, rules in SectionValidator.SECTION_REQUIREMENTS.items()}
+)
+rule_stats.register(
+    BLOCKER,
+    {code: rules["blocking"] for code, rules in SectionValidator.SECTION_REQUIREMENTS.items()}
+)
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Per-request CPU time of the premium document generators.
+
+    python benchmarks/bench_documents.py
+    python benchmarks/bench_documents.py --iterations 5000 --sections 4
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.models.section import LegalSection
+from app.services.document_generator import DocumentGenerator, FIR_LANGUAGES
+
+SAMPLE_DESCRIPTION = (
+    "Someone hacked my bank account and transferred Rs 50,000 without my permission. "
+    "I received an OTP message I did not request and the money was gone within minutes. "
+) * 8
+
+
+def _sample_sections(count: int):
+    return [
+        LegalSection(
+            code=f"IPC {420 + i}",
+            title=f"Sample Offense {i}",
+            description="Dishonestly inducing delivery of property by deception " * 3,
+            punishment="Up to 7 years imprisonment and fine",
+            bailable=False,
+            cognizable=True,
+            confidence=0.85,
+            reasoning="Sample",
+            key_factors=["fraud", "deception"]
+        )
+        for i in range(count)
+    ]
+
+
+def _measure(label: str, fn, iterations: int):
+    fn()  # warm-up
+    cpu_start = time.process_time()
+    wall_start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    cpu = (time.process_time() - cpu_start) / iterations
+    wall = (time.perf_counter() - wall_start) / iterations
+    print(f"{label:<32} {cpu * 1e6:>10.1f} µs CPU {wall * 1e6:>10.1f} µs wall")
+    return cpu
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark document generation")
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--sections", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    generator = DocumentGenerator()
+    sections = _sample_sections(args.sections)
+    case_details = {
+        "description": SAMPLE_DESCRIPTION,
+        "incident_date": "2024-01-01",
+        "incident_time": "[Time of incident]",
+        "incident_place": "[Location of incident]"
+    }
+
+    print(f"📊 Document generation ({args.iterations} iterations, {args.sections} sections)\n")
+
+    all_languages = _measure(
+        "FIR (all languages)",
+        lambda: generator.generate_fir_draft(case_details, sections),
+        args.iterations
+    )
+    for language in FIR_LANGUAGES:
+        _measure(
+            f"FIR ({language})",
+            lambda language=language: generator.generate_fir_draft(case_details, sections, languages=[language]),
+            args.iterations
+        )
+    single = _measure(
+        "FIR (english) + complaint",
+        lambda: (
+            generator.generate_fir_draft(case_details, sections, languages=["english"]),
+            generator.generate_written_complaint(case_details, sections)
+        ),
+        args.iterations
+    )
+    _measure(
+        "Evidence checklist",
+        lambda: generator.generate_evidence_checklist(sections, "cyber_crime"),
+        args.iterations
+    )
+
+    print(f"\n✅ Single-language FIR + complaint uses {single / all_languages:.0%} of the all-language FIR CPU time")
+
+
+if __name__ == "__main__":
+    main()
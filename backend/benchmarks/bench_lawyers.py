@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Lawyer matching over a synthetic directory, indexed vs. scoring every lawyer.
+
+    python benchmarks/bench_lawyers.py
+    python benchmarks/bench_lawyers.py --lawyers 100000 --queries 500
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.data.practice_areas import CASE_TYPE_MAPPING, PRACTICE_AREA_MAPPING
+from app.services.lawyer_matcher import DEFAULT_LAWYERS_PATH, LawyerMatcher, _tiebreak, score_lawyer
+
+LOCATIONS = ("Mumbai", "Delhi", "Bangalore", "Chennai", "Kolkata", "Hyderabad", "Pune", "Lucknow", "Jaipur")
+
+
+def _synthetic_lawyers(count: int, rng: random.Random):
+    """Variations of the real directory, spread over many cities"""
+    with open(DEFAULT_LAWYERS_PATH, encoding="utf-8") as f:
+        seeds = json.load(f)["lawyers"]
+    # A few big cities and a long tail of towns
+    cities = [(city, f"State {i}") for i, city in enumerate(LOCATIONS)]
+    cities += [(f"Town {i:04d}", f"State {i % 30}") for i in range(2000)]
+    weights = [2000] * len(LOCATIONS) + [10] * 2000
+
+    lawyers = []
+    for i in range(count):
+        seed = rng.choice(seeds)
+        city, state = rng.choices(cities, weights)[0]
+        lawyers.append({
+            **seed,
+            "id": f"lawyer-{i:06d}",
+            "city": city,
+            "state": state,
+            "yearsOfPractice": rng.randint(1, 35),
+            "rating": round(rng.uniform(3.5, 5.0), 1),
+            "successRate": rng.randint(60, 98),
+            "totalCases": rng.randint(20, 900),
+            "verified": rng.random() < 0.7,
+            "active": rng.random() < 0.95,
+        })
+    return lawyers
+
+
+def _brute_force(lawyers, sections, case_type, location, limit):
+    scored = []
+    for i, lawyer in enumerate(lawyers):
+        if not lawyer.get("active"):
+            continue
+        score = score_lawyer(lawyer, sections, case_type, location)[0]
+        if score >= 20:
+            scored.append((-score, _tiebreak(lawyer), i))
+    return [lawyers[i]["id"] for _, _, i in sorted(scored)[:limit]]
+
+
+def _measure(label: str, fn, queries):
+    start = time.perf_counter()
+    for query in queries:
+        fn(*query)
+    per_query = (time.perf_counter() - start) / len(queries)
+    print(f"{label:<32} {per_query * 1e6:>10.1f} µs/query")
+    return per_query
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark lawyer matching")
+    parser.add_argument("--lawyers", type=int, default=100000)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--verify", type=int, default=20, help="queries checked against brute force")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    lawyers = _synthetic_lawyers(args.lawyers, rng)
+    codes = list(PRACTICE_AREA_MAPPING)
+    queries = [
+        (
+            [(code, i == 0) for i, code in enumerate(rng.sample(codes, rng.randint(1, 3)))],
+            rng.choice(list(CASE_TYPE_MAPPING)),
+            rng.choice((rng.choice(LOCATIONS), f"Town {rng.randrange(2000):04d}")) if rng.random() < 0.7 else None,
+        )
+        for _ in range(args.queries)
+    ]
+
+    print(f"📊 Lawyer matching ({args.lawyers} lawyers, {args.queries} queries)\n")
+
+    start = time.perf_counter()
+    matcher = LawyerMatcher(lawyers)
+    print(f"{'Build index':<32} {(time.perf_counter() - start) * 1e3:>10.1f} ms")
+
+    _measure("Match (cold area cache)", lambda s, c, l: matcher.match(s, c, l), queries[:50])
+    _measure("Match (limit=5)", lambda s, c, l: matcher.match(s, c, l), queries)
+    _measure("Match (limit=20)", lambda s, c, l: matcher.match(s, c, l, limit=20), queries)
+    _measure("Match (language=Marathi)", lambda s, c, l: matcher.match(s, c, l, language="Marathi"), queries)
+    _measure(
+        "Brute force (limit=5)",
+        lambda s, c, l: _brute_force(lawyers, s, c, l, 5),
+        queries[:max(1, args.verify)]
+    )
+
+    mismatches = 0
+    for sections, case_type, location in queries[:args.verify]:
+        expected = _brute_force(lawyers, sections, case_type, location, 5)
+        actual = [lawyer["id"] for lawyer in matcher.match(sections, case_type, location)]
+        mismatches += expected != actual
+
+    print(f"\n✅ {args.verify} queries checked against brute force: {mismatches} mismatches")
+
+
+if __name__ == "__main__":
+    main()
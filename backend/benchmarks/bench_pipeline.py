@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+Analysis pipeline benchmarks: every stage on its own and end-to-end, over the
+synthetic corpus (benchmarks/corpus.py). No provider is ever called.
+
+Results are written as JSON; --compare flags benchmarks whose median (in
+the fastest round) got slower than a previous run by more than --threshold
+(exit code 1).
+
+    python benchmarks/bench_pipeline.py
+    python benchmarks/bench_pipeline.py --rounds 5 -o baseline.json
+    python benchmarks/bench_pipeline.py --compare baseline.json --threshold 0.15
+    python benchmarks/bench_pipeline.py --only classify,match
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from statistics import mean
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from corpus import build_corpus, ai_responses
+
+from app.core.config import settings
+
+# Spans would add exporter I/O to every measured call
+settings.TRACING_ENABLED = False
+
+from app.core.rule_version import rule_version
+from app.services.classifier import CrimeClassifier
+from app.services.keyword_matcher import KeywordMatcher
+from app.services.validator import SectionValidator
+from app.services.action_plan_generator import ActionPlanGenerator
+from app.services.document_generator import DocumentGenerator
+
+DEFAULT_OUTPUT_DIR = os.path.join(".cache", "benchmarks")
+
+
+@contextlib.contextmanager
+def _quiet():
+    """The services print (and log) per-request diagnostics"""
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull), contextlib.redirect_stderr(devnull):
+        yield
+
+
+def _percentile(sorted_values, fraction: float) -> float:
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def _summary(timings_us, round_p50s):
+    ordered = sorted(timings_us)
+    return {
+        "n": len(ordered),
+        "bestRoundP50Us": round(min(round_p50s), 2),   # Least disturbed by other load; used by --compare
+        "meanUs": round(mean(ordered), 2),
+        "p50Us": round(_percentile(ordered, 0.50), 2),
+        "p95Us": round(_percentile(ordered, 0.95), 2),
+        "maxUs": round(ordered[-1], 2),
+    }
+
+
+def _measure(label: str, fn, inputs, rounds: int, group=None):
+    """Time fn(*item) for every item, `rounds` times; returns the summary (+ per-group medians)"""
+    with _quiet():
+        fn(*inputs[0])  # warm-up
+    timings = []
+    round_p50s = []
+    groups = {}
+    with _quiet():
+        for _ in range(rounds):
+            round_timings = []
+            for item in inputs:
+                start = time.perf_counter_ns()
+                fn(*item)
+                elapsed = (time.perf_counter_ns() - start) / 1000
+                round_timings.append(elapsed)
+                if group is not None:
+                    groups.setdefault(group(item), []).append(elapsed)
+            round_p50s.append(_percentile(sorted(round_timings), 0.5))
+            timings.extend(round_timings)
+
+    result = _summary(timings, round_p50s)
+    if groups:
+        result["groupP50Us"] = {name: round(_percentile(sorted(values), 0.5), 2) for name, values in sorted(groups.items())}
+    print(f"{label:<36} {result['p50Us']:>10.1f} µs p50 {result['p95Us']:>10.1f} µs p95 {result['meanUs']:>10.1f} µs mean")
+    return result
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=5
+        ).stdout.strip()
+    except OSError:
+        return ""
+
+
+def run(rounds: int, seed: int, only=None):
+    cases = build_corpus(seed)
+    classifier = CrimeClassifier()
+    keyword_matcher = KeywordMatcher()
+    validator = SectionValidator()
+    action_plans = ActionPlanGenerator()
+    memoized_documents = DocumentGenerator()
+    documents = DocumentGenerator(memo_size=0)   # Render every time
+
+    # Stage inputs: each stage gets the previous stages' real output
+    with _quiet():
+        prepared = []
+        for case in cases:
+            classification = classifier.classify_case(case["description"])
+            sections = keyword_matcher.match_sections(case["description"], classification)
+            prepared.append((case, classification, sections))
+    with_sections = [p for p in prepared if p[2]]
+
+    def by_length(item):
+        return item[0]["length"]
+
+    case_details = lambda case: {
+        "description": case["description"],
+        "incident_date": "[Date of incident]",
+        "incident_time": "[Time of incident]",
+        "incident_place": "[Location of incident]",
+    }
+    user = {"name": "[Name]", "address": "[Address]", "phone": "[Phone]"}
+    recipient = {"name": "[Recipient]", "address": "[Recipient Address]"}
+
+    benchmarks = {
+        "classify": (
+            lambda case, c, s: classifier.classify_case(case["description"]), prepared, by_length),
+        "match": (
+            lambda case, c, s: keyword_matcher.match_sections(case["description"], c), prepared, by_length),
+        "validate": (
+            lambda case, c, s: validator.validate_sections(case["description"], s, c), prepared, by_length),
+        "action_plan": (
+            lambda case, c, s: action_plans.generate_action_plan(case["description"], s, c.category, False),
+            prepared, by_length),
+        "documents.fir_all_languages": (
+            lambda case, c, s: documents.generate_fir_draft(case_details(case), s), with_sections, by_length),
+        "documents.fir_english": (
+            lambda case, c, s: documents.generate_fir_draft(case_details(case), s, languages=["english"]),
+            with_sections, by_length),
+        "documents.fir_memoized": (
+            lambda case, c, s: memoized_documents.generate_fir_draft(case_details(case), s), with_sections, by_length),
+        "documents.written_complaint": (
+            lambda case, c, s: documents.generate_written_complaint(case_details(case), s), with_sections, by_length),
+        "documents.evidence_checklist": (
+            lambda case, c, s: documents.generate_evidence_checklist(s, c.category), with_sections, None),
+        "documents.affidavit": (
+            lambda case, c, s: documents.generate_affidavit(user, case["description"]), with_sections, by_length),
+        "documents.legal_notice": (
+            lambda case, c, s: documents.generate_legal_notice(user, recipient, "Return of Rs [amount]", s),
+            with_sections, None),
+    }
+
+    # _safe_json_parse and the end-to-end runs need the analyzer module (providers stay unused)
+    with _quiet():
+        from app.routers import analyze
+
+    for path, text in ai_responses().items():
+        benchmarks[f"json_parse.{path}"] = (
+            lambda text: analyze.hybrid_analyzer._safe_json_parse(text), [(text,)] * 200, None)
+
+    guest = [(analyze.AnalyzeCaseRequest(description=case["description"]), case) for case in cases]
+    member = [
+        (analyze.AnalyzeCaseRequest(description=case["description"], is_authenticated=True, user_id="bench"), case)
+        for case in cases
+    ]
+    benchmarks["end_to_end.guest"] = (
+        lambda request, case: analyze.run_analysis(request, keyword_only=True), guest, lambda item: item[1]["length"])
+    benchmarks["end_to_end.authenticated"] = (
+        lambda request, case: analyze.run_analysis(request, keyword_only=True), member, lambda item: item[1]["length"])
+
+    print(f"📊 Pipeline benchmarks ({len(cases)} cases, {rounds} rounds)\n")
+    results = {}
+    for name, (fn, inputs, group) in benchmarks.items():
+        if only and not any(name == o or name.startswith(o + ".") for o in only):
+            continue
+        results[name] = _measure(name, fn, inputs, rounds, group)
+
+    return {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "commit": _git_commit(),
+            "ruleVersion": rule_version(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cases": len(cases),
+            "rounds": rounds,
+            "seed": seed,
+        },
+        "benchmarks": results,
+    }
+
+
+def compare(current, baseline, threshold: float) -> int:
+    """Print best-round p50 changes against a previous run; returns the number of regressions"""
+    print(f"\n📈 Compared with {baseline['meta'].get('commit') or '?'} ({baseline['meta'].get('timestamp')})\n")
+    regressions = 0
+    for name, result in current["benchmarks"].items():
+        before = baseline["benchmarks"].get(name)
+        if not before or not before.get("bestRoundP50Us"):
+            print(f"{name:<36} {'(new)':>10}")
+            continue
+        change = result["bestRoundP50Us"] / before["bestRoundP50Us"] - 1
+        flag = ""
+        if change > threshold:
+            flag = "  ❌ regression"
+            regressions += 1
+        elif change < -threshold:
+            flag = "  ✅ faster"
+        print(f"{name:<36} {before['bestRoundP50Us']:>10.1f} -> {result['bestRoundP50Us']:>10.1f} µs {change:>+8.1%}{flag}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the analysis pipeline")
+    parser.add_argument("--rounds", type=int, default=5, help="passes over the corpus per benchmark")
+    parser.add_argument("--seed", type=int, default=7, help="corpus seed")
+    parser.add_argument("--only", help="comma-separated benchmark names or prefixes (e.g. classify,documents)")
+    parser.add_argument("-o", "--output", help=f"results JSON (default: {DEFAULT_OUTPUT_DIR}/pipeline-<time>.json)")
+    parser.add_argument("--compare", help="previous results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10, help="best-round p50 slowdown counted as a regression")
+    args = parser.parse_args(argv)
+
+    only = [name.strip() for name in args.only.split(",")] if args.only else None
+    results = run(args.rounds, args.seed, only)
+
+    output = args.output or os.path.join(
+        DEFAULT_OUTPUT_DIR, f"pipeline-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
+    )
+    directory = os.path.dirname(output)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print(f"\n💾 Results written to {output}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n❌ {regressions} benchmark(s) slower than the baseline by more than {args.threshold:.0%}")
+            sys.exit(1)
+        print(f"\n✅ No regressions above {args.threshold:.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Nearest police station lookup over a synthetic nationwide dataset.
+
+    python benchmarks/bench_police_stations.py
+    python benchmarks/bench_police_stations.py --stations 100000 --queries 5000
+"""
+
+import argparse
+import math
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.police_stations import EARTH_RADIUS_KM, PoliceStationLocator
+
+# Rough bounding box of India
+LAT_RANGE = (8.0, 35.0)
+LON_RANGE = (68.0, 97.0)
+
+
+def _synthetic_stations(count: int, rng: random.Random):
+    return [
+        {
+            "name": f"Station {i}",
+            "lat": rng.uniform(*LAT_RANGE),
+            "lon": rng.uniform(*LON_RANGE),
+            "cyberCell": i % 50 == 0
+        }
+        for i in range(count)
+    ]
+
+
+def _haversine_km(lat1, lon1, lat2, lon2):
+    p1, p2 = math.radians(lat1), math.radians(lat2)
+    dp, dl = p2 - p1, math.radians(lon2 - lon1)
+    a = math.sin(dp / 2) ** 2 + math.cos(p1) * math.cos(p2) * math.sin(dl / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+
+def _brute_force(stations, lat, lon, k):
+    return sorted(stations, key=lambda s: _haversine_km(lat, lon, s["lat"], s["lon"]))[:k]
+
+
+def _measure(label: str, fn, queries):
+    start = time.perf_counter()
+    for lat, lon in queries:
+        fn(lat, lon)
+    per_query = (time.perf_counter() - start) / len(queries)
+    print(f"{label:<32} {per_query * 1e6:>10.1f} µs/query")
+    return per_query
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark nearest police station lookup")
+    parser.add_argument("--stations", type=int, default=50000)
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--verify", type=int, default=50, help="queries checked against brute force")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    stations = _synthetic_stations(args.stations, rng)
+    queries = [(rng.uniform(*LAT_RANGE), rng.uniform(*LON_RANGE)) for _ in range(args.queries)]
+
+    print(f"📊 Police station lookup ({args.stations} stations, {args.queries} queries)\n")
+
+    start = time.perf_counter()
+    locator = PoliceStationLocator(stations)
+    print(f"{'Build index':<32} {(time.perf_counter() - start) * 1e3:>10.1f} ms")
+
+    _measure("Nearest (k=1)", lambda lat, lon: locator.nearest(lat, lon, k=1), queries)
+    _measure("Nearest (k=5)", lambda lat, lon: locator.nearest(lat, lon, k=5), queries)
+    _measure("Nearest cyber cell (k=1)", lambda lat, lon: locator.nearest(lat, lon, k=1, cyber_only=True), queries)
+    _measure(
+        "Brute force (k=1)",
+        lambda lat, lon: _brute_force(stations, lat, lon, 1),
+        queries[:max(1, args.verify)]
+    )
+
+    mismatches = 0
+    for lat, lon in queries[:args.verify]:
+        expected = [s["name"] for s in _brute_force(stations, lat, lon, 5)]
+        actual = [s["name"] for s in locator.nearest(lat, lon, k=5)]
+        mismatches += expected != actual
+
+    print(f"\n✅ {args.verify} queries checked against brute force: {mismatches} mismatches")
+
+
+if __name__ == "__main__":
+    main()
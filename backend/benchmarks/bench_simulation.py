@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Monte Carlo outcome simulation: single cases (cold and memoized) and batches.
+
+    python benchmarks/bench_simulation.py
+    python benchmarks/bench_simulation.py --trials 50000 --cases 200
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.config import settings
+from app.models.section import LegalSection
+from app.data.ipc_sections import IPC_SECTIONS
+from app.services.outcome_simulator import OutcomeSimulator
+
+DESCRIPTIONS = (
+    "He took the money and stopped answering my calls",
+    "I have screenshots and a video recording, reported immediately",
+    "This happened weeks ago and there was no witness",
+    "Several people were involved in multiple transactions, I have proof",
+)
+
+
+def _section(entry) -> LegalSection:
+    return LegalSection(
+        code=entry["code"],
+        title=entry["title"],
+        description=entry["description"],
+        punishment=entry["punishment"],
+        bailable=entry["bailable"],
+        cognizable=entry["cognizable"],
+        confidence=0.9,
+        reasoning="",
+        key_factors=[]
+    )
+
+
+def _cases(count: int):
+    sections = [_section(entry) for entry in IPC_SECTIONS.values()]
+    return [
+        ([sections[i % len(sections)]], DESCRIPTIONS[(i // len(sections)) % len(DESCRIPTIONS)])
+        for i in range(count)
+    ]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark outcome simulation")
+    parser.add_argument("--trials", type=int, default=settings.SIMULATION_REQUEST_TRIALS)
+    parser.add_argument("--batch-trials", type=int, default=settings.SIMULATION_BATCH_TRIALS)
+    parser.add_argument("--cases", type=int, default=100)
+    args = parser.parse_args(argv)
+
+    cases = _cases(args.cases)
+    simulator = OutcomeSimulator(trials=args.trials)
+    print(f"📊 Outcome simulation ({simulator.engine}, {args.trials} trials/case)\n")
+
+    simulator.simulate(*cases[-1])  # warm-up (imports, allocator)
+
+    timings = []
+    for sections, description in cases[:20]:
+        start = time.perf_counter()
+        simulator.simulate(sections, description)
+        timings.append(time.perf_counter() - start)
+    print(f"{'Single case (cold)':<32} {sum(timings) / len(timings) * 1e3:>10.2f} ms")
+
+    start = time.perf_counter()
+    for sections, description in cases[:20]:
+        simulator.simulate(sections, description)
+    print(f"{'Single case (memoized)':<32} {(time.perf_counter() - start) / 20 * 1e6:>10.1f} µs")
+
+    batch_simulator = OutcomeSimulator(trials=args.batch_trials)
+    start = time.perf_counter()
+    batch_simulator.simulate_batch(cases)
+    elapsed = time.perf_counter() - start
+    print(f"{f'Batch of {len(cases)} ({args.batch_trials} trials)':<32} {elapsed * 1e3:>10.1f} ms "
+          f"({elapsed / len(cases) * 1e3:.2f} ms/case)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""
+Synthetic, anonymized benchmark corpus.
+
+Case descriptions are generated from CrimeClassifier.CRIME_PATTERNS: every
+pattern x language (english, hinglish, hindi) x length (short, medium, long,
+document). People and places are placeholders, so no real statement ever
+ends up in a benchmark. Generation is seeded - the same seed always yields
+the same corpus, which keeps runs comparable.
+
+AI responses cover the _parse_json paths: direct, repaired (three ways) and failed.
+"""
+
+import json
+import os
+import random
+import sys
+from typing import Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.classifier import CrimeClassifier
+
+LANGUAGES = ("english", "hinglish", "hindi")
+LENGTHS = {"short": 0, "medium": 3, "long": 14, "document": 60}   # filler sentences
+
+CORE = {
+    "english": [
+        "On [date] [Person A] was involved in {kw1} near my house in [City] and I want to know what I can do.",
+        "I am reporting {kw1}. [Person A] and [Person B] did this and it also involved {kw2}.",
+        "Last week there was {kw1} at my workplace; later [Person A] started {kw2} as well.",
+    ],
+    "hinglish": [
+        "Mere saath {kw1} hua hai, [Person A] ne yeh kiya aur ab {kw2} ki dhamki de raha hai.",
+        "Kal raat [City] mein {kw1} ki ghatna hui, [Person B] bhi shamil tha, {kw2} bhi hua.",
+        "Bhai please help karo, {kw1} ka case hai aur police {kw2} ke baare mein sun nahi rahi.",
+    ],
+    "hindi": [
+        "मेरे साथ {kw1} की घटना हुई। [Person A] ने {kw2} भी किया, मुझे क्या करना चाहिए?",
+        "[City] में {kw1} हुआ है और [Person B] लगातार {kw2} कर रहा है।",
+        "मैं {kw1} की शिकायत दर्ज करना चाहता हूँ, इसमें {kw2} भी शामिल है।",
+    ],
+}
+
+FILLER = {
+    "english": [
+        "I have kept screenshots and messages as proof.",
+        "This happened around [time] and my neighbour saw part of it.",
+        "I went to the local station but they asked me to come back later.",
+        "My family is worried and I have not been able to sleep properly.",
+        "I paid Rs [amount] earlier and have the receipt with me.",
+        "The same person had troubled me a few months ago as well.",
+    ],
+    "hinglish": [
+        "Mere paas screenshots aur messages ka proof hai.",
+        "Yeh [time] ke aas paas hua aur padosi ne bhi dekha.",
+        "Thane gaya tha lekin unhone baad mein aane ko bola.",
+        "Ghar wale bahut pareshan hain, kya karun samajh nahi aa raha.",
+        "Maine pehle Rs [amount] diye the, receipt mere paas hai.",
+    ],
+    "hindi": [
+        "मेरे पास स्क्रीनशॉट और संदेशों का सबूत है।",
+        "यह [time] के आसपास हुआ और पड़ोसी ने भी देखा।",
+        "मैं थाने गया था लेकिन उन्होंने बाद में आने को कहा।",
+        "मेरा परिवार बहुत परेशान है।",
+        "मैंने पहले [amount] रुपये दिए थे, रसीद मेरे पास है।",
+    ],
+}
+
+
+def build_corpus(seed: int = 7) -> List[Dict]:
+    """[{id, pattern, language, length, description}] - one case per pattern/language/length"""
+    rng = random.Random(seed)
+    cases = []
+    for pattern, data in CrimeClassifier.CRIME_PATTERNS.items():
+        keywords = data["keywords"]
+        for language in LANGUAGES:
+            for length, fillers in LENGTHS.items():
+                kw1, kw2 = (rng.sample(keywords, 2) if len(keywords) > 1 else keywords * 2)
+                sentences = [rng.choice(CORE[language]).format(kw1=kw1, kw2=kw2)]
+                sentences += [rng.choice(FILLER[language]) for _ in range(fillers)]
+                if fillers:
+                    # Mention the offence again later on, as longer statements do
+                    sentences.insert(rng.randint(1, len(sentences)), rng.choice(CORE[language]).format(kw1=kw2, kw2=kw1))
+                cases.append({
+                    "id": f"{pattern}-{language}-{length}",
+                    "pattern": pattern,
+                    "language": language,
+                    "length": length,
+                    "description": " ".join(sentences),
+                })
+    return cases
+
+
+def _sample_ai_response() -> Dict:
+    return {
+        "case_nature": "criminal",
+        "case_nature_reasoning": "Money was taken by deception through a fake payment link.",
+        "primary_sections": [
+            {
+                "code": "IPC 420",
+                "title": "Cheating and dishonestly inducing delivery of property",
+                "confidence": 0.86,
+                "reasoning": "The complainant was deceived into transferring money.",
+                "key_factors": ["deception", "payment link", "transfer"],
+            },
+            {
+                "code": "IT Act 66D",
+                "title": "Cheating by personation using computer resource",
+                "confidence": 0.78,
+                "reasoning": "The accused impersonated a bank officer over the phone.",
+                "key_factors": ["impersonation", "phone call"],
+            },
+        ],
+        "conditional_sections": [
+            {"code": "IPC 406", "title": "Criminal breach of trust", "confidence": 0.4,
+             "reasoning": "Only if the money was entrusted.", "key_factors": ["entrustment"]},
+        ],
+        "rejected_sections": [{"code": "IPC 379", "reasoning": "No physical property was taken."}],
+        "overall_confidence": 0.82,
+    }
+
+
+def ai_responses() -> Dict[str, str]:
+    """Provider reply text for each parse path (salvage only runs when repair fails, so it is covered by "failed")"""
+    clean = json.dumps(_sample_ai_response(), indent=2)
+    first_section_end = clean.index("},", clean.index('"primary_sections"')) + 2
+    return {
+        "direct": clean,
+        "fenced": "Here is my analysis:\n```json\n" + clean + "\n```\nLet me know if you need more.",
+        "truncated": clean[:first_section_end],
+        "trailing_commas": clean.replace('"overall_confidence": 0.82', '"overall_confidence": 0.82,'),
+        "failed": "I'm sorry, I cannot provide a legal analysis for this request.",
+    }
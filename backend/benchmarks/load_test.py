@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""
+Open-loop load generator for the API.
+
+Requests arrive as a Poisson process at each --rates step, whether or not
+earlier requests have finished, so a saturated server shows up as growing
+latency and errors instead of a politely slowed-down client. Latency is
+measured from the scheduled arrival time.
+
+By default the app runs in-process through httpx's ASGI transport (the
+generator then shares the CPU with the app - use --url against a real
+uvicorn to size workers). Pair it with the offline fake provider to load
+the AI path without keys:
+
+    LOCAL_PROVIDER_ENABLED=true python benchmarks/load_test.py --rates 5,10,20 --duration 20
+    python benchmarks/load_test.py --url http://127.0.0.1:8000 --rates 50,100,200
+    python benchmarks/load_test.py --mix analyze.guest.miss=3,analyze.civil=1 -o load.json
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import random
+import sys
+import time
+from typing import Dict, List, Optional
+
+import httpx
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from corpus import build_corpus
+from app.services.classifier import CrimeClassifier
+
+HOT_SET = 10   # Distinct descriptions behind the *.hit scenarios (served from the analysis store after the first)
+
+CIVIL_DESCRIPTIONS = [
+    "My business partner borrowed Rs 2 lakh for the shop and didn't repay it after the partnership ended.",
+    "A friend owes money to me for two years and now says he will return it later. There was no fraud.",
+    "The builder delayed possession of my flat by a year in breach of the agreement we signed.",
+    "My tenant has not paid rent for four months and refuses to vacate the property.",
+]
+
+# name -> default weight
+DEFAULT_MIX = {
+    "analyze.guest.miss": 35,
+    "analyze.guest.hit": 20,
+    "analyze.auth.miss": 15,
+    "analyze.auth.hit": 10,
+    "analyze.civil": 10,
+    "lawyers.match": 5,
+    "police.nearest": 5,
+}
+
+
+class Workload:
+    """Builds (method, path, kwargs) for each scenario"""
+
+    def __init__(self, seed: int):
+        self.rng = random.Random(seed)
+        criminal = {
+            name for name, data in CrimeClassifier.CRIME_PATTERNS.items() if data["domain"] == "criminal"
+        }
+        cases = [case for case in build_corpus(seed) if case["length"] != "document"]
+        self.criminal = [case["description"] for case in cases if case["pattern"] in criminal]
+        self.civil = CIVIL_DESCRIPTIONS + [case["description"] for case in cases if case["pattern"] not in criminal]
+        self.hot = self.rng.sample(self.criminal, HOT_SET)
+        self.counter = 0
+
+    def _unique(self, description: str) -> str:
+        # A reference number makes the content (and prompt) new: store and cache miss
+        self.counter += 1
+        return f"{description} Reference number {self.counter}-{self.rng.randrange(10 ** 9)}."
+
+    def request(self, scenario: str):
+        if scenario == "lawyers.match":
+            return "POST", "/api/lawyers/match", {"json": {
+                "sections": [{"code": self.rng.choice(["IPC 420", "IPC 379", "IT Act 66C", "IPC 498A"]), "isPrimary": True}],
+                "userLocation": self.rng.choice(["Mumbai", "Delhi", "Bangalore", None]),
+            }}
+        if scenario == "police.nearest":
+            return "GET", "/api/police-stations/nearest", {"params": {
+                "lat": round(self.rng.uniform(8, 32), 4), "lon": round(self.rng.uniform(70, 88), 4),
+            }}
+
+        authenticated = ".auth." in scenario
+        if scenario == "analyze.civil":
+            description = self._unique(self.rng.choice(self.civil))
+        elif scenario.endswith(".hit"):
+            description = self.rng.choice(self.hot)
+        else:
+            description = self._unique(self.rng.choice(self.criminal))
+        body = {"description": description}
+        if authenticated:
+            body.update({"is_authenticated": True, "user_id": f"load-{self.rng.randrange(1000)}"})
+        return "POST", "/api/analyze-case", {"json": body}
+
+
+def _percentile(sorted_values: List[float], q: float) -> Optional[float]:
+    if not sorted_values:
+        return None
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+async def _send(client: httpx.AsyncClient, scenario: str, request, scheduled: float, timeout: float) -> Dict:
+    method, path, kwargs = request
+    loop = asyncio.get_running_loop()
+    sent = loop.time()
+    try:
+        response = await client.request(method, path, timeout=timeout, **kwargs)
+        status = response.status_code
+        error = None
+    except (httpx.HTTPError, asyncio.TimeoutError) as e:
+        status, error = None, type(e).__name__
+    return {
+        "scenario": scenario,
+        "status": status,
+        "error": error,
+        "latency": loop.time() - scheduled,
+        "lag": sent - scheduled,
+    }
+
+
+async def run_stage(client, workload: Workload, mix: Dict[str, float], rate: float,
+                    duration: float, timeout: float, rng: random.Random) -> Dict:
+    """Open-loop arrivals at `rate`/s for `duration` s; waits for stragglers"""
+    loop = asyncio.get_running_loop()
+    names, weights = list(mix), list(mix.values())
+    tasks = []
+    start = loop.time()
+    offset = 0.0
+    while True:
+        offset += rng.expovariate(rate)
+        if offset >= duration:
+            break
+        delay = start + offset - loop.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        scenario = rng.choices(names, weights)[0]
+        tasks.append(asyncio.create_task(
+            _send(client, scenario, workload.request(scenario), start + offset, timeout)
+        ))
+    results = await asyncio.gather(*tasks)
+    elapsed = loop.time() - start
+    return _summarize(results, rate, elapsed)
+
+
+def _summarize(results: List[Dict], rate: float, elapsed: float) -> Dict:
+    by_scenario: Dict[str, List[Dict]] = {}
+    for result in results:
+        by_scenario.setdefault(result["scenario"], []).append(result)
+    by_scenario["all"] = results
+
+    scenarios = {}
+    for name, rows in sorted(by_scenario.items()):
+        ok = sorted(r["latency"] for r in rows if r["status"] is not None and r["status"] < 400)
+        scenarios[name] = {
+            "requests": len(rows),
+            "ok": len(ok),
+            "client_errors": sum(1 for r in rows if r["status"] is not None and 400 <= r["status"] < 500),
+            "server_errors": sum(1 for r in rows if r["status"] is not None and r["status"] >= 500),
+            "failed": sum(1 for r in rows if r["status"] is None),
+            "throughput": round(len(ok) / elapsed, 2) if elapsed else 0,
+            "p50Ms": _ms(_percentile(ok, 0.50)),
+            "p95Ms": _ms(_percentile(ok, 0.95)),
+            "p99Ms": _ms(_percentile(ok, 0.99)),
+            "maxMs": _ms(ok[-1] if ok else None),
+        }
+    lags = sorted(r["lag"] for r in results)
+    failures: Dict[str, int] = {}
+    for result in results:
+        if result["error"]:
+            failures[result["error"]] = failures.get(result["error"], 0) + 1
+    return {
+        "offeredRate": rate,
+        "elapsedSeconds": round(elapsed, 2),
+        "generatorLagP99Ms": _ms(_percentile(lags, 0.99)),
+        "failures": failures,
+        "scenarios": scenarios,
+    }
+
+
+def _ms(seconds: Optional[float]) -> Optional[float]:
+    return round(seconds * 1000, 1) if seconds is not None else None
+
+
+def _print_stage(stage: Dict, out):
+    print(f"\n🚦 {stage['offeredRate']:g} req/s offered, {stage['elapsedSeconds']}s "
+          f"(generator lag p99 {stage['generatorLagP99Ms']} ms)", file=out)
+    print(f"{'scenario':<22} {'reqs':>6} {'ok':>6} {'4xx':>5} {'5xx':>5} {'fail':>5} "
+          f"{'ok/s':>7} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8}", file=out)
+    for name, s in stage["scenarios"].items():
+        cells = [f"{s[key]:>8.1f}" if s[key] is not None else f"{'-':>8}" for key in ("p50Ms", "p95Ms", "p99Ms", "maxMs")]
+        print(f"{name:<22} {s['requests']:>6} {s['ok']:>6} {s['client_errors']:>5} {s['server_errors']:>5} "
+              f"{s['failed']:>5} {s['throughput']:>7.1f} " + " ".join(cells), file=out)
+    if stage["failures"]:
+        print("   Failed requests: " + ", ".join(f"{name} x{count}" for name, count in stage["failures"].items()), file=out)
+
+
+def _parse_mix(spec: Optional[str]) -> Dict[str, float]:
+    if not spec:
+        return dict(DEFAULT_MIX)
+    mix = {}
+    for item in spec.split(","):
+        name, _, weight = item.partition("=")
+        name = name.strip()
+        if name not in DEFAULT_MIX:
+            raise SystemExit(f"Unknown scenario '{name}' (known: {', '.join(DEFAULT_MIX)})")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+async def main_async(args) -> Dict:
+    out = sys.stdout
+    mix = _parse_mix(args.mix)
+    workload = Workload(args.seed)
+    rng = random.Random(args.seed)
+    rates = [float(r) for r in args.rates.split(",")]
+    limits = httpx.Limits(max_connections=args.max_connections, max_keepalive_connections=args.max_connections)
+
+    quiet = contextlib.ExitStack()
+    if args.url:
+        client = httpx.AsyncClient(base_url=args.url, limits=limits)
+    else:
+        devnull = quiet.enter_context(open(os.devnull, "w"))
+        if not args.verbose:
+            # The in-process services print per-request diagnostics
+            quiet.enter_context(contextlib.redirect_stdout(devnull))
+            quiet.enter_context(contextlib.redirect_stderr(devnull))
+        from main import app
+        client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://loadtest", limits=limits)
+
+    target = args.url or "in-process ASGI app"
+    print(f"📊 Load test against {target}: rates {rates} req/s, {args.duration:g}s each", file=out)
+    print(f"   Mix: {', '.join(f'{k}={v:g}' for k, v in mix.items())}", file=out)
+
+    stages = []
+    with quiet:
+        async with client:
+            for rate in rates:
+                stage = await run_stage(client, workload, mix, rate, args.duration, args.timeout, rng)
+                stages.append(stage)
+                _print_stage(stage, out)
+                out.flush()
+
+    return {
+        "target": target,
+        "startedAt": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "durationPerRate": args.duration,
+        "mix": mix,
+        "seed": args.seed,
+        "stages": stages,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Open-loop load test of the API")
+    parser.add_argument("--url", help="target server (default: the app in-process via ASGI)")
+    parser.add_argument("--rates", default="5,10,20", help="comma-separated arrival rates (req/s), one stage each")
+    parser.add_argument("--duration", type=float, default=15, help="seconds per rate")
+    parser.add_argument("--mix", help=f"scenario weights, e.g. analyze.guest.miss=3,analyze.civil=1 "
+                                      f"(scenarios: {', '.join(DEFAULT_MIX)})")
+    parser.add_argument("--timeout", type=float, default=30, help="per-request timeout (s)")
+    parser.add_argument("--max-connections", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--verbose", action="store_true", help="keep the in-process app's output")
+    parser.add_argument("-o", "--output", help="write the results as JSON")
+    args = parser.parse_args(argv)
+
+    results = asyncio.run(main_async(args))
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"\n💾 Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
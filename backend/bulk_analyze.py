@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Offline bulk analysis over a JSONL archive of case descriptions.
+
+Each input line is a JSON object with AnalyzeCaseRequest fields
+(at minimum "description"). Each output line is an AnalyzeCaseResponse,
+in input order.
+
+    python bulk_analyze.py cases.jsonl -o results.jsonl --workers 8
+    python bulk_analyze.py cases.jsonl -o results.jsonl --mode ai --max-ai-concurrency 4
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import multiprocessing
+import os
+import sys
+import time
+from itertools import islice
+from typing import Iterator, Optional
+
+from dotenv import load_dotenv
+load_dotenv()
+
+# Set by _init_worker in each worker process
+_analyze = None
+_keyword_only = True
+_quiet = True
+
+
+class _NullWriter(io.TextIOBase):
+    """Discards writes (no file handle to leak)"""
+
+    def write(self, text: str) -> int:
+        return len(text)
+
+
+def _silenced():
+    """The services print per-request diagnostics; only the analysis is silenced, not the CLI"""
+    return contextlib.redirect_stdout(_NullWriter()) if _quiet else contextlib.nullcontext()
+
+
+def _init_worker(keyword_only: bool, ai_semaphore, quiet: bool):
+    """Load classifier, matcher, validator (and providers) once per worker"""
+    global _analyze, _keyword_only, _quiet
+
+    _quiet = quiet
+    with _silenced():
+        from app.routers import analyze
+
+    if ai_semaphore is not None:
+        analyze.hybrid_analyzer.concurrency_gate = ai_semaphore
+
+    _analyze = analyze
+    _keyword_only = keyword_only
+
+
+def _error_response(reason: str) -> str:
+    return _analyze.AnalyzeCaseResponse(
+        sections=[
+            _analyze.Section(
+                code="Error",
+                name="Analysis Failed",
+                description="Input line could not be analyzed",
+                punishment="Unknown",
+                bailable=True,
+                cognizable=False,
+                confidence=0,
+                isPrimary=True,
+                reasoning=reason,
+                matchedKeywords=[]
+            )
+        ],
+        severity="Unknown",
+        maxPunishment="Unknown",
+        punishmentNote="Invalid input",
+        bail="Unknown",
+        bailProbability=0,
+        overallConfidence=0,
+        summary="Analysis failed.",
+        nextSteps=[]
+    ).model_dump_json()
+
+
+def _analyze_line(line: str) -> str:
+    """Analyze one JSONL line and return the serialized response"""
+    try:
+        payload = json.loads(line)
+        if isinstance(payload, str):
+            payload = {"description": payload}
+        request = _analyze.AnalyzeCaseRequest(**payload)
+    except Exception as e:
+        return _error_response(f"Invalid input: {e}")
+
+    with _silenced():
+        response = _analyze.run_analysis(request, keyword_only=_keyword_only)
+    return response.model_dump_json()
+
+
+def _read_lines(path: str) -> Iterator[str]:
+    stream = sys.stdin if path == "-" else open(path, encoding="utf-8")
+    try:
+        for line in stream:
+            if line.strip():
+                yield line
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+
+def run(
+    input_path: str,
+    output_path: str,
+    workers: int,
+    keyword_only: bool,
+    max_ai_concurrency: int,
+    chunksize: int,
+    quiet: bool = True
+) -> int:
+    """Stream input through a process pool; returns the number of lines written"""
+    lines = _read_lines(input_path)
+    to_stdout = output_path == "-"
+    out = sys.stdout if to_stdout else open(output_path, "w", encoding="utf-8")
+    written = 0
+
+    try:
+        if workers <= 1:
+            _init_worker(keyword_only, None, quiet)
+            for line in lines:
+                out.write(_analyze_line(line) + "\n")
+                written += 1
+            return written
+
+        ctx = multiprocessing.get_context()
+        ai_semaphore = None if keyword_only else ctx.BoundedSemaphore(max_ai_concurrency)
+
+        with ctx.Pool(workers, initializer=_init_worker, initargs=(keyword_only, ai_semaphore, quiet)) as pool:
+            # Bounded windows keep memory flat on archives of any size
+            window = workers * chunksize * 4
+            while True:
+                batch = list(islice(lines, window))
+                if not batch:
+                    break
+                for result in pool.imap(_analyze_line, batch, chunksize=chunksize):
+                    out.write(result + "\n")
+                    written += 1
+                print(f"   ... {written} cases analyzed", file=sys.stderr)
+    finally:
+        if not to_stdout:
+            out.close()
+
+    return written
+
+
+def main(argv: Optional[list] = None):
+    parser = argparse.ArgumentParser(description="Bulk-analyze a JSONL file of case descriptions")
+    parser.add_argument("input", help="Input JSONL file ('-' for stdin)")
+    parser.add_argument("-o", "--output", default="-", help="Output JSONL file (default: stdout)")
+    parser.add_argument("-w", "--workers", type=int, default=os.cpu_count() or 1, help="Worker processes")
+    parser.add_argument("--mode", choices=["keyword", "ai"], default="keyword",
+                        help="keyword: rules + validator only; ai: call configured providers")
+    parser.add_argument("--max-ai-concurrency", type=int, default=4,
+                        help="Provider calls in flight across all workers (ai mode)")
+    parser.add_argument("--chunksize", type=int, default=64, help="Lines per task sent to a worker")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    count = run(
+        args.input,
+        args.output,
+        workers=args.workers,
+        keyword_only=args.mode == "keyword",
+        max_ai_concurrency=args.max_ai_concurrency,
+        chunksize=args.chunksize
+    )
+    elapsed = time.perf_counter() - started
+
+    print(f"✅ {count} cases in {elapsed:.1f}s ({count / elapsed if elapsed else 0:.0f}/s, "
+          f"{args.workers} worker(s), {args.mode} mode)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
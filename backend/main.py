@@ -1,11 +1,15 @@
 from dotenv import load_dotenv
 load_dotenv()
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from app.routers import analyze
+from fastapi.responses import PlainTextResponse
+from app.routers import admin, analyses, analytics, analyze, documents, lawyers, police_stations, stats
 from app.core.config import settings
+from app.core import metrics, tracing
+from app.core.sampler import get_sampler
 import os
+import time
 
 app = FastAPI(
     title="LegalAI API",
@@ -13,6 +17,17 @@ app = FastAPI(
     version="1.0.0"
 )
 
+# Always-on stack sampler behind /api/admin/flamegraph (one per worker process).
+# Only its admin endpoints read it, so it runs only when they are enabled.
+@app.on_event("startup")
+def start_sampler():
+    if settings.SAMPLER_ENABLED and settings.ADMIN_TOKEN:
+        get_sampler().start()
+
+@app.on_event("shutdown")
+def stop_sampler():
+    get_sampler().stop()
+
 # CORS - Updated for production
 app.add_middleware(
     CORSMiddleware,
@@ -26,10 +41,54 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Trace-Id", "X-Analysis-Id", "X-Analysis-Store", "X-Profile-Id", "X-Analysis-Degraded"],
 )
 
+def route_template(request: Request) -> str:
+    """Matched route path with its router prefix, e.g. /api/analyses/{analysis_id}"""
+    route = request.scope.get("route")
+    if route is None:
+        return "unmatched"
+    # Routes inside included routers report their path without the prefix
+    static = route.path.split("{")[0]
+    index = request.url.path.find(static)
+    return request.url.path[:index] + route.path if index > 0 else route.path
+
+# Request metrics per route (route template, not raw path) and a root trace span
+@app.middleware("http")
+async def observe_request(request: Request, call_next):
+    start = time.perf_counter()
+    status = 500
+    with tracing.request_span(
+        f"{request.method} {request.url.path}",
+        request.headers.get("traceparent"),
+        **{"http.method": request.method, "http.target": request.url.path}
+    ) as span:
+        try:
+            response = await call_next(request)
+            status = response.status_code
+            if span.trace_id:
+                response.headers["X-Trace-Id"] = span.trace_id
+            return response
+        finally:
+            path = route_template(request)
+            span.rename(f"{request.method} {path}")
+            span.set_attribute("http.route", path)
+            span.set_attribute("http.status_code", status)
+            if status >= 500:
+                span.set_error(f"HTTP {status}")
+            metrics.http_requests.inc(request.method, path, str(status))
+            metrics.http_latency.observe(time.perf_counter() - start, request.method, path)
+
 # Include routers
 app.include_router(analyze.router, prefix="/api", tags=["Analysis"])
+app.include_router(analyses.router, prefix="/api", tags=["Analysis"])
+app.include_router(documents.router, prefix="/api", tags=["Documents"])
+app.include_router(police_stations.router, prefix="/api", tags=["Police Stations"])
+app.include_router(lawyers.router, prefix="/api", tags=["Lawyers"])
+app.include_router(analytics.router, prefix="/api", tags=["Analytics"])
+app.include_router(stats.router, prefix="/api", tags=["Stats"])
+app.include_router(admin.router, prefix="/api", tags=["Admin"])
 
 @app.get("/")
 def root():
@@ -43,3 +102,8 @@ def root():
 @app.get("/health")
 def health_check():
     return {"status": "healthy"}
+
+@app.get("/metrics", include_in_schema=False)
+def prometheus_metrics():
+    """Prometheus scrape endpoint (this worker's counters)"""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
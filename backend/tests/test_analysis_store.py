@@ -0,0 +1,140 @@
+import json
+import time
+from datetime import datetime
+
+import pytest
+from fastapi import HTTPException
+
+from app.core import metrics
+from app.core.fieldsets import ALL_FIELDS, FieldSet
+from app.routers import analyze
+from app.routers.analyze import AnalyzeCaseRequest, RESPONSE_FIELDS, is_storable
+from app.services.analysis_store import AnalysisStore
+from app.services.hybrid_analyzer import FALLBACK_METHODS
+
+TOKEN = ""
+THEFT = "Someone committed theft of my motorcycle from outside my house at night."
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    store = AnalysisStore(path=str(tmp_path / "analyses.sqlite3"), flush_interval=0.01)
+    monkeypatch.setattr(analyze, "get_analysis_store", lambda: store)
+    yield store
+    store.close()
+
+
+def pipeline(monkeypatch, method):
+    """run_analysis that answers from keywords but reports `method` (no provider needed)"""
+    real_run_analysis = analyze.run_analysis
+    calls = []
+
+    def run_analysis(request, outcome=None, degraded=False, **kwargs):
+        calls.append(degraded)
+        outcome = outcome if outcome is not None else {}
+        response = real_run_analysis(request, keyword_only=True, outcome=outcome, **kwargs)
+        outcome["path"] = metrics.OUTCOME_ERROR if method == metrics.OUTCOME_ERROR else method
+        outcome["method"] = method
+        return response
+
+    monkeypatch.setattr(analyze, "run_analysis", run_analysis)
+    return calls
+
+
+def case(description=THEFT, user_id="alice"):
+    # Authenticated, so the response includes the dated FIR draft
+    return AnalyzeCaseRequest(description=description, role="victim", user_id=user_id, is_authenticated=True)
+
+
+def test_is_storable():
+    assert is_storable({"path": "hybrid_validated", "method": "hybrid_validated"})
+    assert not is_storable({"path": metrics.OUTCOME_ERROR})
+    assert not is_storable({})
+    for method in FALLBACK_METHODS:
+        assert not is_storable({"path": method, "method": method}), method
+
+
+@pytest.mark.parametrize("method", sorted(FALLBACK_METHODS) + [metrics.OUTCOME_ERROR])
+def test_fallback_and_error_results_are_not_stored(store, monkeypatch, method):
+    pipeline(monkeypatch, method)
+    response = analyze.respond_with_analysis(case(), ALL_FIELDS)
+    assert "x-analysis-id" not in response.headers
+    store.flush()
+    assert store.get(store.analysis_id(case().model_dump())) is None
+
+
+def test_sparse_miss_is_not_stored(store, monkeypatch):
+    pipeline(monkeypatch, "ai_only")
+    response = analyze.respond_with_analysis(case(), FieldSet.parse("severity", RESPONSE_FIELDS))
+    assert "x-analysis-id" not in response.headers
+    assert store.get(store.analysis_id(case().model_dump())) is None
+
+
+def test_stored_hit_binds_todays_date(store, monkeypatch):
+    pipeline(monkeypatch, "ai_only")
+    first = analyze.respond_with_analysis(case(), ALL_FIELDS)
+    analysis_id = first.headers["x-analysis-id"]
+    assert first.headers["x-analysis-store"] == "MISS"
+
+    # Stored with placeholders, served with the date of the day it is served
+    record = store.get(analysis_id)
+    assert TOKEN in record["response"]
+    second = analyze.respond_with_analysis(case(), ALL_FIELDS)
+    assert second.headers["x-analysis-store"] == "HIT"
+    body = second.body.decode("utf-8")
+    assert TOKEN not in body
+    assert datetime.now().strftime("%d/%m/%Y") in json.loads(body)["documents"]["firDraft"]["english"]
+
+
+def test_reuse_window_and_idempotency_key(store, monkeypatch):
+    pipeline(monkeypatch, "ai_only")
+    monkeypatch.setattr(analyze.settings, "ANALYSIS_REUSE_SECONDS", 0)
+    analyze.respond_with_analysis(case(), ALL_FIELDS, "order-1")
+    time.sleep(0.01)
+
+    # Past the reuse window only the same Idempotency-Key is served the stored result
+    assert analyze.respond_with_analysis(case(), ALL_FIELDS).headers["x-analysis-store"] == "MISS"
+    assert analyze.respond_with_analysis(case(), ALL_FIELDS, "order-1").headers["x-analysis-store"] == "HIT"
+
+
+def test_idempotency_key_reuse_is_a_conflict_for_the_same_user_only(store, monkeypatch):
+    pipeline(monkeypatch, "ai_only")
+    analyze.respond_with_analysis(case(), ALL_FIELDS, "order-1")
+
+    with pytest.raises(HTTPException) as error:
+        analyze.respond_with_analysis(case("My neighbour threatened to kill me."), ALL_FIELDS, "order-1")
+    assert error.value.status_code == 409
+
+    # Another user's "order-1" is a different key
+    response = analyze.respond_with_analysis(case("My neighbour threatened to kill me.", "bob"), ALL_FIELDS, "order-1")
+    assert response.status_code == 200
+
+
+def test_shed_request_stores_only_the_ai_upgrade(store, monkeypatch):
+    monkeypatch.setattr(analyze.settings, "AI_UPGRADE_ENABLED", True)
+    monkeypatch.setattr(analyze.hybrid_analyzer, "providers", ["fake"])
+    monkeypatch.setattr(analyze.ai_queue, "check", lambda: "queue_depth")
+    calls = pipeline(monkeypatch, "ai_only")
+
+    response = analyze.respond_with_analysis(case(), ALL_FIELDS)
+    analysis_id = response.headers["x-analysis-id"]
+    assert response.headers["x-analysis-degraded"] == "queue_depth"
+    assert json.loads(response.body)["degraded"] is True
+
+    # The degraded answer is not stored; the background upgrade's AI answer is
+    deadline = time.monotonic() + 10
+    while store.get(analysis_id) is None and time.monotonic() < deadline:
+        time.sleep(0.05)
+    record = store.get(analysis_id)
+    assert record is not None
+    assert json.loads(record["response"])["degraded"] is False
+    assert calls == [True, False]
+
+
+def test_upgrade_without_an_ai_answer_is_not_stored(store, monkeypatch):
+    pipeline(monkeypatch, "keyword_validated")
+    analysis_id = store.analysis_id(case().model_dump())
+    with pytest.raises(RuntimeError):
+        analyze.upgrade_analysis(case(), analysis_id)
+    store.flush()
+    assert store.get(analysis_id) is None
@@ -0,0 +1,26 @@
+from app.core.cache import LRUCache
+
+
+def test_lru_evicts_by_bytes():
+    cache = LRUCache(100, max_bytes=10, sizeof=len)
+    cache.put("a", "xxxx")
+    cache.put("b", "xxxx")
+    cache.put("c", "xxxx")   # 12 bytes - "a" goes
+    assert cache.get("a") is None
+    assert cache.get("b") == "xxxx" and cache.get("c") == "xxxx"
+    assert cache.stats()["bytes"] == 8
+
+
+def test_lru_skips_values_over_the_byte_limit():
+    cache = LRUCache(100, max_bytes=10, sizeof=len)
+    cache.put("a", "xx")
+    cache.put("a", "x" * 11)   # Replaces nothing: the stale value is dropped, the new one not kept
+    assert cache.get("a") is None
+    assert cache.stats()["bytes"] == 0
+
+
+def test_lru_without_byte_limit_counts_entries():
+    cache = LRUCache(2)
+    for key in "abc":
+        cache.put(key, key * 1000)
+    assert len(cache) == 2 and cache.get("a") is None
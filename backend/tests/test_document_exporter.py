@@ -0,0 +1,29 @@
+import re
+
+import pytest
+
+pytest.importorskip("fpdf")
+
+from app.services.document_exporter import DocumentExporter, ExportCache
+
+BASE_FONT = re.compile(rb"/BaseFont\s*/\w+\+(\S+)")
+HINDI = "प्रथम सूचना रिपोर्ट - धारा IPC 379, दिनांक 19/10/2026। मेरी मोटरसाइकिल चोरी हो गई।"
+
+
+@pytest.fixture
+def exporter(tmp_path):
+    return DocumentExporter(cache=ExportCache(root=str(tmp_path)))
+
+
+def test_hindi_pdf_uses_bundled_fonts(exporter):
+    # Rendered twice: copies must not share the subsetted font
+    for _ in range(2):
+        data = exporter._render_pdf("FIR", HINDI)
+        assert data.startswith(b"%PDF")
+        # Latin text ("IPC") in Noto Sans, Devanagari runs in Noto Sans Devanagari
+        assert set(BASE_FONT.findall(data)) == {b"NotoSans", b"NotoSansDevanagari"}
+
+
+def test_english_pdf_embeds_no_devanagari_font(exporter):
+    data = exporter._render_pdf("FIR", "FIR under IPC 379. My motorcycle was stolen.")
+    assert BASE_FONT.findall(data) == []   # Core Helvetica, nothing embedded
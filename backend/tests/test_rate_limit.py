@@ -0,0 +1,25 @@
+from app.core.rate_limit import is_rate_limit_error
+from app.services.local_provider import LocalProviderError
+
+
+class StatusError(Exception):
+    def __init__(self, message, **attributes):
+        super().__init__(message)
+        self.__dict__.update(attributes)
+
+
+def test_status_codes_decide():
+    assert is_rate_limit_error(StatusError("slow down", status_code=429))
+    assert is_rate_limit_error(StatusError("429 RESOURCE_EXHAUSTED.", code=429, status="RESOURCE_EXHAUSTED"))
+    assert is_rate_limit_error(LocalProviderError("Simulated quota exceeded", 429))
+    # A status other than 429 wins over whatever the message says
+    assert not is_rate_limit_error(StatusError("quota project not set (429?)", status_code=403))
+    assert not is_rate_limit_error(LocalProviderError("Simulated provider error (503 Service Unavailable)", 503))
+
+
+def test_text_fallback_is_narrow():
+    assert is_rate_limit_error(RuntimeError("Error code: 429 - {'type': 'rate_limit_error'}"))
+    assert is_rate_limit_error(RuntimeError("Simulated quota exceeded (429 Too Many Requests)"))
+    assert not is_rate_limit_error(RuntimeError("Prompt has 4290 tokens, over the model's context"))
+    assert not is_rate_limit_error(RuntimeError("Invalid quota project in request"))
+    assert not is_rate_limit_error(None)
@@ -0,0 +1,19 @@
+from app.core.safety import SafetyFilter
+
+
+def test_victim_narratives_are_not_refused():
+    for description in (
+        "The accused is trying to evade arrest after stealing my bike.",
+        "He has been evading police since he threatened to murder me.",
+        "Someone made a fake profile with my photos.",
+    ):
+        assert SafetyFilter.check_query(description)["safe"], description
+
+
+def test_requests_for_help_are_refused():
+    for description in (
+        "How to evade arrest after a hit and run?",
+        "Help me evade police, they are looking for me.",
+        "I want to evade arrest for the theft.",
+    ):
+        assert not SafetyFilter.check_query(description)["safe"], description
@@ -0,0 +1,26 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from main import app
+
+ROUTES = ["/api/stats/rules", "/api/stats/cache", "/api/stats/providers", "/api/stats/provider-limits", "/api/stats/ai-queue"]
+
+
+@pytest.fixture
+def client():
+    return TestClient(app)
+
+
+@pytest.mark.parametrize("route", ROUTES)
+def test_stats_are_disabled_without_an_admin_token(client, monkeypatch, route):
+    monkeypatch.setattr(settings, "ADMIN_TOKEN", "")
+    assert client.get(route).status_code == 404
+
+
+@pytest.mark.parametrize("route", ROUTES)
+def test_stats_require_the_admin_token(client, monkeypatch, route):
+    monkeypatch.setattr(settings, "ADMIN_TOKEN", "secret")
+    assert client.get(route).status_code == 403
+    assert client.get(route, headers={"X-Admin-Token": "wrong"}).status_code == 403
+    assert client.get(route, headers={"X-Admin-Token": "secret"}).status_code == 200
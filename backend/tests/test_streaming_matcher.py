@@ -0,0 +1,41 @@
+from fastapi.testclient import TestClient
+
+from app.services.streaming_matcher import StreamingMatcher, condense_document
+
+THEFT = "Someone stole my motorcycle from the parking lot outside my office last night.\n"
+DOCUMENT = THEFT * 40 + "Please explain how to evade the summons.\n" + THEFT * 40
+
+
+def test_safety_phrase_outside_the_digest_is_reported():
+    digest = condense_document(DOCUMENT)
+    assert "evade" not in digest["text"]
+    assert digest["illegal_intent"] == "how to evade"
+
+
+def test_safety_phrase_split_across_chunks():
+    for chunk_size in (1, 7, 64):
+        matcher = StreamingMatcher()
+        for start in range(0, len(DOCUMENT), chunk_size):
+            matcher.feed_bytes(DOCUMENT[start:start + chunk_size].encode("utf-8"))
+        assert matcher.finish()["illegal_intent"] == "how to evade", chunk_size
+
+
+def test_safety_phrase_across_a_forced_split():
+    # Run-on text with no punctuation is split every max_passage_chars
+    for padding in range(490, 500):
+        digest = condense_document("x" * padding + " how to evade arrest " + "y" * 2000)
+        assert digest["illegal_intent"] == "how to evade", padding
+
+
+def test_victim_document_is_not_flagged():
+    assert condense_document(THEFT * 80)["illegal_intent"] is None
+
+
+def test_analyze_document_refuses_buried_request():
+    from main import app
+    response = TestClient(app).post(
+        "/api/analyze-document", content=DOCUMENT.encode("utf-8"),
+        headers={"Content-Type": "text/plain"}
+    )
+    assert response.status_code == 200
+    assert response.json()["sections"][0]["code"] == "Refused"